@@ -141,6 +141,15 @@ class PDFConfig(BaseSettings):
         description="Number of browser instances to maintain in the pool",
     )
 
+    # Why off by default? Each PDF normally gets a fresh browser context (own cookies,
+    # storage and cache) for isolation between requests. Reusing contexts saves the
+    # per-request context setup; cookies and permissions are cleared between uses, but
+    # other browser state such as the HTTP cache and origin storage persists
+    reuse_contexts: bool = Field(
+        default=False,
+        description="Reuse browser contexts across PDF requests instead of creating one each",
+    )
+
     # Memory Limit Settings
     # Why 512MB? Limits JavaScript heap to prevent runaway memory on complex pages
     # Enforced via Chromium's --js-flags=--max-old-space-size flag
@@ -175,6 +184,16 @@ class BatchConfig(BaseSettings):
         description="Max concurrent batch requests (default: 8x CPU cores, max 50)",
     )
 
+    # Background Job Limits
+    # Why 10? Each job already fans out to `concurrency` URLs; capping jobs keeps bulk
+    # submissions from starving the event loop and the Redis pool. Extra jobs stay PENDING
+    max_concurrent_jobs: int = Field(
+        default=10,
+        ge=1,
+        le=100,
+        description="Maximum number of background batch jobs processed at once",
+    )
+
     # Batch Size Limits
     # Why 50? Balances API usability vs DoS protection
     # 50 URLs × 30s timeout × 10MB = potential 1.5GB memory, 25min processing
@@ -416,6 +435,15 @@ class SSRFConfig(BaseSettings):
         default=True,
         description="Resolve DNS and check IPs before making requests",
     )
+    # Why 5s? The fetch (httpx, Playwright) resolves the hostname again after validation,
+    # so a cached answer widens the DNS-rebinding window: a hostname validated against a
+    # public IP may point at an internal one by the time it is fetched. A few seconds still
+    # absorbs bursts of URLs on one host; longer TTLs trade that window for fewer lookups.
+    dns_cache_ttl: float = Field(
+        default=5.0,
+        ge=0,
+        description="Seconds to reuse a DNS answer during URL validation (0 disables caching)",
+    )
 
     model_config = SettingsConfigDict(env_prefix="SSRF_")
 
@@ -9,6 +9,7 @@ from bs4 import BeautifulSoup, Tag
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from .config import get_settings
+from .metrics import record_html_rendering_cache_hit
 from .pdf_generator import get_shared_pdf_generator
 
 logger = logging.getLogger(__name__)
@@ -57,6 +58,20 @@ _fallback_bypass_cache = BoundedCache(maxsize=1000)
 _js_heavy_cache = BoundedCache(maxsize=1000)  # URLs needing JS rendering for HTML
 _static_html_cache = BoundedCache(maxsize=1000)  # URLs confirmed as static HTML
 
+# Element ids used as React (#root) and Vue (#app) mount points
+_FRAMEWORK_ROOT_IDS = frozenset({"root", "app"})
+
+# Known JS-heavy domains, matched against the whole URL
+_JS_HEAVY_DOMAINS = ("substack.com", "medium.com", "notion.so", "ghost.io")
+
+# Patterns for _has_js_hint, matched against lowercased bytes. Each starts with a literal so
+# the regex engine can jump between candidate positions instead of trying every offset.
+_ENABLE_JS_RE = re.compile(rb"enable\s*(?:<[^<>]{0,200}>\s*){0,4}js")
+_FRAMEWORK_ROOT_ID_RE = re.compile(rb"id\s*=\s*[\"']?\s*(?:root|app)\b")
+
+# Opening <body> tag in raw HTML, see _has_body_tag
+_BODY_TAG_RE = re.compile(rb"<body[\s/>]", re.IGNORECASE)
+
 
 async def _close_page_modals(page) -> None:
     """Attempt to close common signup boxes and modals."""
@@ -103,17 +118,17 @@ def should_use_playwright_fallback(url: str, content: bytes, content_type: str)
 
     # Fast content detection using BeautifulSoup
     try:
-        soup = BeautifulSoup(content, "html.parser")
+        soup = BeautifulSoup(content, "lxml")
 
         # Check for meaningful body content
         body = soup.find("body")
-        if not body:
+        if body is None or not _has_body_tag(content):
             _empty_content_cache.add(url)
             return False
 
         # Get text content and check if substantial
-        body_text = body.get_text(strip=True)
         settings = get_settings()
+        body_text = _body_text_prefix(body, settings.content.min_body_text_threshold)
         if len(body_text) < settings.content.min_body_text_threshold:
             _empty_content_cache.add(url)
             logger.debug(f"Caching empty content URL (body text: {len(body_text)} chars): {url}")
@@ -138,6 +153,71 @@ def should_use_playwright_fallback(url: str, content: bytes, content_type: str)
         return True  # Default to fallback if detection fails
 
 
+def _has_js_hint(content: bytes) -> bool:
+    """
+    Screen raw HTML for anything that can make a large page need JS rendering.
+
+    Looks for a JS-required message (each mentions "javascript" or "enable js", possibly
+    split by inline tags) or a React/Vue/Angular root. False positives only mean falling
+    through to the full parse, so the checks are deliberately loose.
+
+    Args:
+        content: Raw HTML content bytes
+
+    Returns:
+        True if the page may need JS rendering
+    """
+    lowered = content.lower()
+    return (
+        b"javascript" in lowered
+        or b"ng-app" in lowered
+        or _ENABLE_JS_RE.search(lowered) is not None
+        or _FRAMEWORK_ROOT_ID_RE.search(lowered) is not None
+    )
+
+
+def _has_body_tag(content: bytes) -> bool:
+    """
+    Check whether raw HTML has a <body> tag of its own.
+
+    lxml wraps body-less fragments in an implied <body>, so soup.find("body") alone no
+    longer tells them apart; detection keeps treating such fragments as having no body.
+    NUL bytes mean a UTF-16/32 body the bytes search cannot see through; those are
+    assumed to have one.
+
+    Args:
+        content: Raw HTML content bytes
+
+    Returns:
+        True if the markup has a <body> tag
+    """
+    return b"\x00" in content[:1024] or _BODY_TAG_RE.search(content) is not None
+
+
+def _body_text_prefix(body: Tag, limit: int) -> str:
+    """
+    Get the stripped text of body, stopping once it exceeds limit characters.
+
+    Equivalent to body.get_text(strip=True) for length checks against thresholds up to
+    limit, without walking the rest of a content-rich page.
+
+    Args:
+        body: The <body> element
+        limit: Largest length threshold the caller compares against
+
+    Returns:
+        Stripped body text, truncated after the string that pushes it past limit
+    """
+    parts = []
+    size = 0
+    for string in body.stripped_strings:
+        parts.append(string)
+        size += len(string)
+        if size > limit:
+            break
+    return "".join(parts)
+
+
 def _has_missing_metadata(soup: BeautifulSoup) -> bool:
     """
     Check if HTML is missing expected metadata tags.
@@ -148,17 +228,16 @@ def _has_missing_metadata(soup: BeautifulSoup) -> bool:
     Returns:
         True if critical metadata tags are missing
     """
-    # Check for Open Graph tags
-    og_title = soup.find("meta", property="og:title")
-    og_description = soup.find("meta", property="og:description")
-
-    # Check for Twitter Card tags
-    twitter_title = soup.find("meta", attrs={"name": "twitter:title"})
-    twitter_description = soup.find("meta", attrs={"name": "twitter:description"})
+    # Collect Open Graph (property=) and Twitter Card (name=) values in one pass over <meta>
+    properties = set()
+    names = set()
+    for meta in soup.find_all("meta"):
+        properties.add(meta.get("property"))
+        names.add(meta.get("name"))
 
     # Missing metadata if we don't have at least one title and one description tag
-    has_title = og_title is not None or twitter_title is not None
-    has_description = og_description is not None or twitter_description is not None
+    has_title = "og:title" in properties or "twitter:title" in names
+    has_description = "og:description" in properties or "twitter:description" in names
 
     return not (has_title and has_description)
 
@@ -174,17 +253,16 @@ def _has_js_framework_markers(soup: BeautifulSoup, body_text: str) -> bool:
     Returns:
         True if JS framework markers detected with minimal content
     """
-    # Check for common JS framework root elements
-    react_root = soup.find(id="root")
-    vue_app = soup.find(id="app")
-    angular_app = soup.find(attrs={"ng-app": True})
-
-    # If we have framework markers but minimal content, likely needs JS rendering
-    has_framework_marker = react_root is not None or vue_app is not None or angular_app is not None
+    # Only framework markers with minimal content suggest JS rendering, so check the cheap
+    # length threshold before walking the tree
     settings = get_settings()
-    has_minimal_content = len(body_text) < settings.content.min_js_framework_content_threshold
+    if len(body_text) >= settings.content.min_js_framework_content_threshold:
+        return False
 
-    return has_framework_marker and has_minimal_content
+    # React/Vue root containers or an Angular ng-app attribute, found in a single walk
+    return any(
+        tag.get("id") in _FRAMEWORK_ROOT_IDS or "ng-app" in tag.attrs for tag in soup.find_all(True)
+    )
 
 
 def should_use_playwright_for_html(url: str, content: bytes, content_type: str) -> bool:
@@ -213,18 +291,31 @@ def should_use_playwright_for_html(url: str, content: bytes, content_type: str)
     # Check caches first (O(1) lookup)
     if url in _js_heavy_cache:
         logger.debug(f"Cache hit: {url} known to need JS rendering")
+        record_html_rendering_cache_hit()
         return True
     if url in _static_html_cache:
         logger.debug(f"Cache hit: {url} known to be static HTML")
+        record_html_rendering_cache_hit()
         return False
 
     # Only check HTML content
     if "html" not in content_type.lower():
         return False
 
+    # Pages of 50KB or more skip the metadata check, so without any raw hint of a JS
+    # requirement, a framework root or a JS-heavy domain the parse below would return False.
+    # NUL bytes mean a UTF-16/32 body that the bytes screen cannot see through.
+    if (
+        len(content) >= 50000
+        and b"\x00" not in content[:1024]
+        and not _has_js_hint(content)
+        and not any(domain in url for domain in _JS_HEAVY_DOMAINS)
+    ):
+        return False
+
     try:
         # Parse HTML for analysis
-        soup = BeautifulSoup(content, "html.parser")
+        soup = BeautifulSoup(content, "lxml")
         content_size = len(content)
 
         # Check for explicit JS requirement messages
@@ -244,11 +335,15 @@ def should_use_playwright_for_html(url: str, content: bytes, content_type: str)
 
         # Get body content for analysis
         body = soup.find("body")
-        if not body:
+        if body is None or not _has_body_tag(content):
             _static_html_cache.add(url)
             return False
 
-        body_text = body.get_text(strip=True)
+        # Only compared against the framework threshold and the 500-char static check below
+        settings = get_settings()
+        body_text = _body_text_prefix(
+            body, max(500, settings.content.min_js_framework_content_threshold)
+        )
 
         # Check for JS frameworks with minimal content
         if _has_js_framework_markers(soup, body_text):
@@ -256,8 +351,11 @@ def should_use_playwright_for_html(url: str, content: bytes, content_type: str)
             _js_heavy_cache.add(url)
             return True
 
+        # Both the small-page and the static-page checks below need this, so walk the tree once
+        missing_metadata = _has_missing_metadata(soup)
+
         # Check for missing metadata with small content size
-        if content_size < 50000 and _has_missing_metadata(soup):
+        if content_size < 50000 and missing_metadata:
             logger.info(
                 f"Detected missing metadata with small content size in {url} ({content_size} bytes)"
             )
@@ -265,14 +363,13 @@ def should_use_playwright_for_html(url: str, content: bytes, content_type: str)
             return True
 
         # Known JS-heavy domains
-        js_heavy_domains = ["substack.com", "medium.com", "notion.so", "ghost.io"]
-        if any(domain in url for domain in js_heavy_domains):
+        if any(domain in url for domain in _JS_HEAVY_DOMAINS):
             logger.info(f"Detected known JS-heavy domain in {url}")
             _js_heavy_cache.add(url)
             return True
 
         # If we got substantial content with metadata, cache as static
-        if len(body_text) > 500 and not _has_missing_metadata(soup):
+        if len(body_text) > 500 and not missing_metadata:
             logger.debug(f"Caching {url} as static HTML (substantial content with metadata)")
             _static_html_cache.add(url)
             return False
@@ -1,8 +1,10 @@
 """Simplified HTTP client implementation using httpx with connection pooling."""
 
+import asyncio
 import logging
 from enum import Enum
 from typing import Any
+from weakref import WeakKeyDictionary
 
 import httpx
 
@@ -48,6 +50,11 @@ class HTTPClient:
         user_agent: str | None = None,
         max_concurrent: int = 20,
         max_concurrent_batch: int = 5,
+        max_keepalive_connections: int = 100,
+        max_connections: int = 200,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        max_download_size: int | None = None,
     ):
         """
         Initialize HTTP client with connection pooling.
@@ -58,16 +65,23 @@ class HTTPClient:
             user_agent: Custom user agent string
             max_concurrent: Max concurrent requests (kept for API compatibility)
             max_concurrent_batch: Max concurrent batch requests (kept for API compatibility)
+            max_keepalive_connections: Idle connections kept open for reuse
+            max_connections: Maximum total connections in the pool
+            keepalive_expiry: Seconds before an idle pooled connection is closed
+            http2: Negotiate HTTP/2 where the server supports it
+            max_download_size: Maximum response body size in bytes (None for no limit)
         """
         self.timeout = timeout
         self.max_redirects = max_redirects
         self.user_agent = sanitize_user_agent(user_agent)
+        self.http2 = http2
+        self.max_download_size = max_download_size
 
         # Connection limits for pooling
-        limits = httpx.Limits(
-            max_keepalive_connections=100,
-            max_connections=200,
-            keepalive_expiry=30.0,
+        self.limits = httpx.Limits(
+            max_keepalive_connections=max_keepalive_connections,
+            max_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
         )
 
         # Create httpx client with connection pooling
@@ -75,8 +89,8 @@ class HTTPClient:
             timeout=timeout,
             follow_redirects=True,
             max_redirects=max_redirects,
-            limits=limits,
-            http2=True,
+            limits=self.limits,
+            http2=http2,
             headers={
                 "User-Agent": self.user_agent,
                 "Accept": "*/*",
@@ -88,8 +102,8 @@ class HTTPClient:
 
         logger.info(
             f"HTTP client initialized with connection pooling: "
-            f"max_connections={limits.max_connections}, "
-            f"max_keepalive={limits.max_keepalive_connections}"
+            f"max_connections={self.limits.max_connections}, "
+            f"max_keepalive={self.limits.max_keepalive_connections}"
         )
 
     async def download(
@@ -117,16 +131,19 @@ class HTTPClient:
         logger.info(f"Starting download from: {url}")
 
         try:
-            response = await self._client.get(url)
-
-            # Check for HTTP errors
-            if response.status_code >= 400:
-                raise HTTPClientError(
-                    f"HTTP {response.status_code}: {response.reason_phrase}",
-                    status_code=response.status_code,
-                )
-
-            content = response.content
+            # Stream the body so oversized responses are rejected without buffering them
+            response = await self._client.send(self._client.build_request("GET", url), stream=True)
+            try:
+                # Check for HTTP errors
+                if response.status_code >= 400:
+                    raise HTTPClientError(
+                        f"HTTP {response.status_code}: {response.reason_phrase}",
+                        status_code=response.status_code,
+                    )
+
+                content = await self._read_body(response)
+            finally:
+                await response.aclose()
 
             # Prepare metadata with connection info
             metadata = {
@@ -163,16 +180,35 @@ class HTTPClient:
             logger.error(f"Unexpected error downloading {url}: {e}")
             raise DownloadError(f"Download failed: {e}")
 
+    async def _read_body(self, response: httpx.Response) -> bytes:
+        """Read a streamed response body, enforcing max_download_size on the decoded bytes."""
+        limit = self.max_download_size
+        if limit is None:
+            return await response.aread()
+
+        declared = response.headers.get("content-length", "")
+        if declared.isdigit() and int(declared) > limit:
+            raise HTTPClientError(f"Response exceeds maximum download size of {limit} bytes")
+
+        chunks = []
+        size = 0
+        async for chunk in response.aiter_bytes():
+            size += len(chunk)
+            if size > limit:
+                raise HTTPClientError(f"Response exceeds maximum download size of {limit} bytes")
+            chunks.append(chunk)
+        return b"".join(chunks)
+
     def get_connection_stats(self) -> dict[str, Any]:
         """Get HTTP client connection statistics for monitoring."""
         try:
             return {
                 "status": "healthy",
-                "http2_enabled": True,
+                "http2_enabled": self.http2,
                 "connection_limits": {
-                    "max_connections": self._client.limits.max_connections,
-                    "max_keepalive": self._client.limits.max_keepalive_connections,
-                    "keepalive_expiry": self._client.limits.keepalive_expiry,
+                    "max_connections": self.limits.max_connections,
+                    "max_keepalive": self.limits.max_keepalive_connections,
+                    "keepalive_expiry": self.limits.keepalive_expiry,
                 },
             }
         except Exception as e:
@@ -191,21 +227,21 @@ class HTTPClient:
         await self.close()
 
 
-# Global client instance for reuse
-_global_client: HTTPClient | None = None
+# Shared client per event loop (pooled connections are bound to the loop that opened them)
+_clients: WeakKeyDictionary[asyncio.AbstractEventLoop, HTTPClient] = WeakKeyDictionary()
 
 
 async def get_client() -> HTTPClient:
-    """Get or create a global HTTP client instance."""
-    global _global_client
-    if _global_client is None:
-        _global_client = HTTPClient()
-    return _global_client
+    """Get or create the shared HTTP client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = HTTPClient()
+    return client
 
 
 async def close_client():
-    """Close the global HTTP client."""
-    global _global_client
-    if _global_client is not None:
-        await _global_client.close()
-        _global_client = None
+    """Close the running event loop's shared HTTP client."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
@@ -1,16 +1,21 @@
 """Background job management system for batch processing."""
 
 import asyncio
+import itertools
 import logging
 import os
+import secrets
 import time
-import uuid
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
 from typing import Any
 
+import orjson
 import redis.asyncio as redis
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
+
+from .config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -56,36 +61,211 @@ class JobResult(BaseModel):
     completed_at: datetime = Field(..., description="Job completion timestamp")
 
 
+TERMINAL_JOB_STATUSES = frozenset({JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED})
+
+# Cancel a pending or running job in one round-trip. Checking and writing the status
+# inside the script closes the window between reading the status and writing CANCELLED.
+# KEYS[1] = job key; ARGV = completed_at, job TTL. Returns 1 if the job was cancelled.
+_CANCEL_JOB_LUA = """
+local status = redis.call('HGET', KEYS[1], 'status')
+if status == 'pending' or status == 'running' then
+    redis.call('HSET', KEYS[1], 'status', 'cancelled', 'completed_at', ARGV[1],
+               'results_available', 0)
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# Apply a status update only if the job exists, so no hash is created for unknown jobs.
+# KEYS[1] = job key; ARGV = job TTL, started_at ('' to leave it alone; otherwise only set
+# if missing), then hash field/value pairs. Returns 1 if the job was updated.
+_UPDATE_JOB_STATUS_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('HSET', KEYS[1], unpack(ARGV, 3))
+if ARGV[2] ~= '' then
+    redis.call('HSETNX', KEYS[1], 'started_at', ARGV[2])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+# Rewrite a job stored as a JSON string by earlier releases into a hash, keeping its TTL.
+# KEYS[1] = job key; ARGV = the JSON the fields were parsed from, then hash field/value
+# pairs. Returns 1 if rewritten, 0 if the key changed or expired in the meantime.
+_MIGRATE_JOB_LUA = """
+if redis.call('TYPE', KEYS[1]).ok ~= 'string' or redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+local ttl = redis.call('PTTL', KEYS[1])
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+if ttl > 0 then
+    redis.call('PEXPIRE', KEYS[1], ttl)
+end
+return 1
+"""
+
+# Converters from raw Redis hash field bytes to JobInfo attribute types. Job hashes are
+# only ever written by JobManager, so they are rebuilt with model_construct instead of
+# running full Pydantic validation on every read. Fields without a converter are text.
+_JOB_FIELD_PARSERS: dict[str, Any] = {
+    "status": lambda value: JobStatus(value.decode()),
+    "created_at": lambda value: datetime.fromisoformat(value.decode()),
+    "started_at": lambda value: datetime.fromisoformat(value.decode()),
+    "completed_at": lambda value: datetime.fromisoformat(value.decode()),
+    "expires_at": lambda value: datetime.fromisoformat(value.decode()),
+    "progress": int,
+    "total_urls": int,
+    "processed_urls": int,
+    "successful_urls": int,
+    "failed_urls": int,
+    "results_available": lambda value: value == b"1",
+    "request_data": orjson.loads,
+}
+_JOB_FIELD_KEYS = {name: name.encode() for name in JobInfo.model_fields}
+# Fields a readable job hash must have. A missing request_data reads as {}.
+_REQUIRED_JOB_FIELD_KEYS = tuple(
+    _JOB_FIELD_KEYS[name]
+    for name, field in JobInfo.model_fields.items()
+    if field.is_required() and name != "request_data"
+)
+
+
+@dataclass
+class _PendingStatusUpdate:
+    """Coalesced status update for one job that has not been written yet.
+
+    Attributes:
+        status: Latest requested status
+        fields: Hash fields to write; later updates overwrite earlier values
+        started_at: First RUNNING timestamp seen, written with HSETNX
+        waiters: Futures of durable callers waiting for the write
+    """
+
+    status: JobStatus
+    fields: dict[str, str | int]
+    started_at: str | None = None
+    waiters: list[asyncio.Future] = field(default_factory=list)
+
+
+class JobInfoView:
+    """
+    Read-only view of a stored job that converts hash fields on first access.
+
+    Status polling only touches a handful of scalar fields, so the (potentially
+    large) ``request_data`` payload is never decoded unless a caller asks for it.
+    Use ``to_model()`` when a full ``JobInfo`` is required.
+    """
+
+    __slots__ = ("_fields", "_parsed")
+
+    def __init__(self, fields: dict[bytes, bytes]):
+        self._fields = fields
+        self._parsed: dict[str, Any] = {}
+
+    @classmethod
+    def from_fields(cls, fields: dict[bytes, bytes]) -> "JobInfoView | None":
+        """View of a job hash, or None if it is empty or lacks a required field."""
+        if not fields or not all(key in fields for key in _REQUIRED_JOB_FIELD_KEYS):
+            return None
+        return cls(fields)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for JobInfo field names; slots resolve through normal lookup
+        try:
+            return self._parsed[name]
+        except KeyError:
+            pass
+
+        field = JobInfo.model_fields.get(name)
+        if field is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+        raw = self._fields.get(_JOB_FIELD_KEYS[name])
+        if raw is not None:
+            value = _JOB_FIELD_PARSERS.get(name, bytes.decode)(raw)
+        elif name == "request_data":
+            value = {}
+        elif field.is_required():
+            raise ValueError(f"Job hash is missing required field {name!r}")
+        else:
+            value = field.default
+        self._parsed[name] = value
+        return value
+
+    def to_model(self) -> JobInfo:
+        """Materialize the full JobInfo model."""
+        return JobInfo.model_construct(
+            **{name: getattr(self, name) for name in JobInfo.model_fields}
+        )
+
+
 class JobManager:
-    """Optimized Redis-based job management system with connection pooling."""
+    """Optimized Redis-based job management system with connection pooling.
+
+    Job info is stored as a Redis hash (one field per ``JobInfo`` attribute) so
+    status updates can write only the fields that change, in a single round-trip,
+    without reading the job first. Jobs stored as JSON strings by earlier releases
+    are rewritten as hashes the first time a command hits them.
+    """
 
-    def __init__(self, redis_url: str, job_ttl: int = 3600 * 24):  # 24 hours default TTL
+    def __init__(
+        self,
+        redis_url: str,
+        job_ttl: int = 3600 * 24,  # 24 hours default TTL
+        max_connections: int = 20,
+        max_concurrent_jobs: int = 10,
+    ):
         """
         Initialize job manager with connection pooling for 20-30% latency reduction.
 
         Args:
             redis_url: Redis connection URL
             job_ttl: Job time-to-live in seconds
+            max_connections: Maximum connections in the shared Redis pool
+            max_concurrent_jobs: Maximum background jobs processed at once; further
+                jobs stay PENDING until a slot frees up
         """
         self.redis_url = redis_url
         self.job_ttl = job_ttl
+        self.max_connections = max_connections
         self.redis_client: redis.Redis | None = None
         self.connection_pool: redis.ConnectionPool | None = None
         self._background_tasks: dict[str, asyncio.Task] = {}
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self._job_slots = asyncio.Semaphore(max_concurrent_jobs)
+        # Lua scripts, registered lazily and invoked via EVALSHA
+        self._cancel_script = None
+        self._status_script = None
+        self._migrate_script = None
         self._last_health_check = 0
         self._health_check_interval = 60  # Check health every minute
 
+        # Background status writer: updates are coalesced per job (last write wins)
+        # and written in one pipelined round-trip per flush
+        self._pending_updates: dict[str, _PendingStatusUpdate] = {}
+        self._updates_pending = asyncio.Event()
+        self._flush_now = asyncio.Event()
+        self._flusher_task: asyncio.Task | None = None
+        self._flusher_stopping = False
+        self._flush_interval = 0.02  # Wait up to 20ms to coalesce non-durable updates
+
     async def connect(self):
         """Connect to Redis with optimized connection pooling."""
         try:
             # Create connection pool for better performance and resource management
             self.connection_pool = redis.ConnectionPool.from_url(
                 self.redis_url,
-                max_connections=20,  # Pool size for concurrent operations
+                max_connections=self.max_connections,  # Pool size for concurrent operations
                 retry_on_timeout=True,
                 retry_on_error=[redis.BusyLoadingError, redis.ConnectionError],
                 health_check_interval=30,  # Health check every 30s
-                decode_responses=True,
+                # Keep replies as bytes: orjson and Pydantic parse bytes directly, and
+                # JobInfoView only decodes the hash fields a caller actually reads
+                decode_responses=False,
             )
 
             # Create Redis client using the connection pool
@@ -94,9 +274,12 @@ class JobManager:
             # Test connection and log pool info
             await self.redis_client.ping()
             logger.info(
-                "Connected to Redis with connection pool (max_connections=20) for job management"
+                f"Connected to Redis with connection pool "
+                f"(max_connections={self.max_connections}) for job management"
             )
 
+            self._start_flusher()
+
         except Exception as e:
             logger.error(f"Failed to connect to Redis: {e}")
             raise
@@ -115,6 +298,9 @@ class JobManager:
 
         self._background_tasks.clear()
 
+        # Write out queued status updates before closing the connection
+        await self._stop_flusher()
+
         # Close Redis client and connection pool
         if self.redis_client:
             await self.redis_client.close()
@@ -132,6 +318,78 @@ class JobManager:
         """Get Redis key for job results."""
         return f"job_result:{job_id}"
 
+    async def _with_legacy_migration(self, job_ids: list[str], operation):
+        """
+        Run a Redis operation on job keys, migrating legacy keys if it hits any.
+
+        Hash commands fail with WRONGTYPE on jobs stored as JSON strings by earlier
+        releases. Those jobs are rewritten as hashes and the operation is retried once.
+
+        Args:
+            job_ids: Jobs the operation touches
+            operation: Zero-argument callable returning the awaitable to run
+        """
+        try:
+            return await operation()
+        except redis.ResponseError as e:
+            if "WRONGTYPE" not in str(e):
+                raise
+        await self._migrate_legacy_jobs(job_ids)
+        return await operation()
+
+    async def _migrate_legacy_jobs(self, job_ids: list[str]) -> None:
+        """Rewrite jobs stored as JSON strings into hashes; delete unreadable ones."""
+        job_keys = [self._get_job_key(job_id) for job_id in job_ids]
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for job_key in job_keys:
+                pipe.type(job_key)
+            key_types = await pipe.execute()
+
+        for job_key, key_type in zip(job_keys, key_types, strict=True):
+            if key_type != b"string":
+                continue
+            job_data = await self.redis_client.get(job_key)
+            if job_data is None:
+                continue  # Expired in the meantime
+            try:
+                job_info = JobInfo.model_validate_json(job_data)
+            except ValidationError as e:
+                logger.warning(f"Deleting unreadable legacy job {job_key}: {e}")
+                await self.redis_client.delete(job_key)
+                continue
+
+            if self._migrate_script is None:
+                self._migrate_script = self.redis_client.register_script(_MIGRATE_JOB_LUA)
+            fields = self._serialize_job_info(job_info)
+            await self._migrate_script(
+                keys=[job_key],
+                args=[job_data, *itertools.chain.from_iterable(fields.items())],
+            )
+            logger.info(f"Migrated legacy job {job_key} to hash storage")
+
+    @staticmethod
+    def _serialize_job_info(job_info: JobInfo) -> dict[str, str | int | bytes]:
+        """Flatten JobInfo into Redis hash fields, omitting unset optional fields."""
+        fields: dict[str, str | int | bytes] = {}
+        for name, value in job_info:
+            if value is None:
+                continue
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            elif isinstance(value, JobStatus):
+                value = value.value
+            elif isinstance(value, bool):
+                value = int(value)
+            elif isinstance(value, dict):
+                value = orjson.dumps(value)
+            fields[name] = value
+        return fields
+
+    @staticmethod
+    def _deserialize_job_info(fields: dict[bytes, bytes]) -> JobInfo:
+        """Rebuild JobInfo from Redis hash fields without re-validating trusted data."""
+        return JobInfoView(fields).to_model()
+
     async def create_job(self, request_data: dict[str, Any]) -> str:
         """
         Create a new background job.
@@ -142,53 +400,113 @@ class JobManager:
         Returns:
             Job ID
         """
+        (job_id,) = await self.create_jobs([request_data])
+        return job_id
+
+    async def create_jobs(self, batch: list[dict[str, Any]]) -> list[str]:
+        """
+        Create several background jobs in a single Redis round-trip.
+
+        Args:
+            batch: Original request data for each job
+
+        Returns:
+            Job IDs in the same order as ``batch``
+        """
         if not self.redis_client:
             raise RuntimeError("Redis client not connected")
 
-        job_id = str(uuid.uuid4())
         now = datetime.now(timezone.utc)
         expires_at = datetime.fromtimestamp(time.time() + self.job_ttl, timezone.utc)
+        job_ids: list[str] = []
+
+        # Store each job as a hash with TTL; MULTI/EXEC keeps hash and TTL together
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            for request_data in batch:
+                job_id = secrets.token_hex(12)  # 96 random bits, 24 hex chars
+                job_info = JobInfo(
+                    job_id=job_id,
+                    status=JobStatus.PENDING,
+                    created_at=now,
+                    total_urls=len(request_data.get("urls", [])),
+                    request_data=request_data,
+                    expires_at=expires_at,
+                )
+                job_key = self._get_job_key(job_id)
+                pipe.hset(job_key, mapping=self._serialize_job_info(job_info))
+                pipe.expire(job_key, self.job_ttl)
+                job_ids.append(job_id)
+            await pipe.execute()
+
+        for job_id, request_data in zip(job_ids, batch, strict=True):
+            logger.info(f"Created job {job_id} with {len(request_data.get('urls', []))} URLs")
+        return job_ids
+
+    async def get_job_info(self, job_id: str) -> JobInfoView | None:
+        """
+        Get job information.
 
-        job_info = JobInfo(
-            job_id=job_id,
-            status=JobStatus.PENDING,
-            created_at=now,
-            total_urls=len(request_data.get("urls", [])),
-            request_data=request_data,
-            expires_at=expires_at,
-        )
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Lazily decoded JobInfoView if found, None if missing or incomplete
+        """
+        if not self.redis_client:
+            raise RuntimeError("Redis client not connected")
 
-        # Store job info in Redis
         job_key = self._get_job_key(job_id)
-        await self.redis_client.setex(job_key, self.job_ttl, job_info.model_dump_json())
+        job_data = await self._with_legacy_migration(
+            [job_id], lambda: self.redis_client.hgetall(job_key)
+        )
 
-        logger.info(f"Created job {job_id} with {job_info.total_urls} URLs")
-        return job_id
+        return JobInfoView.from_fields(job_data)
 
-    async def get_job_info(self, job_id: str) -> JobInfo | None:
+    async def get_job_infos(self, job_ids: list[str]) -> list[JobInfoView | None]:
         """
-        Get job information.
+        Get information for several jobs in one round-trip.
 
         Args:
-            job_id: Job identifier
+            job_ids: Job identifiers
 
         Returns:
-            JobInfo if found, None otherwise
+            Lazily decoded JobInfoView per ID in the same order (None if missing or
+            incomplete)
         """
         if not self.redis_client:
             raise RuntimeError("Redis client not connected")
 
-        job_key = self._get_job_key(job_id)
-        job_data = await self.redis_client.get(job_key)
+        if not job_ids:
+            return []
 
-        if not job_data:
-            return None
+        async def read_jobs():
+            # Read-only batch, so no MULTI/EXEC is needed
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for job_id in job_ids:
+                    pipe.hgetall(self._get_job_key(job_id))
+                return await pipe.execute()
 
-        try:
-            return JobInfo.model_validate_json(job_data)
-        except Exception as e:
-            logger.error(f"Failed to parse job info for {job_id}: {e}")
-            return None
+        replies = await self._with_legacy_migration(job_ids, read_jobs)
+
+        return [JobInfoView.from_fields(job_data) for job_data in replies]
+
+    async def _get_job_fields(self, job_id: str, *fields: str) -> list[bytes | None]:
+        """
+        Read selected job fields with HMGET.
+
+        Args:
+            job_id: Job identifier
+            *fields: JobInfo field names to fetch
+
+        Returns:
+            Raw field values in the requested order (None for missing fields/jobs)
+        """
+        if not self.redis_client:
+            raise RuntimeError("Redis client not connected")
+
+        return await self._with_legacy_migration(
+            [job_id], lambda: self.redis_client.hmget(self._get_job_key(job_id), list(fields))
+        )
 
     async def update_job_status(
         self,
@@ -199,78 +517,166 @@ class JobManager:
         successful_urls: int | None = None,
         failed_urls: int | None = None,
         error_message: str | None = None,
-        max_retries: int = 3,
+        durable: bool = True,
     ):
-        """Update job status using atomic Redis transaction with retry logic for consistency."""
+        """
+        Update job status in a single Redis round-trip.
+
+        Once connected, writes go through a background flusher. Updates for the
+        same job are coalesced (last write wins per field) and all pending jobs
+        are written in one non-transactional pipelined round-trip, one Lua script
+        per job: each job's write is atomic, but the batch as a whole is not.
+        Durable updates wait for that write; non-durable updates of non-terminal
+        statuses return immediately. Terminal statuses are always durable.
+
+        Args:
+            job_id: Job identifier
+            status: New job status
+            progress: Progress percentage (0-100)
+            processed_urls: Number of URLs processed
+            successful_urls: Number of successfully processed URLs
+            failed_urls: Number of failed URLs
+            error_message: Error message if job failed
+            durable: Wait until the update has been written to Redis
+        """
         if not self.redis_client:
             raise RuntimeError("Redis client not connected")
 
-        job_key = self._get_job_key(job_id)
+        now = datetime.now(timezone.utc).isoformat()
+
+        fields: dict[str, str | int] = {"status": status.value}
+        if status in TERMINAL_JOB_STATUSES:
+            fields["completed_at"] = now
+            fields["results_available"] = int(status == JobStatus.COMPLETED)
+        if progress is not None:
+            fields["progress"] = progress
+        if processed_urls is not None:
+            fields["processed_urls"] = processed_urls
+        if successful_urls is not None:
+            fields["successful_urls"] = successful_urls
+        if failed_urls is not None:
+            fields["failed_urls"] = failed_urls
+        if error_message is not None:
+            fields["error_message"] = error_message
+
+        started_at = now if status == JobStatus.RUNNING else None
+
+        if self._flusher_task is None:
+            await self._write_status_updates(
+                {job_id: _PendingStatusUpdate(status, fields, started_at)}
+            )
+            return
 
-        for attempt in range(max_retries):
-            try:
-                # Use Redis transaction for atomic read-modify-write operation
-                async with self.redis_client.pipeline(transaction=True) as pipe:
-                    # Watch the job key for changes
-                    await pipe.watch(job_key)
-
-                    # Get current job info
-                    job_data = await self.redis_client.get(job_key)
-                    if not job_data:
-                        logger.warning(f"Attempted to update non-existent job {job_id}")
-                        return
-
-                    # Parse and update job info
-                    job_info = JobInfo.model_validate_json(job_data)
-                    job_info.status = status
-                    now = datetime.now(timezone.utc)
-
-                    if status == JobStatus.RUNNING and job_info.started_at is None:
-                        job_info.started_at = now
-                    elif status in [
-                        JobStatus.COMPLETED,
-                        JobStatus.FAILED,
-                        JobStatus.CANCELLED,
-                    ]:
-                        job_info.completed_at = now
-                        job_info.results_available = status == JobStatus.COMPLETED
-
-                    if progress is not None:
-                        job_info.progress = progress
-                    if processed_urls is not None:
-                        job_info.processed_urls = processed_urls
-                    if successful_urls is not None:
-                        job_info.successful_urls = successful_urls
-                    if failed_urls is not None:
-                        job_info.failed_urls = failed_urls
-                    if error_message is not None:
-                        job_info.error_message = error_message
-
-                    # Execute atomic update
-                    pipe.multi()
-                    await pipe.setex(job_key, self.job_ttl, job_info.model_dump_json())
-                    await pipe.execute()
-
-                    logger.debug(f"Updated job {job_id} status to {status} (atomic operation)")
-                    return  # Success, exit retry loop
-
-            except redis.WatchError:
-                if attempt < max_retries - 1:
-                    # Small exponential backoff to reduce collision probability
-                    wait_time = 0.01 * (2**attempt)  # 10ms, 20ms, 40ms
-                    logger.debug(
-                        f"Job {job_id} was modified during update, retrying in {wait_time:.3f}s (attempt {attempt + 1}/{max_retries})"
-                    )
-                    await asyncio.sleep(wait_time)
-                    continue
-                else:
-                    logger.error(
-                        f"Job {job_id} failed to update after {max_retries} attempts due to concurrent modifications"
+        # Merge into the job's unwritten update; applying the merged fields once is
+        # equivalent to applying each update in call order
+        pending = self._pending_updates.get(job_id)
+        if pending is None:
+            pending = _PendingStatusUpdate(status, fields, started_at)
+            self._pending_updates[job_id] = pending
+        else:
+            pending.status = status
+            pending.fields.update(fields)
+            pending.started_at = pending.started_at or started_at
+        self._updates_pending.set()
+
+        if not durable and status not in TERMINAL_JOB_STATUSES:
+            return
+
+        done = asyncio.get_running_loop().create_future()
+        pending.waiters.append(done)
+        self._flush_now.set()
+        await done
+
+    async def _write_status_updates(self, updates: dict[str, _PendingStatusUpdate]) -> None:
+        """
+        Apply status updates in a single pipelined round-trip.
+
+        Only the changed fields are written, so no prior read of the job is needed.
+        Each job is updated by one Lua script that skips unknown jobs and keeps the
+        first RUNNING ``started_at``, so every per-job write is atomic on its own.
+
+        Args:
+            updates: Pending update per job ID
+        """
+        if self._status_script is None:
+            self._status_script = self.redis_client.register_script(_UPDATE_JOB_STATUS_LUA)
+
+        async def write_updates():
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for job_id, update in updates.items():
+                    await self._status_script(
+                        keys=[self._get_job_key(job_id)],
+                        args=[
+                            self.job_ttl,
+                            update.started_at or "",
+                            *itertools.chain.from_iterable(update.fields.items()),
+                        ],
+                        client=pipe,
                     )
-                    raise
-            except Exception as e:
-                logger.error(f"Failed to update job {job_id}: {e}")
-                raise
+                return await pipe.execute()
+
+        try:
+            replies = await self._with_legacy_migration(list(updates), write_updates)
+        except Exception as e:
+            logger.error(f"Failed to update {len(updates)} job status(es): {e}")
+            raise
+
+        for (job_id, update), updated in zip(updates.items(), replies, strict=True):
+            if updated:
+                logger.debug(f"Updated job {job_id} status to {update.status} (atomic operation)")
+            else:
+                logger.warning(f"Attempted to update non-existent job {job_id}")
+
+    def _start_flusher(self) -> None:
+        """Start the background task that writes coalesced status updates."""
+        if self._flusher_task is None:
+            self._flusher_stopping = False
+            self._flusher_task = asyncio.create_task(self._flush_loop())
+
+    async def _stop_flusher(self) -> None:
+        """Write any pending status updates and stop the flusher task."""
+        if self._flusher_task is None:
+            return
+
+        self._flusher_stopping = True
+        self._updates_pending.set()
+        self._flush_now.set()
+        await self._flusher_task
+        self._flusher_task = None
+
+    async def _flush_loop(self) -> None:
+        """Write pending status updates whenever there are any."""
+        while True:
+            await self._updates_pending.wait()
+
+            # Only non-durable updates are waiting: give them a short window to coalesce
+            if not self._flush_now.is_set():
+                try:
+                    await asyncio.wait_for(self._flush_now.wait(), self._flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._updates_pending.clear()
+            self._flush_now.clear()
+
+            updates, self._pending_updates = self._pending_updates, {}
+            if updates:
+                try:
+                    await self._write_status_updates(updates)
+                    error = None
+                except Exception as e:
+                    error = e
+
+                for update in updates.values():
+                    for done in update.waiters:
+                        if done.done():
+                            continue
+                        if error is None:
+                            done.set_result(None)
+                        else:
+                            done.set_exception(error)
+
+            if self._flusher_stopping and not self._pending_updates:
+                return
 
     async def store_job_results(
         self,
@@ -282,23 +688,27 @@ class JobManager:
         if not self.redis_client:
             raise RuntimeError("Redis client not connected")
 
-        job_info = await self.get_job_info(job_id)
-        if not job_info:
+        # Only the timestamps and status are needed - skip the request_data payload
+        status, created_at, started_at, completed_at = await self._get_job_fields(
+            job_id, "status", "created_at", "started_at", "completed_at"
+        )
+        if status is None:
             logger.warning(f"Attempted to store results for non-existent job {job_id}")
             return
 
+        started = datetime.fromisoformat(started_at.decode()) if started_at else None
+        completed = datetime.fromisoformat(completed_at.decode()) if completed_at else None
+
         job_result = JobResult(
             job_id=job_id,
-            status=job_info.status,
+            status=status.decode(),
             total_duration=(
-                (job_info.completed_at - job_info.started_at).total_seconds()
-                if job_info.completed_at and job_info.started_at
-                else 0.0
+                (completed - started).total_seconds() if completed and started else 0.0
             ),
             results=results,
             summary=summary,
-            created_at=job_info.created_at,
-            completed_at=job_info.completed_at or datetime.now(timezone.utc),
+            created_at=created_at.decode(),
+            completed_at=completed or datetime.now(timezone.utc),
         )
 
         # Store results in Redis
@@ -325,21 +735,27 @@ class JobManager:
             return None
 
     async def start_background_job(self, job_id: str, job_processor_func, *args, **kwargs):
-        """Start background job processing."""
+        """
+        Start background job processing.
+
+        At most ``max_concurrent_jobs`` jobs are processed at once. Jobs beyond the
+        limit stay PENDING until a slot frees up and can be cancelled while waiting.
+        """
 
         async def job_wrapper():
             try:
-                await self.update_job_status(job_id, JobStatus.RUNNING)
-                logger.info(f"Starting background processing for job {job_id}")
+                async with self._job_slots:
+                    await self.update_job_status(job_id, JobStatus.RUNNING)
+                    logger.info(f"Starting background processing for job {job_id}")
 
-                # Call the actual job processor
-                results, summary = await job_processor_func(job_id, *args, **kwargs)
+                    # Call the actual job processor
+                    results, summary = await job_processor_func(job_id, *args, **kwargs)
 
-                # Store results and mark as completed
-                await self.store_job_results(job_id, results, summary)
-                await self.update_job_status(job_id, JobStatus.COMPLETED)
+                    # Store results and mark as completed
+                    await self.store_job_results(job_id, results, summary)
+                    await self.update_job_status(job_id, JobStatus.COMPLETED)
 
-                logger.info(f"Job {job_id} completed successfully")
+                    logger.info(f"Job {job_id} completed successfully")
 
             except asyncio.CancelledError:
                 await self.update_job_status(job_id, JobStatus.CANCELLED)
@@ -376,16 +792,22 @@ class JobManager:
                 logger.info(f"Cancelled background task for job {job_id}")
                 return True
 
-        # Update job status if it exists
-        job_info = await self.get_job_info(job_id)
-        if job_info and job_info.status in [
-            JobStatus.PENDING,
-            JobStatus.RUNNING,
-        ]:
-            await self.update_job_status(job_id, JobStatus.CANCELLED)
-            return True
+        if not self.redis_client:
+            raise RuntimeError("Redis client not connected")
 
-        return False
+        # Not running here: atomically mark the job cancelled if it is still active
+        if self._cancel_script is None:
+            self._cancel_script = self.redis_client.register_script(_CANCEL_JOB_LUA)
+        cancelled = await self._with_legacy_migration(
+            [job_id],
+            lambda: self._cancel_script(
+                keys=[self._get_job_key(job_id)],
+                args=[datetime.now(timezone.utc).isoformat(), self.job_ttl],
+            ),
+        )
+        if cancelled:
+            logger.debug(f"Updated job {job_id} status to {JobStatus.CANCELLED} (atomic operation)")
+        return bool(cancelled)
 
     async def _check_redis_health(self) -> bool:
         """Check Redis connection health and connection pool status."""
@@ -483,12 +905,21 @@ _job_manager: JobManager | None = None
 
 
 async def get_job_manager() -> JobManager:
-    """Get the global job manager instance."""
+    """Get the global job manager instance.
+
+    The instance owns a single connection pool, so every caller shares the same
+    set of Redis connections instead of opening new ones.
+    """
     global _job_manager
 
     if _job_manager is None:
         redis_url = os.getenv("REDIS_URI", "redis://localhost:6379")
-        _job_manager = JobManager(redis_url)
+        settings = get_settings()
+        _job_manager = JobManager(
+            redis_url,
+            max_connections=settings.redis.max_connections,
+            max_concurrent_jobs=settings.batch.max_concurrent_jobs,
+        )
         await _job_manager.connect()
 
     return _job_manager
@@ -18,7 +18,11 @@ from .http_client import HTTPClient
 from .job_manager import JobManager
 from .logging_config import get_logger, setup_logging
 from .middleware import MetricsMiddleware, get_system_metrics_collector
-from .pdf_generator import PlaywrightPDFGenerator
+from .pdf_generator import (
+    PlaywrightPDFGenerator,
+    cleanup_pdf_generator,
+    set_shared_pdf_generator,
+)
 from .ratelimit_middleware import RateLimitMiddleware
 from .scheduler import SchedulerService
 
@@ -64,6 +68,11 @@ async def lifespan(app: FastAPI):
         max_redirects=current_settings.http.max_redirects,
         max_concurrent=current_settings.http.max_concurrent_api,
         max_concurrent_batch=current_settings.http.max_concurrent_batch,
+        max_keepalive_connections=current_settings.http.max_keepalive_connections,
+        max_connections=current_settings.http.max_connections,
+        keepalive_expiry=current_settings.http.keepalive_expiry,
+        http2=current_settings.http.http2_enabled,
+        max_download_size=current_settings.content.max_download_size,
     )
     app.state.http_client = http_client
     logger.info("HTTP client initialized")
@@ -76,9 +85,12 @@ async def lifespan(app: FastAPI):
             page_load_timeout=current_settings.pdf.page_load_timeout,
             wait_until=current_settings.pdf.wait_until,
             memory_limit_mb=current_settings.pdf.browser_memory_limit_mb,
+            reuse_contexts=current_settings.pdf.reuse_contexts,
         )
         await pdf_generator.__aenter__()
         app.state.pdf_generator = pdf_generator
+        # Serve generate_pdf_from_url from this pool instead of a second, default one
+        set_shared_pdf_generator(pdf_generator)
         logger.info(
             f"PDF generator initialized successfully (timeout={current_settings.pdf.page_load_timeout}ms, wait_until={current_settings.pdf.wait_until})"
         )
@@ -98,7 +110,11 @@ async def lifespan(app: FastAPI):
     # Initialize job manager if Redis is configured
     if current_settings.redis.redis_uri:
         logger.info("Initializing job manager with Redis...")
-        job_manager = JobManager(current_settings.redis.redis_uri)
+        job_manager = JobManager(
+            current_settings.redis.redis_uri,
+            max_connections=current_settings.redis.max_connections,
+            max_concurrent_jobs=current_settings.batch.max_concurrent_jobs,
+        )
         await job_manager.connect()
         app.state.job_manager = job_manager
         logger.info("Job manager initialized")
@@ -154,9 +170,8 @@ async def lifespan(app: FastAPI):
     # Close HTTP client
     await http_client.close()
 
-    # Close PDF generator if initialized
-    if app.state.pdf_generator:
-        await app.state.pdf_generator.__aexit__(None, None, None)
+    # Close the shared PDF generator (the lifespan one, or one created on first use)
+    await cleanup_pdf_generator()
 
     # Shutdown scheduler if initialized
     if app.state.scheduler:
@@ -1,15 +1,22 @@
 """Enhanced metrics collection system for production monitoring."""
 
+import functools
+import itertools
 import logging
+import math
+import random
 import time
-from collections import defaultdict, deque
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class MetricSnapshot:
     """A point-in-time snapshot of a metric."""
 
@@ -18,7 +25,203 @@ class MetricSnapshot:
     labels: dict[str, str] = field(default_factory=dict)
 
 
-@dataclass
+# Cumulative histogram bucket upper bounds (Prometheus "le" labels), sorted for bisect
+_HISTOGRAM_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+_HISTOGRAM_LE_LABELS = tuple("+Inf" if b == float("inf") else str(b) for b in _HISTOGRAM_BUCKETS)
+_HISTOGRAM_BUCKET_INDEX = {bound: index for index, bound in enumerate(_HISTOGRAM_BUCKETS)}
+
+# Constant HELP/TYPE headers of the Prometheus exposition, one per metric family
+_PROM_UPTIME_HEADER = (
+    "# HELP downloader_uptime_seconds Time since service started\n"
+    "# TYPE downloader_uptime_seconds gauge\n"
+)
+_PROM_REQUESTS_HEADER = (
+    "\n# HELP downloader_requests_total Total number of requests\n"
+    "# TYPE downloader_requests_total counter\n"
+)
+_PROM_ERRORS_HEADER = (
+    "\n# HELP downloader_errors_total Total number of errors\n"
+    "# TYPE downloader_errors_total counter\n"
+)
+_PROM_HISTOGRAM_HEADER = (
+    "\n# HELP downloader_response_time_seconds Response time histogram\n"
+    "# TYPE downloader_response_time_seconds histogram\n"
+)
+_PROM_GAUGE_HEADER = (
+    "\n# HELP downloader_gauge Current gauge values\n# TYPE downloader_gauge gauge\n"
+)
+
+
+def _prom_number(value: float) -> str:
+    """Format a sample value, dropping the fraction of whole numbers."""
+    return str(int(value)) if value.is_integer() else str(value)
+
+
+# Percentiles use a DDSketch-style log mapping: bucket i covers (gamma**(i-1), gamma**i],
+# so reporting 2 * gamma**i / (gamma + 1) is within _P95_RELATIVE_ACCURACY of any value in it
+_P95_RELATIVE_ACCURACY = 0.01
+_P95_GAMMA = (1 + _P95_RELATIVE_ACCURACY) / (1 - _P95_RELATIVE_ACCURACY)
+_P95_LOG_GAMMA = math.log(_P95_GAMMA)
+# Non-positive samples share one bucket below every positive one
+_P95_ZERO_BUCKET = -(2**31)
+
+# Health score thresholds as (threshold, status) pairs, most severe first: a factor
+# is penalized once it exceeds the last threshold
+_HEALTH_ERROR_RATE_THRESHOLDS = ((10.0, "critical"), (5.0, "warning"))  # percent
+_HEALTH_RESPONSE_TIME_THRESHOLDS = ((3.0, "critical"), (1.0, "warning"))  # seconds
+_HEALTH_UPTIME_GOOD = 86400  # seconds
+
+# Number of sampled response times kept per endpoint
+_RECENT_SAMPLES = 1000
+# Shared by every endpoint's reservoir; one generator is as uniform as one per endpoint
+_reservoir_random = random.Random()
+
+
+_log = math.log
+_ceil = math.ceil
+
+
+def _p95_bucket_value(index: int) -> float:
+    """Representative value of a sketch bucket."""
+    if index == _P95_ZERO_BUCKET:
+        return 0.0
+    return 2 * _P95_GAMMA**index / (_P95_GAMMA + 1)
+
+
+def _threshold_status(value: float, thresholds: tuple[tuple[float, str], ...]) -> str | None:
+    """Status of the first threshold ``value`` exceeds, or None if it exceeds none."""
+    for threshold, status in thresholds:
+        if value > threshold:
+            return status
+    return None
+
+
+@functools.lru_cache(maxsize=4096)
+def _request_keys(method: str, endpoint: str, status_code: int) -> tuple:
+    """
+    Build the metric names for a (method, endpoint, status) combination once.
+
+    Returns:
+        (endpoint key, response time metric, request counter, status counter,
+        error counter, history labels). The labels dict is shared and must not be
+        mutated.
+    """
+    key = f"{method}_{endpoint}"
+    return (
+        key,
+        f"response_time_{key}",
+        f"requests_total_{key}",
+        f"requests_total_status_{status_code}",
+        f"errors_total_{key}",
+        {"method": method, "endpoint": endpoint, "status": str(status_code)},
+    )
+
+
+class _Histogram:
+    """
+    Histogram with one integer counter per bucket of ``_HISTOGRAM_BUCKETS``.
+
+    An observation increments only the first bucket whose bound is >= the value;
+    cumulative (Prometheus ``le``) counts are summed up when read. Indexing with a
+    bucket bound, e.g. ``histogram[0.5]``, returns that cumulative count.
+    """
+
+    __slots__ = ("counts",)
+
+    def __init__(self):
+        self.counts = array("Q", bytes(8 * len(_HISTOGRAM_BUCKETS)))
+
+    def observe(self, value: float):
+        """Count one value."""
+        self.counts[bisect_left(_HISTOGRAM_BUCKETS, value)] += 1
+
+    def cumulative(self) -> list[int]:
+        """Cumulative counts in bucket order."""
+        return list(itertools.accumulate(self.counts))
+
+    def __getitem__(self, bound: float) -> int:
+        return sum(self.counts[: _HISTOGRAM_BUCKET_INDEX[bound] + 1])
+
+
+class _MetricHistory:
+    """
+    Bounded history of one metric, oldest first.
+
+    Timestamps and values live in flat ``array('d')`` buffers that grow up to
+    ``maxlen`` and then wrap around, so recording a sample allocates no objects.
+    ``MetricSnapshot`` instances are only built when the history is read.
+    """
+
+    __slots__ = ("maxlen", "_timestamps", "_values", "_labels", "_head")
+
+    def __init__(self, maxlen: int):
+        self.maxlen = maxlen
+        self._timestamps = array("d")
+        self._values = array("d")
+        self._labels: list[dict[str, str] | None] = []
+        self._head = 0  # Index of the oldest sample once the buffers are full
+
+    def add(self, timestamp: float, value: float, labels: dict[str, str] | None = None):
+        """Record a sample, overwriting the oldest one when full."""
+        if len(self._values) < self.maxlen:
+            self._timestamps.append(timestamp)
+            self._values.append(value)
+            self._labels.append(labels)
+            return
+
+        head = self._head
+        self._timestamps[head] = timestamp
+        self._values[head] = value
+        self._labels[head] = labels
+        self._head = (head + 1) % self.maxlen
+
+    def append(self, snapshot: MetricSnapshot):
+        """Record an existing snapshot."""
+        self.add(snapshot.timestamp, snapshot.value, snapshot.labels)
+
+    def _snapshot(self, index: int) -> MetricSnapshot:
+        labels = self._labels[index]
+        return MetricSnapshot(
+            self._timestamps[index], self._values[index], dict(labels) if labels else {}
+        )
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, position: int) -> MetricSnapshot:
+        count = len(self._values)
+        if position < 0:
+            position += count
+        if not 0 <= position < count:
+            raise IndexError("metric history index out of range")
+        return self._snapshot((self._head + position) % count)
+
+    def __iter__(self):
+        count = len(self._values)
+        for position in range(count):
+            yield self._snapshot((self._head + position) % count)
+
+    def since(self, cutoff_time: float) -> list[MetricSnapshot]:
+        """
+        Snapshots with a timestamp at or after ``cutoff_time``, oldest first.
+
+        Samples are recorded in time order, so the buffer holds two sorted runs
+        (``[head:]`` then ``[:head]``) and the window start is found by bisection.
+        """
+        count = len(self._values)
+        head = self._head
+        timestamps = self._timestamps
+        if head and timestamps[count - 1] < cutoff_time:
+            # Everything in the older run is out of the window
+            indices = range(bisect_left(timestamps, cutoff_time, 0, head), head)
+        else:
+            start = bisect_left(timestamps, cutoff_time, head, count)
+            indices = [*range(start, count), *range(head)]
+        return [self._snapshot(index) for index in indices]
+
+
+@dataclass(slots=True)
 class PerformanceMetrics:
     """Performance metrics container."""
 
@@ -27,7 +230,48 @@ class PerformanceMetrics:
     total_response_time: float = 0.0
     min_response_time: float = float("inf")
     max_response_time: float = 0.0
-    response_times: deque = field(default_factory=lambda: deque(maxlen=1000))  # Last 1000 requests
+    # Uniform reservoir sample (Algorithm R) of every response time seen so far, stored
+    # as raw C doubles rather than a list of boxed floats. It grows with the first
+    # _RECENT_SAMPLES samples, so rarely hit endpoints stay small.
+    _recent: array = field(default_factory=lambda: array("d"), init=False, repr=False)
+    _recent_count: int = field(default=0, init=False, repr=False)
+    # Sparse counts per sketch bucket; percentiles walk these instead of sorting samples
+    _p95_buckets: dict[int, int] = field(default_factory=dict, init=False, repr=False)
+    _p95_count: int = field(default=0, init=False, repr=False)
+
+    def record_response_time(self, response_time: float):
+        """Record a response time sample in O(1)."""
+        # Plain comparisons and branches: this runs once per request
+        if response_time < self.min_response_time:
+            self.min_response_time = response_time
+        if response_time > self.max_response_time:
+            self.max_response_time = response_time
+
+        seen = self._recent_count + 1
+        self._recent_count = seen
+        if seen <= _RECENT_SAMPLES:
+            self._recent.append(response_time)
+        else:
+            # Keep the new sample with probability _RECENT_SAMPLES / seen
+            slot = _reservoir_random.randrange(seen)
+            if slot < _RECENT_SAMPLES:
+                self._recent[slot] = response_time
+
+        index = (
+            _ceil(_log(response_time) / _P95_LOG_GAMMA) if response_time > 0 else _P95_ZERO_BUCKET
+        )
+        buckets = self._p95_buckets
+        buckets[index] = buckets.get(index, 0) + 1
+        self._p95_count += 1
+
+    @property
+    def response_times(self) -> list[float]:
+        """
+        Uniform random sample (up to 1000) of all recorded response times.
+
+        Until 1000 samples have been seen this is every sample, in arrival order.
+        """
+        return self._recent.tolist()
 
     @property
     def avg_response_time(self) -> float:
@@ -45,23 +289,53 @@ class PerformanceMetrics:
 
     @property
     def p95_response_time(self) -> float:
-        """Calculate 95th percentile response time."""
-        if not self.response_times:
+        """
+        Estimate the 95th percentile response time from the sketch buckets.
+
+        The estimate is within 1% of the true value, clamped to the observed min/max
+        so sparse data stays exact.
+        """
+        if not self._p95_count:
             return 0.0
-        sorted_times = sorted(self.response_times)
-        p95_index = int(len(sorted_times) * 0.95)
-        return sorted_times[p95_index] if p95_index < len(sorted_times) else sorted_times[-1]
+
+        # Same rank as indexing sorted samples at int(n * 0.95)
+        rank = min(int(self._p95_count * 0.95), self._p95_count - 1) + 1
+        if rank == self._p95_count:
+            # The largest sample is tracked exactly
+            return self.max_response_time
+        seen = 0
+        buckets = self._p95_buckets
+        for index in sorted(buckets):
+            seen += buckets[index]
+            if seen >= rank:
+                estimate = _p95_bucket_value(index)
+                return min(max(estimate, self.min_response_time), self.max_response_time)
+        return self.max_response_time
 
 
 class MetricsCollector:
     """Centralized metrics collection system."""
 
-    def __init__(self, history_size: int = 10000):
+    def __init__(self, history_size: int = 10000, max_endpoints: int = 10000):
         self.history_size = history_size
-        self._metrics_history: dict[str, deque] = defaultdict(lambda: deque(maxlen=history_size))
+        self.max_endpoints = max_endpoints
+        self._metrics_history: dict[str, _MetricHistory] = defaultdict(
+            lambda: _MetricHistory(history_size)
+        )
         self._performance_metrics: dict[str, PerformanceMetrics] = defaultdict(PerformanceMetrics)
         self._start_time = time.time()
 
+        # Read results (summary, Prometheus text, health score) are reused for up to
+        # _report_cache_ttl seconds; any write marks them dirty so they are rebuilt
+        self._report_cache: dict[str, tuple[float, Any]] = {}
+        self._report_cache_ttl = 1.0
+        self._dirty = False
+
+        # Running totals across all endpoints, so overall figures are O(1) to read
+        self._total_requests = 0
+        self._total_errors = 0
+        self._total_response_time = 0.0
+
         # Counter metrics
         self._counters: dict[str, float] = defaultdict(float)
 
@@ -69,19 +343,11 @@ class MetricsCollector:
         self._gauges: dict[str, float] = defaultdict(float)
 
         # Histogram buckets for response times
-        self._histogram_buckets = [
-            0.1,
-            0.25,
-            0.5,
-            1.0,
-            2.5,
-            5.0,
-            10.0,
-            float("inf"),
-        ]
-        self._histograms: dict[str, dict[float, int]] = defaultdict(
-            lambda: dict.fromkeys(self._histogram_buckets, 0)
-        )
+        self._histograms: dict[str, _Histogram] = defaultdict(_Histogram)
+
+        # Endpoint keys in least-recently-used order, mapped to their per-endpoint metric
+        # names; once max_endpoints is exceeded the oldest endpoint's metrics are dropped
+        self._endpoint_keys: OrderedDict[str, tuple[str, str, str]] = OrderedDict()
 
     def record_request(
         self,
@@ -91,67 +357,121 @@ class MetricsCollector:
         response_time: float,
     ):
         """Record a request with its metrics."""
-        key = f"{method}_{endpoint}"
+        key, response_time_key, requests_key, status_key, errors_key, labels = _request_keys(
+            method, endpoint, status_code
+        )
+        is_error = status_code >= 400
+        counters = self._counters
+        self._dirty = True
+
+        endpoint_keys = self._endpoint_keys
+        if key in endpoint_keys:
+            endpoint_keys.move_to_end(key)
+        else:
+            endpoint_keys[key] = (response_time_key, requests_key, errors_key)
+            if len(endpoint_keys) > self.max_endpoints:
+                self._evict_endpoint(*endpoint_keys.popitem(last=False))
 
         # Update performance metrics
         perf = self._performance_metrics[key]
         perf.request_count += 1
         perf.total_response_time += response_time
-        perf.min_response_time = min(perf.min_response_time, response_time)
-        perf.max_response_time = max(perf.max_response_time, response_time)
-        perf.response_times.append(response_time)
+        perf.record_response_time(response_time)
 
-        if status_code >= 400:
-            perf.error_count += 1
+        self._total_requests += 1
+        self._total_response_time += response_time
 
         # Update counters
-        self._counters[f"requests_total_{key}"] += 1
-        self._counters[f"requests_total_status_{status_code}"] += 1
+        counters[requests_key] += 1
+        counters[status_key] += 1
 
-        if status_code >= 400:
-            self._counters[f"errors_total_{key}"] += 1
+        if is_error:
+            perf.error_count += 1
+            self._total_errors += 1
+            counters[errors_key] += 1
 
-        # Update histograms
-        for bucket in self._histogram_buckets:
-            if response_time <= bucket:
-                self._histograms[f"response_time_{key}"][bucket] += 1
+        # Update histograms (same as observe_histogram, inlined for the hot path)
+        self._histograms[response_time_key].counts[
+            bisect_left(_HISTOGRAM_BUCKETS, response_time)
+        ] += 1
 
         # Store in history
-        timestamp = time.time()
-        self._metrics_history[f"response_time_{key}"].append(
-            MetricSnapshot(
-                timestamp,
-                response_time,
-                {
-                    "method": method,
-                    "endpoint": endpoint,
-                    "status": str(status_code),
-                },
+        self._metrics_history[response_time_key].add(time.time(), response_time, labels)
+
+        # Skip formatting the message when debug logging is off (the common case)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Recorded request: {method} {endpoint} - {status_code} in {response_time:.3f}s"
             )
-        )
 
-        logger.debug(
-            f"Recorded request: {method} {endpoint} - {status_code} in {response_time:.3f}s"
-        )
+    def _evict_endpoint(self, key: str, metric_names: tuple[str, str, str]):
+        """Drop every per-endpoint metric of a least-recently-used endpoint."""
+        response_time_key, requests_key, errors_key = metric_names
+        self._performance_metrics.pop(key, None)
+        self._histograms.pop(response_time_key, None)
+        self._metrics_history.pop(response_time_key, None)
+        self._counters.pop(requests_key, None)
+        self._counters.pop(errors_key, None)
+        logger.debug(f"Evicted metrics for endpoint {key} (max_endpoints={self.max_endpoints})")
+
+    def observe_histogram(self, name: str, value: float):
+        """Count a value in a histogram."""
+        self._dirty = True
+        self._histograms[name].observe(value)
 
     def set_gauge(self, name: str, value: float):
         """Set a gauge metric value."""
+        self._dirty = True
         self._gauges[name] = value
         timestamp = time.time()
-        self._metrics_history[name].append(MetricSnapshot(timestamp, value))
+        self._metrics_history[name].add(timestamp, value)
+
+    def set_gauges(self, values: Mapping[str, float]):
+        """Set several gauge metrics at once, sharing one timestamp."""
+        if not values:
+            return
+        self._dirty = True
+        self._gauges.update(values)
+        timestamp = time.time()
+        history = self._metrics_history
+        for name, value in values.items():
+            history[name].add(timestamp, value)
+
+    def delete_gauge(self, name: str):
+        """Remove a gauge metric and its history."""
+        if self._gauges.pop(name, None) is not None:
+            self._dirty = True
+        self._metrics_history.pop(name, None)
 
     def increment_counter(self, name: str, value: float = 1.0):
         """Increment a counter metric."""
+        self._dirty = True
         self._counters[name] += value
 
+    def _cached_report(self, name: str, build):
+        """Return a recently built report, rebuilding it if expired or metrics changed."""
+        now = time.monotonic()
+        if self._dirty:
+            self._report_cache.clear()
+            self._dirty = False
+        else:
+            cached = self._report_cache.get(name)
+            if cached is not None and now < cached[0]:
+                return cached[1]
+
+        report = build()
+        self._report_cache[name] = (now + self._report_cache_ttl, report)
+        return report
+
     def get_performance_summary(self) -> dict[str, Any]:
         """Get a summary of performance metrics."""
+        return self._cached_report("performance_summary", self._build_performance_summary)
+
+    def _build_performance_summary(self) -> dict[str, Any]:
         summary = {
             "uptime_seconds": time.time() - self._start_time,
-            "total_requests": sum(
-                perf.request_count for perf in self._performance_metrics.values()
-            ),
-            "total_errors": sum(perf.error_count for perf in self._performance_metrics.values()),
+            "total_requests": self._total_requests,
+            "total_errors": self._total_errors,
             "endpoints": {},
         }
 
@@ -169,14 +489,11 @@ class MetricsCollector:
             }
 
         # Calculate overall metrics
-        if summary["total_requests"] > 0:
+        if self._total_requests > 0:
             summary["overall_error_rate_percent"] = (
-                summary["total_errors"] / summary["total_requests"]
+                self._total_errors / self._total_requests
             ) * 100
-            total_response_time = sum(
-                perf.total_response_time for perf in self._performance_metrics.values()
-            )
-            summary["overall_avg_response_time"] = total_response_time / summary["total_requests"]
+            summary["overall_avg_response_time"] = self._total_response_time / self._total_requests
         else:
             summary["overall_error_rate_percent"] = 0.0
             summary["overall_avg_response_time"] = 0.0
@@ -185,100 +502,105 @@ class MetricsCollector:
 
     def get_prometheus_metrics(self) -> str:
         """Generate Prometheus-formatted metrics."""
-        lines = []
-
-        # Add metadata
-        lines.append("# HELP downloader_uptime_seconds Time since service started")
-        lines.append("# TYPE downloader_uptime_seconds gauge")
-        lines.append(f"downloader_uptime_seconds {time.time() - self._start_time}")
-        lines.append("")
+        return self._cached_report("prometheus", self._build_prometheus_metrics)
+
+    def _build_prometheus_metrics(self) -> str:
+        # Lines are built with comprehensions (no per-line append calls) and joined once
+        counters = self._counters.items()
+        parts = [
+            _PROM_UPTIME_HEADER,
+            f"downloader_uptime_seconds {time.time() - self._start_time}\n",
+        ]
 
         # Request counters
-        lines.append("# HELP downloader_requests_total Total number of requests")
-        lines.append("# TYPE downloader_requests_total counter")
-        for name, value in self._counters.items():
-            if name.startswith("requests_total_"):
-                endpoint = name.replace("requests_total_", "")
-                lines.append(f'downloader_requests_total{{endpoint="{endpoint}"}} {value}')
-        lines.append("")
+        parts.append(_PROM_REQUESTS_HEADER)
+        prefix_length = len("requests_total_")
+        parts += [
+            f'downloader_requests_total{{endpoint="{name[prefix_length:]}"}} '
+            f"{_prom_number(value)}\n"
+            for name, value in counters
+            if name.startswith("requests_total_")
+        ]
 
         # Error counters
-        lines.append("# HELP downloader_errors_total Total number of errors")
-        lines.append("# TYPE downloader_errors_total counter")
-        for name, value in self._counters.items():
-            if name.startswith("errors_total_"):
-                endpoint = name.replace("errors_total_", "")
-                lines.append(f'downloader_errors_total{{endpoint="{endpoint}"}} {value}')
-        lines.append("")
+        parts.append(_PROM_ERRORS_HEADER)
+        prefix_length = len("errors_total_")
+        parts += [
+            f'downloader_errors_total{{endpoint="{name[prefix_length:]}"}} {_prom_number(value)}\n'
+            for name, value in counters
+            if name.startswith("errors_total_")
+        ]
 
         # Response time histograms
-        lines.append("# HELP downloader_response_time_seconds Response time histogram")
-        lines.append("# TYPE downloader_response_time_seconds histogram")
-        for endpoint, buckets in self._histograms.items():
-            if endpoint.startswith("response_time_"):
-                endpoint_name = endpoint.replace("response_time_", "")
-                for bucket, count in buckets.items():
-                    bucket_str = "+Inf" if bucket == float("inf") else str(bucket)
-                    lines.append(
-                        f'downloader_response_time_seconds_bucket{{endpoint="{endpoint_name}",le="{bucket_str}"}} {count}'
-                    )
-        lines.append("")
+        parts.append(_PROM_HISTOGRAM_HEADER)
+        prefix_length = len("response_time_")
+        for name, histogram in self._histograms.items():
+            if name.startswith("response_time_"):
+                series = f'downloader_response_time_seconds_bucket{{endpoint="{name[prefix_length:]}",le="'
+                parts += [
+                    f'{series}{le}"}} {count}\n'
+                    for le, count in zip(_HISTOGRAM_LE_LABELS, histogram.cumulative(), strict=True)
+                ]
 
         # Current gauges
-        lines.append("# HELP downloader_gauge Current gauge values")
-        lines.append("# TYPE downloader_gauge gauge")
-        for name, value in self._gauges.items():
-            lines.append(f'downloader_gauge{{name="{name}"}} {value}')
+        parts.append(_PROM_GAUGE_HEADER)
+        parts += [
+            f'downloader_gauge{{name="{name}"}} {value}\n' for name, value in self._gauges.items()
+        ]
 
-        return "\n".join(lines)
+        return "".join(parts)
 
     def get_recent_metrics(self, metric_name: str, seconds: int = 300) -> list[MetricSnapshot]:
         """Get recent metrics for a specific metric within the last N seconds."""
-        cutoff_time = time.time() - seconds
-        recent_metrics = []
-
-        if metric_name in self._metrics_history:
-            for snapshot in self._metrics_history[metric_name]:
-                if snapshot.timestamp >= cutoff_time:
-                    recent_metrics.append(snapshot)
-
-        return recent_metrics
+        history = self._metrics_history.get(metric_name)
+        if history is None:
+            return []
+        return history.since(time.time() - seconds)
 
     def get_system_health_score(self) -> dict[str, Any]:
         """Calculate an overall system health score."""
-        performance = self.get_performance_summary()
+        return self._cached_report("health_score", self._build_system_health_score)
+
+    def _build_system_health_score(self) -> dict[str, Any]:
+        # Only the overall figures matter here, so read the running totals directly
+        # instead of building the per-endpoint summary
+        total_requests = self._total_requests
 
         # Health scoring (0-100)
         health_score = 100
         health_details = {"overall_score": health_score, "factors": {}}
 
-        # Error rate impact (max -30 points)
-        error_rate = performance.get("overall_error_rate_percent", 0)
-        if error_rate > 5:
-            error_penalty = min(30, error_rate * 2)  # 2 points per percent over 5%
-            health_score -= error_penalty
-            health_details["factors"]["error_rate"] = {
-                "value": error_rate,
-                "penalty": error_penalty,
-                "status": "critical" if error_rate > 10 else "warning",
-            }
-
-        # Response time impact (max -25 points)
-        avg_response_time = performance.get("overall_avg_response_time", 0)
-        if avg_response_time > 1.0:
-            response_penalty = min(
-                25, (avg_response_time - 1.0) * 10
-            )  # 10 points per second over 1s
-            health_score -= response_penalty
-            health_details["factors"]["response_time"] = {
-                "value": avg_response_time,
-                "penalty": response_penalty,
-                "status": "critical" if avg_response_time > 3.0 else "warning",
-            }
+        # With no traffic there is nothing to penalize
+        if total_requests:
+            # Error rate impact (max -30 points)
+            error_rate = (self._total_errors / total_requests) * 100
+            error_status = _threshold_status(error_rate, _HEALTH_ERROR_RATE_THRESHOLDS)
+            if error_status:
+                error_penalty = min(30, error_rate * 2)  # 2 points per percent over 5%
+                health_score -= error_penalty
+                health_details["factors"]["error_rate"] = {
+                    "value": error_rate,
+                    "penalty": error_penalty,
+                    "status": error_status,
+                }
+
+            # Response time impact (max -25 points)
+            avg_response_time = self._total_response_time / total_requests
+            response_status = _threshold_status(avg_response_time, _HEALTH_RESPONSE_TIME_THRESHOLDS)
+            if response_status:
+                response_penalty = min(
+                    25, (avg_response_time - 1.0) * 10
+                )  # 10 points per second over 1s
+                health_score -= response_penalty
+                health_details["factors"]["response_time"] = {
+                    "value": avg_response_time,
+                    "penalty": response_penalty,
+                    "status": response_status,
+                }
 
         # Uptime bonus
-        uptime = performance.get("uptime_seconds", 0)
-        if uptime > 86400:  # More than 24 hours
+        uptime = time.time() - self._start_time
+        if uptime > _HEALTH_UPTIME_GOOD:  # More than 24 hours
             health_details["factors"]["uptime"] = {
                 "value": uptime,
                 "bonus": 0,
@@ -293,32 +615,30 @@ class MetricsCollector:
         return health_details
 
 
-# Global metrics collector instance
-_metrics_collector: MetricsCollector | None = None
+# Global metrics collector instance, created eagerly so lookups need no None check.
+# Tests may rebind it; the helpers below read the module global on every call.
+_metrics_collector: MetricsCollector = MetricsCollector()
 
 
 def get_metrics_collector() -> MetricsCollector:
     """Get the global metrics collector instance."""
-    global _metrics_collector
-    if _metrics_collector is None:
-        _metrics_collector = MetricsCollector()
     return _metrics_collector
 
 
 # Convenience functions
 def record_request(endpoint: str, method: str, status_code: int, response_time: float):
     """Record a request metric."""
-    get_metrics_collector().record_request(endpoint, method, status_code, response_time)
+    _metrics_collector.record_request(endpoint, method, status_code, response_time)
 
 
 def set_gauge(name: str, value: float):
     """Set a gauge metric."""
-    get_metrics_collector().set_gauge(name, value)
+    _metrics_collector.set_gauge(name, value)
 
 
 def increment_counter(name: str, value: float = 1.0):
     """Increment a counter metric."""
-    get_metrics_collector().increment_counter(name, value)
+    _metrics_collector.increment_counter(name, value)
 
 
 # HTML rendering metrics
@@ -336,12 +656,8 @@ def record_html_rendering_cache_hit():
 
 def record_html_rendering_duration(duration_seconds: float):
     """Record the duration of a Playwright HTML rendering operation."""
-    collector = get_metrics_collector()
-
     # Update histogram
-    for bucket in collector._histogram_buckets:
-        if duration_seconds <= bucket:
-            collector._histograms["html_rendering_duration_seconds"][bucket] += 1
+    get_metrics_collector().observe_histogram("html_rendering_duration_seconds", duration_seconds)
 
     # Track as gauge for latest value
     set_gauge("html_rendering_latest_duration_seconds", duration_seconds)
@@ -1,48 +1,118 @@
 """Middleware for request metrics collection and monitoring."""
 
 import asyncio
-import time
-from collections.abc import Callable
+import functools
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter_ns
 
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from .metrics import get_metrics_collector
 
+# Metric labels keyed by the first path segment: (label for the bare segment, label
+# when further segments follow), e.g. "/jobs" vs "/jobs/123"
+_PATH_LABELS = {
+    "": ("/", "/download"),
+    "batch": ("/batch", "/batch"),
+    "health": ("/health", "/download"),
+    "metrics": ("/metrics", "/download"),
+    "jobs": ("/download", "/jobs/{job_id}"),
+    "status": ("/download", "/status/{job_id}"),
+    "results": ("/download", "/results/{job_id}"),
+}
+_DOWNLOAD_LABELS = ("/download", "/download")
+
+
+# Most circuit breaker hosts that get their own gauges
+_MAX_CIRCUIT_BREAKER_HOSTS = 128
+
+
+# Start of the current request (perf_counter_ns) and the sub-timings recorded during it,
+# as (name, start, end) in nanoseconds since the request start. The list is created
+# before the request is handed on, so downstream tasks that inherit this context append
+# to the same list.
+_REQUEST_START_NS: ContextVar[int] = ContextVar("request_start_ns")
+_REQUEST_SUBTIMINGS: ContextVar[list[tuple[str, int, int]]] = ContextVar("request_subtimings")
+
+
+@contextmanager
+def subtiming(name: str) -> Iterator[None]:
+    """
+    Time the enclosed block as a named stage of the current request.
+
+    The stage is reported in the ``Server-Timing`` header with its own duration, so
+    stages that run concurrently (e.g. multi-format conversions) do not skew each
+    other. Outside a request timed by MetricsMiddleware this only runs the block.
+    """
+    subtimings = _REQUEST_SUBTIMINGS.get(None)
+    if subtimings is None:
+        yield
+        return
+
+    request_start_ns = _REQUEST_START_NS.get()
+    start_ns = perf_counter_ns() - request_start_ns
+    try:
+        yield
+    finally:
+        subtimings.append((name, start_ns, perf_counter_ns() - request_start_ns))
+
+
+def _server_timing(subtimings: list[tuple[str, int, int]], total_ns: int) -> str:
+    """Format sub-timings and the total duration as a Server-Timing header value."""
+    entries = [
+        f"{name};dur={(end_ns - start_ns) / 1e6:.3f}" for name, start_ns, end_ns in subtimings
+    ]
+    entries.append(f"total;dur={total_ns / 1e6:.3f}")
+    return ", ".join(entries)
+
 
 class MetricsMiddleware(BaseHTTPMiddleware):
     """Middleware to collect request metrics automatically."""
 
+    def __init__(self, app):
+        super().__init__(app)
+        # Bound once: the collector is a process-wide singleton
+        self.collector = get_metrics_collector()
+
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Process request and collect metrics."""
-        start_time = time.time()
+        # Monotonic integer clock: immune to wall-clock adjustments mid-request
+        start_ns = perf_counter_ns()
+        subtimings: list[tuple[str, int, int]] = []
+        start_token = _REQUEST_START_NS.set(start_ns)
+        subtimings_token = _REQUEST_SUBTIMINGS.set(subtimings)
 
-        # Extract endpoint info
+        # Read request attributes once; Starlette builds request.url lazily on first access
         method = request.method
-        path = request.url.path
-
         # Normalize path for metrics (remove dynamic segments)
-        normalized_path = self._normalize_path(path)
+        normalized_path = self._normalize_path(request.url.path)
 
         try:
             response = await call_next(request)
             status_code = response.status_code
-        except Exception as e:
+        except Exception:
             # Record error metrics
-            response_time = time.time() - start_time
-            get_metrics_collector().record_request(
+            self.collector.record_request(
                 endpoint=normalized_path,
                 method=method,
                 status_code=500,
-                response_time=response_time,
+                response_time=(perf_counter_ns() - start_ns) / 1e9,
             )
-            raise e
+            raise
+        finally:
+            _REQUEST_SUBTIMINGS.reset(subtimings_token)
+            _REQUEST_START_NS.reset(start_token)
 
         # Calculate response time
-        response_time = time.time() - start_time
+        elapsed_ns = perf_counter_ns() - start_ns
+        response_time = elapsed_ns / 1e9
 
         # Record metrics
-        get_metrics_collector().record_request(
+        self.collector.record_request(
             endpoint=normalized_path,
             method=method,
             status_code=status_code,
@@ -51,29 +121,16 @@ class MetricsMiddleware(BaseHTTPMiddleware):
 
         # Add response time header for debugging
         response.headers["X-Response-Time"] = f"{response_time:.3f}s"
+        if subtimings:
+            response.headers["Server-Timing"] = _server_timing(subtimings, elapsed_ns)
 
         return response
 
     def _normalize_path(self, path: str) -> str:
         """Normalize URL path for metrics grouping."""
-        # Handle different endpoint patterns
-        if path.startswith("/batch"):
-            return "/batch"
-        elif path == "/health":
-            return "/health"
-        elif path == "/metrics":
-            return "/metrics"
-        elif path.startswith("/jobs/"):
-            return "/jobs/{job_id}"
-        elif path.startswith("/status/"):
-            return "/status/{job_id}"
-        elif path.startswith("/results/"):
-            return "/results/{job_id}"
-        elif path == "/":
-            return "/"
-        else:
-            # For URL downloads - group as /download
-            return "/download"
+        # One dict lookup on the first segment; anything unknown is a URL download
+        segment, slash, _ = path[1:].partition("/")
+        return _PATH_LABELS.get(segment, _DOWNLOAD_LABELS)[1 if slash else 0]
 
 
 class SystemMetricsCollector:
@@ -84,6 +141,9 @@ class SystemMetricsCollector:
         self._running = False
         self._task = None
         self.app_state = None
+        # Circuit breaker host -> (failures gauge, state gauge), least recently seen first;
+        # capped so many distinct hosts cannot grow the gauge set without bound
+        self._cb_gauge_names: OrderedDict[str, tuple[str, str]] = OrderedDict()
 
     async def start(self, app_state=None):
         """Start background metrics collection.
@@ -99,12 +159,16 @@ class SystemMetricsCollector:
     async def stop(self):
         """Stop background metrics collection."""
         self._running = False
-        if self._task:
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
+        task, self._task = self._task, None
+        # Nothing to cancel or wait for when never started or already finished
+        if task is None or task.done():
+            return
+
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
 
     async def _collect_system_metrics(self):
         """Collect system metrics periodically."""
@@ -125,116 +189,134 @@ class SystemMetricsCollector:
         """Collect a snapshot of current system metrics."""
         try:
             # Collect concurrency metrics from semaphores
-            if self.app_state:
-                pdf_semaphore = getattr(self.app_state, "pdf_semaphore", None)
-                batch_semaphore = getattr(self.app_state, "batch_semaphore", None)
-                settings = getattr(self.app_state, "settings", None)
-
-                if pdf_semaphore and batch_semaphore and settings:
-                    # Calculate utilization
-                    pdf_limit = settings.pdf.concurrency
-                    batch_limit = settings.batch.concurrency
-                    pdf_in_use = pdf_limit - pdf_semaphore._value
-                    batch_in_use = batch_limit - batch_semaphore._value
-
-                    pdf_utilization = (pdf_in_use / pdf_limit * 100) if pdf_limit > 0 else 0
-                    batch_utilization = (batch_in_use / batch_limit * 100) if batch_limit > 0 else 0
-
-                    # Set gauge metrics
-                    self.collector.set_gauge("pdf_concurrency_utilization", pdf_utilization)
-                    self.collector.set_gauge("batch_concurrency_utilization", batch_utilization)
-                    self.collector.set_gauge("pdf_concurrency_active", pdf_in_use)
-                    self.collector.set_gauge("batch_concurrency_active", batch_in_use)
-
-            # Collect Redis metrics if available
-            await self._collect_redis_metrics()
-
-            # Collect PDF pool metrics if available
-            await self._collect_pdf_pool_metrics()
+            snapshot = self._concurrency_gauges()
+
+            # Collect Redis, PDF pool and HTTP client metrics concurrently; one failing
+            # source must not stop the others from being published
+            results = await asyncio.gather(
+                self._collect_redis_metrics(),
+                self._collect_pdf_pool_metrics(),
+                self._collect_http_client_metrics(),
+                return_exceptions=True,
+            )
+            for gauges in results:
+                if not isinstance(gauges, BaseException):
+                    snapshot.update(gauges)
 
-            # Collect HTTP client metrics
-            await self._collect_http_client_metrics()
+            # Publish every source in one synchronous update, so a scrape never sees a
+            # half-updated snapshot
+            self.collector.set_gauges(snapshot)
+            self._evict_circuit_breaker_gauges()
 
         except Exception as e:
             import logging
 
             logging.getLogger(__name__).error(f"Error in metrics snapshot: {e}")
 
-    async def _collect_redis_metrics(self):
+    def _concurrency_gauges(self) -> dict[str, float]:
+        """Read semaphore utilization gauges (synchronous, no I/O)."""
+        if not self.app_state:
+            return {}
+
+        pdf_semaphore = getattr(self.app_state, "pdf_semaphore", None)
+        batch_semaphore = getattr(self.app_state, "batch_semaphore", None)
+        settings = getattr(self.app_state, "settings", None)
+        if not (pdf_semaphore and batch_semaphore and settings):
+            return {}
+
+        # Calculate utilization
+        pdf_limit = settings.pdf.concurrency
+        batch_limit = settings.batch.concurrency
+        pdf_in_use = pdf_limit - pdf_semaphore._value
+        batch_in_use = batch_limit - batch_semaphore._value
+
+        pdf_utilization = (pdf_in_use / pdf_limit * 100) if pdf_limit > 0 else 0
+        batch_utilization = (batch_in_use / batch_limit * 100) if batch_limit > 0 else 0
+
+        return {
+            "pdf_concurrency_utilization": pdf_utilization,
+            "batch_concurrency_utilization": batch_utilization,
+            "pdf_concurrency_active": pdf_in_use,
+            "batch_concurrency_active": batch_in_use,
+        }
+
+    async def _collect_redis_metrics(self) -> dict[str, float]:
         """Collect Redis-specific metrics."""
         try:
             if self.app_state:
                 job_manager = getattr(self.app_state, "job_manager", None)
                 if job_manager:
                     stats = await job_manager.get_connection_stats()
-                    if stats.get("status") == "healthy":
-                        self.collector.set_gauge("redis_status", 1)
-                        if "created_connections" in stats:
-                            self.collector.set_gauge(
-                                "redis_created_connections",
-                                stats["created_connections"],
-                            )
-                        if "available_connections" in stats:
-                            self.collector.set_gauge(
-                                "redis_available_connections",
-                                stats["available_connections"],
-                            )
-                        if "in_use_connections" in stats:
-                            self.collector.set_gauge(
-                                "redis_in_use_connections",
-                                stats["in_use_connections"],
-                            )
-                    else:
-                        self.collector.set_gauge("redis_status", 0)
+                    if stats.get("status") != "healthy":
+                        return {"redis_status": 0}
+
+                    gauges = {"redis_status": 1}
+                    for stat in (
+                        "created_connections",
+                        "available_connections",
+                        "in_use_connections",
+                    ):
+                        if stat in stats:
+                            gauges[f"redis_{stat}"] = stats[stat]
+                    return gauges
         except Exception:
-            self.collector.set_gauge("redis_status", 0)
+            return {"redis_status": 0}
+        return {}
 
-    async def _collect_pdf_pool_metrics(self):
+    async def _collect_pdf_pool_metrics(self) -> dict[str, float]:
         """Collect PDF browser pool metrics."""
-        try:
-            # This would need to be implemented in pdf_generator to expose pool stats
-            # For now, just set a placeholder
-            self.collector.set_gauge("pdf_pool_available", 1)  # Placeholder
-        except Exception:
-            pass
+        # This would need to be implemented in pdf_generator to expose pool stats
+        # For now, just report a placeholder
+        return {"pdf_pool_available": 1}
 
-    async def _collect_http_client_metrics(self):
+    async def _collect_http_client_metrics(self) -> dict[str, float]:
         """Collect HTTP client metrics."""
         try:
             if self.app_state:
                 http_client = getattr(self.app_state, "http_client", None)
                 if http_client:
                     stats = http_client.get_connection_stats()
-
-                    if stats.get("status") == "healthy":
-                        self.collector.set_gauge("http_client_status", 1)
-
-                        # Extract circuit breaker stats
-                        circuit_breakers = stats.get("circuit_breakers", {})
-                        for url, cb_stats in circuit_breakers.items():
-                            # Normalize URL for metric name
-                            normalized_url = url.replace(".", "_").replace(":", "_")
-                            self.collector.set_gauge(
-                                f"circuit_breaker_{normalized_url}_failures",
-                                cb_stats.get("failure_count", 0),
-                            )
-                            self.collector.set_gauge(
-                                f"circuit_breaker_{normalized_url}_state",
-                                1 if cb_stats.get("state") == "closed" else 0,
-                            )
-                    else:
-                        self.collector.set_gauge("http_client_status", 0)
+                    if stats.get("status") != "healthy":
+                        return {"http_client_status": 0}
+
+                    gauges = {"http_client_status": 1}
+
+                    # Extract circuit breaker stats
+                    circuit_breakers = stats.get("circuit_breakers", {})
+                    for url, cb_stats in circuit_breakers.items():
+                        failures_name, state_name = self._circuit_breaker_gauge_names(url)
+                        gauges[failures_name] = cb_stats.get("failure_count", 0)
+                        gauges[state_name] = 1 if cb_stats.get("state") == "closed" else 0
+                    return gauges
         except Exception:
-            self.collector.set_gauge("http_client_status", 0)
-
+            return {"http_client_status": 0}
+        return {}
+
+    def _circuit_breaker_gauge_names(self, url: str) -> tuple[str, str]:
+        """Gauge names for a circuit breaker host, built once per host."""
+        names = self._cb_gauge_names.get(url)
+        if names is not None:
+            self._cb_gauge_names.move_to_end(url)
+            return names
+
+        # Normalize URL for metric name
+        normalized_url = url.replace(".", "_").replace(":", "_")
+        names = (
+            f"circuit_breaker_{normalized_url}_failures",
+            f"circuit_breaker_{normalized_url}_state",
+        )
+        self._cb_gauge_names[url] = names
+        return names
 
-# Global system metrics collector
-_system_metrics_collector = None
+    def _evict_circuit_breaker_gauges(self):
+        """Drop the gauges of the least recently seen hosts beyond the cap."""
+        while len(self._cb_gauge_names) > _MAX_CIRCUIT_BREAKER_HOSTS:
+            _, evicted = self._cb_gauge_names.popitem(last=False)
+            for name in evicted:
+                self.collector.delete_gauge(name)
 
 
+@functools.cache
 def get_system_metrics_collector() -> SystemMetricsCollector:
-    """Get the global system metrics collector."""
-    global _system_metrics_collector
-    if _system_metrics_collector is None:
-        _system_metrics_collector = SystemMetricsCollector()
-    return _system_metrics_collector
+    """Get the global system metrics collector (created on first call)."""
+    return SystemMetricsCollector()
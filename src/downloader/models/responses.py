@@ -110,6 +110,15 @@ class JobStatusResponse(BaseModel):
     expires_at: str | None = Field(None, description="Job expiration timestamp")
 
 
+class JobStatusListResponse(BaseModel):
+    """Response model for checking the status of several jobs at once."""
+
+    jobs: list[JobStatusResponse] = Field(..., description="Status of each job that was found")
+    not_found: list[str] = Field(
+        default_factory=list, description="Requested job IDs that do not exist or expired"
+    )
+
+
 # Concurrency stats models
 class ConcurrencyInfo(BaseModel):
     """Model for concurrency information of a specific service."""
@@ -10,6 +10,33 @@ from .browser import BrowserConfig, BrowserPool, BrowserPoolError
 logger = logging.getLogger(__name__)
 
 
+# Options for every browser context created for PDF generation
+_CONTEXT_OPTIONS = {
+    "user_agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "viewport": {"width": 1280, "height": 720},
+    "ignore_https_errors": False,  # Security: don't ignore HTTPS errors
+    "java_script_enabled": True,
+    "bypass_csp": False,  # Security: respect Content Security Policy
+}
+
+# Page options used unless overridden per call
+_DEFAULT_PDF_OPTIONS = {
+    "format": "A4",
+    "print_background": True,
+    "margin": {
+        "top": "20px",
+        "right": "20px",
+        "bottom": "20px",
+        "left": "20px",
+    },
+}
+
+_NOT_INITIALIZED_MESSAGE = "Browser pool not initialized. Call start() first."
+
+# Idle contexts kept per browser when context reuse is enabled
+_MAX_IDLE_CONTEXTS_PER_BROWSER = 2
+
+
 class PDFGeneratorError(Exception):
     """Raised when PDF generation fails."""
 
@@ -25,6 +52,7 @@ class PlaywrightPDFGenerator:
         page_load_timeout: int = 30000,
         wait_until: str = "networkidle",
         memory_limit_mb: int = 512,
+        reuse_contexts: bool = False,
     ):
         self.pool: BrowserPool | None = None
         self.pool_config = BrowserConfig(
@@ -33,6 +61,9 @@ class PlaywrightPDFGenerator:
         )
         self.page_load_timeout = page_load_timeout
         self.wait_until = wait_until
+        self.reuse_contexts = reuse_contexts
+        # Idle contexts per browser, only populated when reuse_contexts is enabled
+        self._idle_contexts: dict[Any, list[Any]] = {}
 
     @property
     def pool_size(self) -> int:
@@ -61,6 +92,7 @@ class PlaywrightPDFGenerator:
     async def close(self):
         """Close browser pool and cleanup."""
         try:
+            await self._close_idle_contexts()
             if self.pool:
                 await self.pool.close()
                 self.pool = None
@@ -72,32 +104,26 @@ class PlaywrightPDFGenerator:
     async def _get_browser_context(self):
         """Async context manager for automatic browser resource cleanup."""
         if not self.pool:
-            raise PDFGeneratorError("Browser pool not initialized. Call start() first.")
+            raise PDFGeneratorError(_NOT_INITIALIZED_MESSAGE)
 
         browser = None
         context = None
+        reusable = False
         try:
             # Get browser from pool with O(1) selection
             browser = await self.pool.get_browser()
 
-            # Create isolated context for this request (security)
-            context = await browser.new_context(
-                user_agent="Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                viewport={"width": 1280, "height": 720},
-                ignore_https_errors=False,  # Security: don't ignore HTTPS errors
-                java_script_enabled=True,
-                bypass_csp=False,  # Security: respect Content Security Policy
-            )
+            # Isolated context for this request (security), or an idle one when reuse is on
+            context = await self._acquire_context(browser)
 
             yield browser, context
+            # Only a context that served a request without error goes back for reuse
+            reusable = True
 
         finally:
             # Automatic cleanup - guaranteed to run even on exceptions
             if context:
-                try:
-                    await context.close()  # This closes all pages in context
-                except Exception as e:
-                    logger.warning(f"Error closing browser context: {e}")
+                await self._release_context(browser, context, reusable)
 
             if browser and self.pool:
                 try:
@@ -105,6 +131,46 @@ class PlaywrightPDFGenerator:
                 except Exception as e:
                     logger.warning(f"Error releasing browser to pool: {e}")
 
+    async def _acquire_context(self, browser):
+        """Take an idle context of this browser if reuse is enabled, else create one."""
+        if self.reuse_contexts:
+            idle = self._idle_contexts.get(browser)
+            if idle and browser.is_connected():
+                return idle.pop()
+        return await browser.new_context(**_CONTEXT_OPTIONS)
+
+    async def _release_context(self, browser, context, reusable: bool):
+        """Keep a used context for reuse (cookies and permissions cleared) or close it."""
+        if self.reuse_contexts:
+            if not browser.is_connected():
+                # Contexts of a disconnected browser can never be reused
+                self._idle_contexts.pop(browser, None)
+            elif reusable:
+                idle = self._idle_contexts.setdefault(browser, [])
+                if len(idle) < _MAX_IDLE_CONTEXTS_PER_BROWSER:
+                    try:
+                        await context.clear_cookies()
+                        await context.clear_permissions()
+                        idle.append(context)
+                        return
+                    except Exception as e:
+                        logger.warning(f"Error resetting browser context for reuse: {e}")
+
+        try:
+            await context.close()  # This closes all pages in context
+        except Exception as e:
+            logger.warning(f"Error closing browser context: {e}")
+
+    async def _close_idle_contexts(self):
+        """Close every context kept for reuse."""
+        idle_contexts, self._idle_contexts = self._idle_contexts, {}
+        for contexts in idle_contexts.values():
+            for context in contexts:
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.warning(f"Error closing idle browser context: {e}")
+
     async def generate_pdf(self, url: str, options: dict[str, Any] | None = None) -> bytes:
         """
         Generate PDF from URL using optimized browser pool with automatic resource cleanup.
@@ -119,23 +185,18 @@ class PlaywrightPDFGenerator:
         Raises:
             PDFGeneratorError: If PDF generation fails
         """
-        # Default PDF options - use instance settings
+        # Fail before any other work when start() has not been called
+        if self.pool is None:
+            raise PDFGeneratorError(_NOT_INITIALIZED_MESSAGE)
+
+        # Defaults, then instance settings, then per-call overrides, merged in one step
         pdf_options = {
-            "format": "A4",
-            "print_background": True,
-            "margin": {
-                "top": "20px",
-                "right": "20px",
-                "bottom": "20px",
-                "left": "20px",
-            },
+            **_DEFAULT_PDF_OPTIONS,
             "wait_for": self.wait_until,
             "timeout": self.page_load_timeout,
+            **(options or {}),
         }
-
-        # Override with custom options
-        if options:
-            pdf_options.update(options)
+        timeout = pdf_options["timeout"]
 
         try:
             # Use automatic resource cleanup with async context manager
@@ -149,8 +210,8 @@ class PlaywrightPDFGenerator:
                     try:
                         response = await page.goto(
                             url,
-                            wait_until=pdf_options.get("wait_for", "networkidle"),
-                            timeout=pdf_options.get("timeout", 30000),
+                            wait_until=pdf_options["wait_for"],
+                            timeout=timeout,
                         )
 
                         if not response:
@@ -167,7 +228,7 @@ class PlaywrightPDFGenerator:
                     # Wait for page to be fully loaded
                     await page.wait_for_load_state(
                         "networkidle",
-                        timeout=pdf_options.get("timeout", 30000),
+                        timeout=timeout,
                     )
 
                     # Try to close any signup boxes/modals
@@ -180,17 +241,9 @@ class PlaywrightPDFGenerator:
 
                     # Generate PDF with specified options
                     pdf_bytes = await page.pdf(
-                        format=pdf_options.get("format", "A4"),
-                        print_background=pdf_options.get("print_background", True),
-                        margin=pdf_options.get(
-                            "margin",
-                            {
-                                "top": "20px",
-                                "right": "20px",
-                                "bottom": "20px",
-                                "left": "20px",
-                            },
-                        ),
+                        format=pdf_options["format"],
+                        print_background=pdf_options["print_background"],
+                        margin=pdf_options["margin"],
                         prefer_css_page_size=True,
                         display_header_footer=False,
                     )
@@ -241,6 +294,24 @@ _pdf_generator: PlaywrightPDFGenerator | None = None
 _initialization_lock = asyncio.Lock()
 
 
+async def _get_started_generator() -> PlaywrightPDFGenerator:
+    """Return the shared PDF generator, creating and starting it on first use."""
+    global _pdf_generator
+
+    # Fast path once initialized: no lock, no context manager
+    generator = _pdf_generator
+    if generator is not None:
+        return generator
+
+    # Use lock to prevent multiple simultaneous initializations
+    async with _initialization_lock:
+        if _pdf_generator is None:
+            generator = PlaywrightPDFGenerator(pool_size=2)  # Reduce pool size for Docker
+            await generator.start()
+            _pdf_generator = generator
+        return _pdf_generator
+
+
 @asynccontextmanager
 async def get_pdf_generator():
     """
@@ -251,14 +322,10 @@ async def get_pdf_generator():
     """
     global _pdf_generator
 
-    # Use lock to prevent multiple simultaneous initializations
-    async with _initialization_lock:
-        if _pdf_generator is None:
-            _pdf_generator = PlaywrightPDFGenerator(pool_size=2)  # Reduce pool size for Docker
-            await _pdf_generator.start()
+    generator = await _get_started_generator()
 
     try:
-        yield _pdf_generator
+        yield generator
     except Exception as e:
         logger.error(f"Error in PDF generator: {e}")
         # Don't recreate on every error - only close if it's a severe error
@@ -284,8 +351,8 @@ async def generate_pdf_from_url(url: str, options: dict[str, Any] | None = None)
     Raises:
         PDFGeneratorError: If PDF generation fails
     """
-    async with get_pdf_generator() as generator:
-        return await generator.generate_pdf(url, options)
+    generator = await _get_started_generator()
+    return await generator.generate_pdf(url, options)
 
 
 def get_shared_pdf_generator() -> PlaywrightPDFGenerator | None:
@@ -293,6 +360,17 @@ def get_shared_pdf_generator() -> PlaywrightPDFGenerator | None:
     return _pdf_generator
 
 
+def set_shared_pdf_generator(generator: PlaywrightPDFGenerator) -> None:
+    """
+    Use an already started generator as the shared instance.
+
+    The app lifespan publishes its configured generator here so PDF generation
+    runs on a single browser pool instead of creating a second one on first use.
+    """
+    global _pdf_generator
+    _pdf_generator = generator
+
+
 async def cleanup_pdf_generator():
     """Cleanup global PDF generator instance."""
     global _pdf_generator
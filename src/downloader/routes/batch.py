@@ -7,7 +7,7 @@ import logging
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Request, Response
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
 
 from ..auth import get_api_key
 from ..content_converter import convert_content_to_markdown, convert_content_to_text
@@ -24,6 +24,7 @@ from ..models.responses import (
     BatchURLRequest,
     BatchURLResult,
     ErrorResponse,
+    JobStatusListResponse,
     JobStatusResponse,
     JobSubmissionResponse,
 )
@@ -335,6 +336,7 @@ async def process_background_batch_job(
         processed_urls=len(results),
         successful_urls=len(successful_results),
         failed_urls=len(failed_results),
+        durable=False,
     )
 
     logger.info(
@@ -428,6 +430,65 @@ async def submit_batch_job(
         )
 
 
+def _job_status_response(job_info) -> JobStatusResponse:
+    """Build the status response for a stored job."""
+    return JobStatusResponse(
+        job_id=job_info.job_id,
+        status=job_info.status.value,
+        progress=job_info.progress,
+        created_at=job_info.created_at.isoformat(),
+        started_at=job_info.started_at.isoformat() if job_info.started_at else None,
+        completed_at=job_info.completed_at.isoformat() if job_info.completed_at else None,
+        total_urls=job_info.total_urls,
+        processed_urls=job_info.processed_urls,
+        successful_urls=job_info.successful_urls,
+        failed_urls=job_info.failed_urls,
+        error_message=job_info.error_message,
+        results_available=job_info.results_available,
+        expires_at=job_info.expires_at.isoformat() if job_info.expires_at else None,
+    )
+
+
+@router.get("/jobs/status")
+async def get_jobs_status(
+    job_ids: list[str] = Query(
+        ..., alias="job_id", min_length=1, max_length=100, description="Job identifiers"
+    ),
+    job_manager: JobManagerDep = None,
+    api_key: str | None = Depends(get_api_key),
+) -> JobStatusListResponse:
+    """Get the status of several batch processing jobs in one request."""
+    if job_manager is None:
+        raise HTTPException(
+            status_code=503,
+            detail=ErrorResponse(
+                error="Batch processing is not available. Redis connection (REDIS_URI) is required.",
+                error_type="service_unavailable",
+            ).model_dump(),
+        )
+
+    try:
+        job_infos = await job_manager.get_job_infos(job_ids)
+
+        response = JobStatusListResponse(jobs=[])
+        for job_id, job_info in zip(job_ids, job_infos, strict=True):
+            if job_info:
+                response.jobs.append(_job_status_response(job_info))
+            else:
+                response.not_found.append(job_id)
+        return response
+
+    except Exception as e:
+        logger.exception(f"Failed to get job status for {len(job_ids)} jobs: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=ErrorResponse(
+                error="Failed to retrieve job status",
+                error_type="job_status_error",
+            ).model_dump(),
+        )
+
+
 @router.get("/jobs/{job_id}/status")
 async def get_job_status(
     job_id: str = Path(..., description="Job identifier"),
@@ -456,21 +517,7 @@ async def get_job_status(
                 ).model_dump(),
             )
 
-        return JobStatusResponse(
-            job_id=job_info.job_id,
-            status=job_info.status.value,
-            progress=job_info.progress,
-            created_at=job_info.created_at.isoformat(),
-            started_at=job_info.started_at.isoformat() if job_info.started_at else None,
-            completed_at=job_info.completed_at.isoformat() if job_info.completed_at else None,
-            total_urls=job_info.total_urls,
-            processed_urls=job_info.processed_urls,
-            successful_urls=job_info.successful_urls,
-            failed_urls=job_info.failed_urls,
-            error_message=job_info.error_message,
-            results_available=job_info.results_available,
-            expires_at=job_info.expires_at.isoformat() if job_info.expires_at else None,
-        )
+        return _job_status_response(job_info)
 
     except HTTPException:
         raise
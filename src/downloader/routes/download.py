@@ -13,6 +13,7 @@ from ..http_client import (
     HTTPTimeoutError,
     RequestPriority,
 )
+from ..middleware import subtiming
 from ..models.responses import ErrorResponse
 from ..pdf_generator import PDFGeneratorError
 from ..services.content_processor import (
@@ -100,7 +101,8 @@ async def download_url(
         validated_url = validate_url(url)
         logger.info(f"Processing download request for: {validated_url}")
 
-        content, metadata = await http_client.download(validated_url, RequestPriority.HIGH)
+        with subtiming("fetch"):
+            content, metadata = await http_client.download(validated_url, RequestPriority.HIGH)
 
         # If wait_for is specified, it implies render=true
         effective_render = render or (wait_for is not None)
@@ -23,6 +23,7 @@ from ..metrics import (
     record_html_rendering_failure,
     record_html_rendering_success,
 )
+from ..middleware import subtiming
 from ..models.responses import ErrorResponse, ResponseMetadata
 from ..pdf_generator import generate_pdf_from_url
 
@@ -211,25 +212,26 @@ async def handle_text_response(
     validated_url: str, content: bytes, metadata: ResponseMetadata
 ) -> Response:
     """Handle plain text format response."""
-    text_content = convert_content_to_text(content, metadata["content_type"])
+    with subtiming("convert-text"):
+        text_content = convert_content_to_text(content, metadata["content_type"])
 
-    if "html" in metadata["content_type"].lower():
-        logger.info(
-            f"BS4 text extraction for {validated_url}: {len(text_content)} characters extracted"
-        )
+        if "html" in metadata["content_type"].lower():
+            logger.info(
+                f"BS4 text extraction for {validated_url}: {len(text_content)} characters extracted"
+            )
 
-        text_content = await _playwright_fallback_for_content(
-            validated_url,
-            text_content,
-            content,
-            metadata["content_type"],
-            "text",
-        )
+            text_content = await _playwright_fallback_for_content(
+                validated_url,
+                text_content,
+                content,
+                metadata["content_type"],
+                "text",
+            )
 
-        if text_content.strip():
-            logger.debug(f"Successfully extracted content for {validated_url}")
-    else:
-        logger.debug(f"Non-HTML content for {validated_url}, skipping fallback logic")
+            if text_content.strip():
+                logger.debug(f"Successfully extracted content for {validated_url}")
+        else:
+            logger.debug(f"Non-HTML content for {validated_url}, skipping fallback logic")
 
     return Response(
         content=text_content,
@@ -246,25 +248,26 @@ async def handle_markdown_response(
     validated_url: str, content: bytes, metadata: ResponseMetadata
 ) -> Response:
     """Handle markdown format response."""
-    markdown_content = convert_content_to_markdown(content, metadata["content_type"])
+    with subtiming("convert-markdown"):
+        markdown_content = convert_content_to_markdown(content, metadata["content_type"])
 
-    if "html" in metadata["content_type"].lower():
-        logger.info(
-            f"BS4 markdown extraction for {validated_url}: {len(markdown_content)} characters extracted"
-        )
+        if "html" in metadata["content_type"].lower():
+            logger.info(
+                f"BS4 markdown extraction for {validated_url}: {len(markdown_content)} characters extracted"
+            )
 
-        markdown_content = await _playwright_fallback_for_content(
-            validated_url,
-            markdown_content,
-            content,
-            metadata["content_type"],
-            "markdown",
-        )
+            markdown_content = await _playwright_fallback_for_content(
+                validated_url,
+                markdown_content,
+                content,
+                metadata["content_type"],
+                "markdown",
+            )
 
-        if markdown_content.strip():
-            logger.debug(f"Successfully extracted markdown for {validated_url}")
-    else:
-        logger.debug(f"Non-HTML content for {validated_url}, skipping markdown fallback logic")
+            if markdown_content.strip():
+                logger.debug(f"Successfully extracted markdown for {validated_url}")
+        else:
+            logger.debug(f"Non-HTML content for {validated_url}, skipping markdown fallback logic")
 
     return Response(
         content=markdown_content,
@@ -295,8 +298,9 @@ async def handle_pdf_response(
             ).model_dump(),
         )
 
-    async with pdf_semaphore:
-        pdf_content = await generate_pdf_from_url(validated_url)
+    with subtiming("pdf"):
+        async with pdf_semaphore:
+            pdf_content = await generate_pdf_from_url(validated_url)
 
     return Response(
         content=pdf_content,
@@ -347,7 +351,10 @@ async def handle_html_response(
             try:
                 # Render HTML with Playwright
                 start_time = time.time()
-                rendered_html = await render_html_with_playwright(validated_url, wait_for_selector)
+                with subtiming("render"):
+                    rendered_html = await render_html_with_playwright(
+                        validated_url, wait_for_selector
+                    )
                 duration = time.time() - start_time
 
                 logger.info(
@@ -108,6 +108,46 @@ class TestDownloadEndpoint:
         finally:
             app.dependency_overrides.pop(get_http_client, None)
 
+    def test_download_reports_server_timing(self, api_client):
+        """Test the fetch and conversion stages are reported in Server-Timing."""
+        mock_content = b"<html><body><h1>Hello</h1><p>World</p></body></html>"
+        mock_client = AsyncMock()
+        mock_client.download.return_value = (
+            mock_content,
+            {
+                "url": "https://example.com",
+                "status_code": 200,
+                "content_type": "text/html",
+                "size": len(mock_content),
+                "headers": {"content-type": "text/html"},
+            },
+        )
+
+        async def mock_get_http_client():
+            return mock_client
+
+        app.dependency_overrides[get_http_client] = mock_get_http_client
+        try:
+            # Clock reads: request start, fetch start/end, convert start/end, request end
+            clock_ms = [0, 5, 120, 125, 140, 150]
+            with (
+                patch("src.downloader.routes.download.validate_url", side_effect=lambda url: url),
+                patch(
+                    "src.downloader.middleware.perf_counter_ns",
+                    side_effect=[ms * 1_000_000 for ms in clock_ms],
+                ),
+            ):
+                response = api_client.get(
+                    "/https://example.com", headers={"Accept": "text/markdown"}
+                )
+            assert response.status_code == 200
+            # Each stage reports its own duration, not its offset from the request start
+            assert response.headers["Server-Timing"] == (
+                "fetch;dur=115.000, convert-markdown;dur=15.000, total;dur=150.000"
+            )
+        finally:
+            app.dependency_overrides.pop(get_http_client, None)
+
     def test_download_invalid_url(self, api_client):
         response = api_client.get("/invalid_url!")
         assert response.status_code == 400
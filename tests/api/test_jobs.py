@@ -50,6 +50,32 @@ class TestJobEndpoints:
         finally:
             app.dependency_overrides.pop(get_job_manager_dependency, None)
 
+    def test_get_jobs_status(self, api_client, mock_job_manager):
+        """Test getting the status of several jobs in one request."""
+        job_info = JobInfo(
+            job_id="job-1",
+            status=JobStatus.COMPLETED,
+            progress=100,
+            created_at=datetime.now(timezone.utc),
+            request_data={},
+        )
+        mock_job_manager.get_job_infos.return_value = [job_info, None]
+
+        async def mock_get_job_manager():
+            return mock_job_manager
+
+        app.dependency_overrides[get_job_manager_dependency] = mock_get_job_manager
+        try:
+            response = api_client.get("/jobs/status?job_id=job-1&job_id=job-2")
+            assert response.status_code == 200
+            data = response.json()
+            assert [job["job_id"] for job in data["jobs"]] == ["job-1"]
+            assert data["jobs"][0]["status"] == "completed"
+            assert data["not_found"] == ["job-2"]
+            mock_job_manager.get_job_infos.assert_awaited_once_with(["job-1", "job-2"])
+        finally:
+            app.dependency_overrides.pop(get_job_manager_dependency, None)
+
     def test_get_job_results_found(self, api_client, mock_job_manager):
         """Test getting the results of a completed job."""
         job_id = "test-job-id"
@@ -3,6 +3,7 @@
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
 from src.downloader.dependencies import (
@@ -14,6 +15,7 @@ from src.downloader.dependencies import (
 )
 from src.downloader.main import app
 from src.downloader.models.schedule import ExecutionStatus, ScheduleExecution
+from src.downloader.pdf_generator import PlaywrightPDFGenerator
 
 
 @pytest.fixture
@@ -44,6 +46,25 @@ def mock_http_client():
     return mock_client
 
 
+@pytest.fixture
+def use_transport():
+    """
+    Fixture to answer an HTTPClient's requests at the httpx transport layer.
+
+    Returns an async function ``use_transport(client, handler)`` that closes the
+    client's own httpx.AsyncClient and replaces it with one whose transport calls
+    ``handler``. The replacement is closed when the HTTPClient is closed.
+    """
+
+    async def install(client, handler) -> None:
+        await client._client.aclose()
+        client._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), headers=client._client.headers
+        )
+
+    return install
+
+
 @pytest.fixture
 def override_http_client(mock_http_client):
     """
@@ -150,6 +171,30 @@ def mock_browser_pool():
         yield pool_instance, browser
 
 
+@pytest.fixture
+async def started_pdf_generator(mock_browser_pool):
+    """Started PlaywrightPDFGenerator wired for a successful page load and PDF render.
+
+    Yields (generator, page, context, pool_instance, browser). Tests override only the
+    attribute they exercise, e.g. ``page.goto.return_value.status = 404``. The fixed
+    post-load wait is skipped so each test runs in milliseconds.
+    """
+    pool_instance, browser = mock_browser_pool
+
+    page = AsyncMock()
+    page.goto.return_value.status = 200
+    page.goto.return_value.status_text = "OK"
+    page.pdf.return_value = b"PDF content"
+    context = AsyncMock()
+    context.new_page.return_value = page
+    browser.new_context.return_value = context
+
+    with patch("src.downloader.pdf_generator.asyncio.sleep", AsyncMock()):
+        generator = PlaywrightPDFGenerator()
+        await generator.start()
+        yield generator, page, context, pool_instance, browser
+
+
 # ============= Scheduler Fixtures =============
 
 
@@ -212,14 +212,10 @@ class TestGlobalPDFFunctions:
     @pytest.mark.asyncio
     async def test_generate_pdf_from_url(self):
         """Test generate_pdf_from_url function."""
-        with patch("src.downloader.pdf_generator.get_pdf_generator") as mock_get_generator:
+        with patch("src.downloader.pdf_generator._get_started_generator") as mock_get_generator:
             mock_generator = AsyncMock()
             mock_generator.generate_pdf = AsyncMock(return_value=b"PDF content")
-
-            mock_context = AsyncMock()
-            mock_context.__aenter__ = AsyncMock(return_value=mock_generator)
-            mock_context.__aexit__ = AsyncMock(return_value=None)
-            mock_get_generator.return_value = mock_context
+            mock_get_generator.return_value = mock_generator
 
             result = await generate_pdf_from_url("https://example.com")
 
@@ -1,5 +1,3 @@
-from unittest.mock import AsyncMock, MagicMock, patch
-
 import httpx
 import pytest
 
@@ -14,70 +12,59 @@ from src.downloader.http_client import (
 
 class TestHTTPClient:
     @pytest.fixture
-    def http_client(self):
-        return HTTPClient(timeout=5.0, max_redirects=5, user_agent="TestAgent/1.0")
+    async def http_client(self):
+        async with HTTPClient(timeout=5.0, max_redirects=5, user_agent="TestAgent/1.0") as client:
+            yield client
 
     @pytest.mark.asyncio
-    async def test_successful_download(self, http_client):
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.url = "https://example.com"
-        mock_response.headers = MagicMock()
-        mock_response.headers.get.return_value = "text/html"
-        mock_response.headers.__iter__ = lambda self: iter(
-            [("content-type", "text/html"), ("content-length", "100")]
-        )
-        mock_response.headers.items.return_value = [
-            ("content-type", "text/html"),
-            ("content-length", "100"),
-        ]
-        mock_response.content = b"<html>test</html>"
-        mock_response.reason_phrase = "OK"
-
-        with patch.object(http_client._client, "get", new_callable=AsyncMock) as mock_get:
-            mock_get.return_value = mock_response
-
-            content, metadata = await http_client.download("https://example.com")
-
-            assert content == b"<html>test</html>"
-            assert metadata["status_code"] == 200
-            assert metadata["url"] == "https://example.com"
-            assert metadata["content_type"] == "text/html"
-            assert metadata["size"] == 17
+    async def test_successful_download(self, http_client, use_transport):
+        requests = []
 
-    @pytest.mark.asyncio
-    async def test_timeout_error(self, http_client):
-        with patch.object(http_client._client, "get", new_callable=AsyncMock) as mock_get:
-            mock_get.side_effect = httpx.TimeoutException("Timeout")
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(
+                200, headers={"content-type": "text/html"}, content=b"<html>test</html>"
+            )
+
+        await use_transport(http_client, handler)
 
-            with pytest.raises(HTTPTimeoutError) as exc_info:
-                await http_client.download("https://example.com")
+        content, metadata = await http_client.download("https://example.com")
 
-            assert "timed out" in str(exc_info.value)
+        assert content == b"<html>test</html>"
+        assert metadata["status_code"] == 200
+        assert metadata["url"] == "https://example.com"
+        assert metadata["content_type"] == "text/html"
+        assert metadata["size"] == 17
+        assert requests[0].headers["user-agent"] == "TestAgent/1.0"
 
     @pytest.mark.asyncio
-    async def test_http_error_response(self, http_client):
-        mock_response = MagicMock()
-        mock_response.status_code = 404
-        mock_response.reason_phrase = "Not Found"
+    async def test_timeout_error(self, http_client, use_transport):
+        def handler(request):
+            raise httpx.ReadTimeout("Timeout", request=request)
 
-        with patch.object(http_client._client, "get", new_callable=AsyncMock) as mock_get:
-            mock_get.return_value = mock_response
+        await use_transport(http_client, handler)
+
+        with pytest.raises(HTTPTimeoutError, match="timed out"):
+            await http_client.download("https://example.com")
+
+    @pytest.mark.asyncio
+    async def test_http_error_response(self, http_client, use_transport):
+        await use_transport(http_client, lambda request: httpx.Response(404))
 
-            with pytest.raises(HTTPClientError) as exc_info:
-                await http_client.download("https://example.com")
+        with pytest.raises(HTTPClientError, match="HTTP 404") as exc_info:
+            await http_client.download("https://example.com")
 
-            assert "HTTP 404" in str(exc_info.value)
+        assert exc_info.value.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_request_error(self, http_client):
-        with patch.object(http_client._client, "get", new_callable=AsyncMock) as mock_get:
-            mock_get.side_effect = httpx.RequestError("Connection failed")
+    async def test_request_error(self, http_client, use_transport):
+        def handler(request):
+            raise httpx.ConnectError("Connection failed", request=request)
 
-            with pytest.raises(HTTPClientError) as exc_info:
-                await http_client.download("https://example.com")
+        await use_transport(http_client, handler)
 
-            assert "Request failed" in str(exc_info.value)
+        with pytest.raises(HTTPClientError, match="Request failed"):
+            await http_client.download("https://example.com")
 
     @pytest.mark.asyncio
     async def test_context_manager(self):
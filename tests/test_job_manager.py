@@ -2,13 +2,15 @@
 
 import asyncio
 from datetime import datetime, timedelta, timezone
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import DEFAULT, AsyncMock, MagicMock, patch
 
+import orjson
 import pytest
 import redis.asyncio as redis
 
 from src.downloader.job_manager import (
     JobInfo,
+    JobInfoView,
     JobManager,
     JobResult,
     JobStatus,
@@ -16,19 +18,36 @@ from src.downloader.job_manager import (
     get_job_manager,
 )
 
+# Un-awaited coroutines from mocks are bugs in the test, not noise
+pytestmark = pytest.mark.filterwarnings("error::RuntimeWarning")
+
 # =============================================================================
 # Mock Classes
 # =============================================================================
 
 
 class MockPipeline:
-    """Mock Redis pipeline for transaction testing."""
+    """Mock Redis pipeline that records queued commands and script calls."""
+
+    def __init__(self, results=None):
+        self.results = results
+        self.execute_count = 0
+        self.hset = MagicMock()
+        self.expire = MagicMock()
+        self.hgetall = MagicMock()
+        self.type = MagicMock()
+        self.script_calls: list[tuple[list, list]] = []
+        self.executed_script_calls = 0
 
-    def __init__(self):
-        self.watch = AsyncMock()
-        self.multi = MagicMock()  # multi() is not async
-        self.execute = AsyncMock(return_value=[True, True])
-        self.setex = AsyncMock()
+    async def execute(self):
+        self.execute_count += 1
+        if self.results is not None:
+            return self.results
+        # Every queued command and script succeeds (e.g. the job exists)
+        queued_scripts = len(self.script_calls) - self.executed_script_calls
+        self.executed_script_calls = len(self.script_calls)
+        queued = (self.hset, self.expire)
+        return [1] * (sum(command.call_count for command in queued) + queued_scripts)
 
     async def __aenter__(self):
         return self
@@ -37,19 +56,37 @@ class MockPipeline:
         pass
 
 
-class MockPipelineWithWatchError(MockPipeline):
-    """Pipeline that raises WatchError for retry testing."""
+def hash_reply(mapping: dict) -> dict[bytes, bytes]:
+    """Render HSET input the way Redis returns it from HGETALL (bytes keys and values)."""
+    return {k.encode(): v if isinstance(v, bytes) else str(v).encode() for k, v in mapping.items()}
 
-    def __init__(self, fail_count=1):
-        super().__init__()
-        self.fail_count = fail_count
-        self.attempt = 0
 
-    async def execute(self):
-        self.attempt += 1
-        if self.attempt <= self.fail_count:
-            raise redis.WatchError("Concurrent modification")
-        return [True, True]
+def job_fields(job_info: JobInfo) -> dict[bytes, bytes]:
+    """Render JobInfo as the bytes mapping HGETALL would return."""
+    return hash_reply(JobManager._serialize_job_info(job_info))
+
+
+def status_script_fields(args: list) -> dict:
+    """Hash fields from the status update script's ARGV (after TTL and started_at)."""
+    return dict(zip(args[2::2], args[3::2], strict=True))
+
+
+def run_script(keys=None, args=None, client=None):
+    """Mock script side effect: calls through a pipeline are queued on it."""
+    if isinstance(client, MockPipeline):
+        client.script_calls.append((keys, args))
+        return client
+    return DEFAULT
+
+
+def hmget_from(job_info: JobInfo):
+    """Build an HMGET side effect that answers from the given job's hash fields."""
+    fields = job_fields(job_info)
+
+    async def hmget(key, keys):
+        return [fields.get(k.encode()) for k in keys]
+
+    return hmget
 
 
 # =============================================================================
@@ -59,11 +96,25 @@ class MockPipelineWithWatchError(MockPipeline):
 
 @pytest.fixture
 def mock_redis_client():
-    """Fixture to mock the Redis client with proper pipeline support."""
-    mock_client = AsyncMock()
+    """Fixture to mock the Redis client with proper pipeline support.
+
+    ``spec_set`` restricts the mock to attributes that exist on the real client,
+    so typos fail loudly instead of silently creating new child mocks. Redis
+    command methods are plain ``def``s on the class, so the ones the JobManager
+    awaits are wired up explicitly as ``AsyncMock``.
+    """
+    mock_client = AsyncMock(spec_set=redis.Redis)
     mock_client.pipeline = MagicMock(return_value=MockPipeline())
+    mock_client.get = AsyncMock()
+    mock_client.setex = AsyncMock()
+    mock_client.hgetall = AsyncMock()
+    mock_client.hmget = AsyncMock()
+    mock_client.delete = AsyncMock()
     mock_client.ping = AsyncMock()
     mock_client.close = AsyncMock()
+    mock_client.register_script = MagicMock(
+        return_value=AsyncMock(return_value=0, side_effect=run_script)
+    )
     return mock_client
 
 
@@ -103,13 +154,36 @@ class TestJobManager:
         job_id = await job_manager.create_job(request_data)
 
         assert isinstance(job_id, str)
-        mock_redis_client.setex.assert_called_once()
-        args, _ = mock_redis_client.setex.call_args
+        pipeline = mock_redis_client.pipeline.return_value
+        assert pipeline.execute_count == 1
+        pipeline.hset.assert_called_once()
+        args, kwargs = pipeline.hset.call_args
         assert args[0] == f"job:{job_id}"
-        assert isinstance(args[1], int)
-        job_info = JobInfo.model_validate_json(args[2])
+        pipeline.expire.assert_called_once_with(f"job:{job_id}", job_manager.job_ttl)
+        job_info = JobManager._deserialize_job_info(hash_reply(kwargs["mapping"]))
         assert job_info.job_id == job_id
         assert job_info.status == JobStatus.PENDING
+        assert job_info.request_data == request_data
+
+    @pytest.mark.asyncio
+    async def test_create_jobs_single_round_trip(self, job_manager, mock_redis_client):
+        """Test bulk job creation queues every job into one pipeline execution."""
+        batch = [{"urls": ["https://example.com"] * n} for n in range(1, 6)]
+
+        job_ids = await job_manager.create_jobs(batch)
+
+        assert len(job_ids) == len(set(job_ids)) == 5
+        mock_redis_client.pipeline.assert_called_once()
+        pipeline = mock_redis_client.pipeline.return_value
+        assert pipeline.execute_count == 1
+        assert pipeline.hset.call_count == 5
+        assert pipeline.expire.call_count == 5
+        for job_id, request_data, call in zip(
+            job_ids, batch, pipeline.hset.call_args_list, strict=True
+        ):
+            assert call.args[0] == f"job:{job_id}"
+            job_info = JobManager._deserialize_job_info(hash_reply(call.kwargs["mapping"]))
+            assert job_info.total_urls == len(request_data["urls"])
 
     @pytest.mark.asyncio
     async def test_get_job_info_found(self, job_manager, mock_redis_client):
@@ -121,51 +195,119 @@ class TestJobManager:
             created_at=datetime.now(timezone.utc),
             request_data={},
         )
-        mock_redis_client.get.return_value = job_info.model_dump_json()
+        mock_redis_client.hgetall.return_value = job_fields(job_info)
 
         retrieved_info = await job_manager.get_job_info(job_id)
 
-        mock_redis_client.get.assert_called_once_with(f"job:{job_id}")
+        mock_redis_client.hgetall.assert_called_once_with(f"job:{job_id}")
         assert retrieved_info is not None
         assert retrieved_info.job_id == job_id
+        assert retrieved_info.status == JobStatus.RUNNING
+        assert retrieved_info.to_model() == job_info
+
+    @pytest.mark.asyncio
+    async def test_get_job_infos_single_round_trip(self, job_manager, mock_redis_client):
+        """Test many jobs are read with one pipelined execution."""
+        job_ids = [f"job_{i}" for i in range(50)]
+        replies = [
+            job_fields(
+                JobInfo(
+                    job_id=job_id,
+                    status=JobStatus.RUNNING,
+                    created_at=datetime.now(timezone.utc),
+                    request_data={},
+                )
+            )
+            for job_id in job_ids
+        ]
+        replies[7] = {}  # Expired job
+        pipeline = MockPipeline(results=replies)
+        mock_redis_client.pipeline.return_value = pipeline
+
+        job_infos = await job_manager.get_job_infos(job_ids)
+
+        assert pipeline.execute_count == 1
+        mock_redis_client.pipeline.assert_called_once_with(transaction=False)
+        assert pipeline.hgetall.call_count == 50
+        pipeline.hgetall.assert_any_call("job:job_0")
+        assert job_infos[7] is None
+        assert [info.job_id for info in job_infos if info] == job_ids[:7] + job_ids[8:]
+        assert job_infos[0].status == JobStatus.RUNNING
+        mock_redis_client.hgetall.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_job_info_decodes_fields_lazily(self, job_manager, mock_redis_client):
+        """Test request_data is only decoded when accessed."""
+        job_info = JobInfo(
+            job_id="test_job_id",
+            status=JobStatus.PENDING,
+            created_at=datetime.now(timezone.utc),
+            request_data={"urls": ["https://example.com"]},
+        )
+        fields = job_fields(job_info)
+        fields[b"request_data"] = b"not json"
+        mock_redis_client.hgetall.return_value = fields
+
+        retrieved_info = await job_manager.get_job_info("test_job_id")
+
+        assert retrieved_info.status == JobStatus.PENDING
+        assert retrieved_info.progress == 0
+        assert retrieved_info.started_at is None
+        with pytest.raises(orjson.JSONDecodeError):
+            _ = retrieved_info.request_data
+        with pytest.raises(AttributeError):
+            _ = retrieved_info.not_a_field
 
     @pytest.mark.asyncio
     async def test_get_job_info_not_found(self, job_manager, mock_redis_client):
         """Test retrieving non-existent job info."""
-        mock_redis_client.get.return_value = None
+        mock_redis_client.hgetall.return_value = {}
         retrieved_info = await job_manager.get_job_info("non_existent_id")
         assert retrieved_info is None
 
+    @pytest.mark.asyncio
+    async def test_get_job_info_incomplete_hash(self, job_manager, mock_redis_client):
+        """Test a hash lacking required fields reads as not found instead of half a job."""
+        mock_redis_client.hgetall.return_value = {b"status": b"running", b"progress": b"10"}
+
+        assert await job_manager.get_job_info("partial_id") is None
+
+    def test_job_info_view_missing_required_field_raises(self):
+        """Test a view never hands out a placeholder for a missing required field."""
+        view = JobInfoView({b"status": b"running"})
+
+        assert view.progress == 0
+        with pytest.raises(ValueError, match="created_at"):
+            _ = view.created_at
+
     @pytest.mark.asyncio
     async def test_update_job_status(self, job_manager, mock_redis_client):
-        """Test updating job status."""
+        """Test updating job status writes only changed fields in one round-trip."""
         job_id = "test_job_id"
-        job_info = JobInfo(
-            job_id=job_id,
-            status=JobStatus.PENDING,
-            created_at=datetime.now(timezone.utc),
-            request_data={},
-        )
-        mock_redis_client.get.return_value = job_info.model_dump_json()
 
         await job_manager.update_job_status(job_id, JobStatus.COMPLETED, progress=100)
 
-        # The update_job_status now uses pipeline transactions
-        # Verify pipeline was used
-        mock_redis_client.pipeline.assert_called_once_with(transaction=True)
-        # Get the pipeline mock to check its calls
+        mock_redis_client.get.assert_not_called()
+        mock_redis_client.hgetall.assert_not_called()
+        mock_redis_client.pipeline.assert_called_once_with(transaction=False)
         pipeline = mock_redis_client.pipeline.return_value
-        pipeline.setex.assert_called_once()
-        args, _ = pipeline.setex.call_args
-        updated_info = JobInfo.model_validate_json(args[2])
-        assert updated_info.status == JobStatus.COMPLETED
-        assert updated_info.progress == 100
-        assert updated_info.completed_at is not None
+        assert pipeline.execute_count == 1
+        ((keys, args),) = pipeline.script_calls
+        assert keys == [f"job:{job_id}"]
+        assert args[:2] == [job_manager.job_ttl, ""]  # No started_at outside RUNNING
+        fields = status_script_fields(args)
+        assert fields["status"] == JobStatus.COMPLETED.value
+        assert fields["progress"] == 100
+        assert fields["results_available"] == 1
+        assert "completed_at" in fields
+        mock_redis_client.delete.assert_not_called()
 
     @pytest.mark.asyncio
     @patch("asyncio.create_task")
     async def test_start_background_job(self, mock_create_task, job_manager):
         """Test starting a background job."""
+        # Close the wrapper coroutine instead of scheduling it so it is never left un-awaited
+        mock_create_task.side_effect = lambda coro: coro.close()
         job_id = "test_job_id"
         job_processor = AsyncMock(return_value=([], {}))
         job_info = JobInfo(
@@ -174,13 +316,40 @@ class TestJobManager:
             created_at=datetime.now(timezone.utc),
             request_data={},
         )
-        job_manager.redis_client.get.return_value = job_info.model_dump_json()
+        job_manager.redis_client.hgetall.return_value = job_fields(job_info)
 
         await job_manager.start_background_job(job_id, job_processor)
 
         mock_create_task.assert_called_once()
         assert job_id in job_manager._background_tasks
 
+    @pytest.mark.asyncio
+    async def test_background_jobs_are_bounded(self, mock_redis_client):
+        """Test no more than max_concurrent_jobs jobs are processed at once."""
+        limit = 2
+        manager = JobManager(redis_url="redis://localhost:6379", max_concurrent_jobs=limit)
+        manager.redis_client = mock_redis_client
+        manager.store_job_results = AsyncMock()
+        active = 0
+        max_active = 0
+
+        async def job_processor(job_id):
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return [], {}
+
+        tasks = [
+            await manager.start_background_job(f"job_{i}", job_processor) for i in range(2 * limit)
+        ]
+        await asyncio.gather(*tasks)
+
+        assert max_active == limit
+        assert manager.store_job_results.await_count == 2 * limit
+        assert manager._background_tasks == {}
+
     @pytest.mark.asyncio
     async def test_cancel_job(self, job_manager):
         """Test cancelling a running job."""
@@ -203,13 +372,53 @@ class TestJobManager:
             created_at=datetime.now(timezone.utc),
             request_data={},
         )
-        job_manager.redis_client.get.return_value = job_info.model_dump_json()
+        job_manager.redis_client.hgetall.return_value = job_fields(job_info)
 
         result = await job_manager.cancel_job(job_id)
 
         assert result is True
         assert task.cancelled()
 
+    @pytest.mark.asyncio
+    async def test_cancel_job_without_local_task(self, job_manager, mock_redis_client):
+        """Test cancelling a job not running here is a single atomic script call."""
+        cancel_script = mock_redis_client.register_script.return_value
+        cancel_script.return_value = 1
+
+        result = await job_manager.cancel_job("test_job_id")
+
+        assert result is True
+        cancel_script.assert_awaited_once()
+        kwargs = cancel_script.call_args.kwargs
+        assert kwargs["keys"] == ["job:test_job_id"]
+        assert kwargs["args"][1] == job_manager.job_ttl
+        mock_redis_client.hmget.assert_not_called()
+        mock_redis_client.pipeline.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cancel_job_already_completed(self, job_manager, mock_redis_client):
+        """Test completed jobs are not cancelled."""
+        mock_redis_client.register_script.return_value.return_value = 0
+
+        assert await job_manager.cancel_job("test_job_id") is False
+
+    @pytest.mark.asyncio
+    async def test_cancel_job_requires_connection(self):
+        """Test cancelling a job not running locally fails clearly without Redis."""
+        manager = JobManager(redis_url="redis://localhost:6379")
+
+        with pytest.raises(RuntimeError, match="not connected"):
+            await manager.cancel_job("test_job_id")
+
+    @pytest.mark.asyncio
+    async def test_cancel_script_is_registered_once(self, job_manager, mock_redis_client):
+        """Test the cancel script is registered once and reused via EVALSHA."""
+        await job_manager.cancel_job("job_1")
+        await job_manager.cancel_job("job_2")
+
+        mock_redis_client.register_script.assert_called_once()
+        assert mock_redis_client.register_script.return_value.await_count == 2
+
 
 # =============================================================================
 # Phase 1: Connection Lifecycle Tests
@@ -239,8 +448,8 @@ class TestJobManagerConnection:
                 # Verify pool created with correct params
                 mock_pool_factory.assert_called_once()
                 call_kwargs = mock_pool_factory.call_args[1]
-                assert call_kwargs["max_connections"] == 20
-                assert call_kwargs["decode_responses"] is True
+                assert call_kwargs["max_connections"] == manager.max_connections == 20
+                assert call_kwargs["decode_responses"] is False
 
                 # Verify Redis client created with pool
                 mock_redis_class.assert_called_once_with(connection_pool=mock_pool)
@@ -251,6 +460,8 @@ class TestJobManagerConnection:
                 assert manager.redis_client is not None
                 assert manager.connection_pool is not None
 
+                await manager._stop_flusher()
+
     @pytest.mark.asyncio
     async def test_connect_failure_raises_exception(self):
         """Test connection failure propagates exception."""
@@ -344,15 +555,19 @@ class TestJobManagerResults:
             created_at=started - timedelta(seconds=5),
             started_at=started,
             completed_at=completed,
-            request_data={},
+            request_data={"urls": ["https://example.com"]},
         )
-        mock_redis_client.get.return_value = job_info.model_dump_json()
+        mock_redis_client.hmget.side_effect = hmget_from(job_info)
 
         results = [{"url": "https://example.com", "status": "success"}]
         summary = {"total": 1, "successful": 1}
 
         await job_manager.store_job_results(job_id, results, summary)
 
+        # Only the needed fields are read, never the full request_data payload
+        mock_redis_client.hgetall.assert_not_called()
+        _, keys = mock_redis_client.hmget.call_args.args
+        assert "request_data" not in keys
         mock_redis_client.setex.assert_called_once()
         args, _ = mock_redis_client.setex.call_args
         assert args[0] == f"job_result:{job_id}"
@@ -367,7 +582,7 @@ class TestJobManagerResults:
     @pytest.mark.asyncio
     async def test_store_job_results_nonexistent_job(self, job_manager, mock_redis_client):
         """Test store_job_results returns early for non-existent job."""
-        mock_redis_client.get.return_value = None
+        mock_redis_client.hmget.return_value = [None, None, None, None]
 
         await job_manager.store_job_results("nonexistent", [], {})
 
@@ -386,7 +601,7 @@ class TestJobManagerResults:
             completed_at=None,  # No completed_at
             request_data={},
         )
-        mock_redis_client.get.return_value = job_info.model_dump_json()
+        mock_redis_client.hmget.side_effect = hmget_from(job_info)
 
         await job_manager.store_job_results(job_id, [], {})
 
@@ -408,7 +623,7 @@ class TestJobManagerResults:
             created_at=now,
             completed_at=now,
         )
-        mock_redis_client.get.return_value = job_result.model_dump_json()
+        mock_redis_client.get.return_value = job_result.model_dump_json().encode()
 
         result = await job_manager.get_job_results(job_id)
 
@@ -429,7 +644,7 @@ class TestJobManagerResults:
     @pytest.mark.asyncio
     async def test_get_job_results_invalid_json(self, job_manager, mock_redis_client):
         """Test get_job_results handles parse errors gracefully."""
-        mock_redis_client.get.return_value = "invalid json {"
+        mock_redis_client.get.return_value = b"invalid json {"
 
         result = await job_manager.get_job_results("test_job_id")
 
@@ -437,131 +652,207 @@ class TestJobManagerResults:
 
 
 # =============================================================================
-# Phase 3: Update Job Status Retry Logic Tests
+# Phase 3: Update Job Status Field-Level Write Tests
 # =============================================================================
 
 
-class TestJobManagerRetryLogic:
-    """Tests for update_job_status retry behavior."""
+class TestJobManagerStatusUpdates:
+    """Tests for update_job_status field-level writes."""
 
     @pytest.mark.asyncio
-    async def test_update_job_status_retry_on_watch_error(self, mock_redis_client):
-        """Test retry succeeds after WatchError."""
-        manager = JobManager(redis_url="redis://localhost:6379")
-        manager.redis_client = mock_redis_client
-
+    async def test_update_job_status_sets_started_at_on_running(
+        self, job_manager, mock_redis_client
+    ):
+        """Test RUNNING status sets started_at only if not already set."""
         job_id = "test_job_id"
-        job_info = JobInfo(
-            job_id=job_id,
-            status=JobStatus.PENDING,
-            created_at=datetime.now(timezone.utc),
-            request_data={},
+
+        await job_manager.update_job_status(job_id, JobStatus.RUNNING)
+
+        pipeline = mock_redis_client.pipeline.return_value
+        ((keys, args),) = pipeline.script_calls
+        assert keys == [f"job:{job_id}"]
+        assert datetime.fromisoformat(args[1]) is not None
+        assert status_script_fields(args) == {"status": JobStatus.RUNNING.value}
+
+    @pytest.mark.asyncio
+    async def test_update_job_status_writes_only_given_counters(
+        self, job_manager, mock_redis_client
+    ):
+        """Test counters left as None are not sent to Redis."""
+        await job_manager.update_job_status(
+            "test_job_id", JobStatus.FAILED, failed_urls=2, error_message="boom"
         )
-        mock_redis_client.get.return_value = job_info.model_dump_json()
 
-        # Track attempts across multiple pipeline creations
-        attempt_counter = {"count": 0}
+        pipeline = mock_redis_client.pipeline.return_value
+        ((_, args),) = pipeline.script_calls
+        fields = status_script_fields(args)
+        assert set(fields) == {
+            "status",
+            "completed_at",
+            "results_available",
+            "failed_urls",
+            "error_message",
+        }
+        assert fields["results_available"] == 0
 
-        class RetryPipeline:
-            def __init__(self):
-                self.watch = AsyncMock()
-                self.multi = MagicMock()
-                self.setex = AsyncMock()
+    @pytest.mark.asyncio
+    async def test_update_job_status_nonexistent_job(self, job_manager, mock_redis_client):
+        """Test updating a non-existent job is a no-op left to the script."""
+        mock_redis_client.pipeline.return_value = MockPipeline(results=[0])
 
-            async def __aenter__(self):
-                return self
+        # Should not raise; the script creates nothing, so there is nothing to clean up
+        await job_manager.update_job_status("nonexistent", JobStatus.RUNNING)
 
-            async def __aexit__(self, exc_type, exc_val, exc_tb):
-                pass
+        mock_redis_client.delete.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_update_job_status_propagates_redis_errors(self, job_manager, mock_redis_client):
+        """Test Redis errors during the pipelined write are re-raised."""
+
+        class FailingPipeline(MockPipeline):
             async def execute(self):
-                attempt_counter["count"] += 1
-                if attempt_counter["count"] <= 1:  # Fail first attempt
-                    raise redis.WatchError("Concurrent modification")
-                return [True, True]
+                raise redis.ConnectionError("Connection lost")
 
-        mock_redis_client.pipeline = MagicMock(side_effect=lambda **kwargs: RetryPipeline())
+        mock_redis_client.pipeline.return_value = FailingPipeline()
 
-        await manager.update_job_status(job_id, JobStatus.RUNNING)
+        with pytest.raises(redis.ConnectionError):
+            await job_manager.update_job_status("test_job_id", JobStatus.RUNNING)
 
-        # Should have attempted twice
-        assert attempt_counter["count"] == 2
+
+class TestJobManagerStatusFlusher:
+    """Tests for the background status update flusher."""
 
     @pytest.mark.asyncio
-    async def test_update_job_status_exhausts_retries(self, mock_redis_client):
-        """Test raises after max retries exceeded."""
-        manager = JobManager(redis_url="redis://localhost:6379")
-        manager.redis_client = mock_redis_client
+    async def test_non_durable_update_does_not_wait_for_redis(self, job_manager, mock_redis_client):
+        """Test progress updates are queued instead of written synchronously."""
+        job_manager._start_flusher()
+        try:
+            await job_manager.update_job_status(
+                "test_job_id", JobStatus.RUNNING, progress=50, durable=False
+            )
 
-        job_id = "test_job_id"
-        job_info = JobInfo(
-            job_id=job_id,
-            status=JobStatus.PENDING,
-            created_at=datetime.now(timezone.utc),
-            request_data={},
-        )
-        mock_redis_client.get.return_value = job_info.model_dump_json()
+            mock_redis_client.pipeline.assert_not_called()
+        finally:
+            await job_manager._stop_flusher()
 
-        # Track attempts
-        attempt_counter = {"count": 0}
+        pipeline = mock_redis_client.pipeline.return_value
+        assert pipeline.execute_count == 1
+        ((_, args),) = pipeline.script_calls
+        assert status_script_fields(args)["progress"] == 50
 
-        class AlwaysFailPipeline:
-            def __init__(self):
-                self.watch = AsyncMock()
-                self.multi = MagicMock()
-                self.setex = AsyncMock()
+    @pytest.mark.asyncio
+    async def test_terminal_update_coalesces_with_pending_progress(
+        self, job_manager, mock_redis_client
+    ):
+        """Test a durable update is merged with, and overrides, earlier pending updates."""
+        job_manager._start_flusher()
+        try:
+            await job_manager.update_job_status(
+                "test_job_id", JobStatus.RUNNING, progress=100, durable=False
+            )
+            await job_manager.update_job_status("test_job_id", JobStatus.COMPLETED, durable=False)
+
+            pipeline = mock_redis_client.pipeline.return_value
+            assert pipeline.execute_count == 1
+            ((_, args),) = pipeline.script_calls
+            fields = status_script_fields(args)
+            assert fields["status"] == JobStatus.COMPLETED.value
+            assert fields["progress"] == 100
+            assert fields["results_available"] == 1
+            # The RUNNING transition still records started_at
+            assert args[1]
+        finally:
+            await job_manager._stop_flusher()
 
-            async def __aenter__(self):
-                return self
+    @pytest.mark.asyncio
+    async def test_progress_updates_are_coalesced(self, job_manager, mock_redis_client):
+        """Test a burst of progress updates results in a single pipelined write."""
+        job_manager._start_flusher()
+        try:
+            for progress in range(100):
+                await job_manager.update_job_status(
+                    "test_job_id", JobStatus.RUNNING, progress=progress, durable=False
+                )
+        finally:
+            await job_manager._stop_flusher()
 
-            async def __aexit__(self, exc_type, exc_val, exc_tb):
-                pass
+        pipeline = mock_redis_client.pipeline.return_value
+        assert pipeline.execute_count <= 1
+        ((_, args),) = pipeline.script_calls
+        assert status_script_fields(args)["progress"] == 99
 
+    @pytest.mark.asyncio
+    async def test_durable_update_propagates_write_errors(self, job_manager, mock_redis_client):
+        """Test errors from a batched write reach the durable caller."""
+
+        class FailingPipeline(MockPipeline):
             async def execute(self):
-                attempt_counter["count"] += 1
-                raise redis.WatchError("Concurrent modification")
+                raise redis.ConnectionError("Connection lost")
+
+        mock_redis_client.pipeline.return_value = FailingPipeline()
+        job_manager._start_flusher()
+        try:
+            with pytest.raises(redis.ConnectionError):
+                await job_manager.update_job_status("test_job_id", JobStatus.FAILED)
+        finally:
+            await job_manager._stop_flusher()
 
-        mock_redis_client.pipeline = MagicMock(side_effect=lambda **kwargs: AlwaysFailPipeline())
 
-        with pytest.raises(redis.WatchError):
-            await manager.update_job_status(job_id, JobStatus.RUNNING, max_retries=3)
+class TestJobManagerLegacyMigration:
+    """Tests for jobs stored as JSON strings by earlier releases."""
 
-        assert attempt_counter["count"] == 3
+    WRONGTYPE = redis.ResponseError(
+        "WRONGTYPE Operation against a key holding the wrong kind of value"
+    )
 
     @pytest.mark.asyncio
-    async def test_update_job_status_sets_started_at_on_running(
-        self, job_manager, mock_redis_client
-    ):
-        """Test RUNNING status sets started_at timestamp."""
-        job_id = "test_job_id"
+    async def test_legacy_job_is_migrated_and_read(self, job_manager, mock_redis_client):
+        """Test a JSON string job is rewritten as a hash and the read is retried."""
         job_info = JobInfo(
-            job_id=job_id,
-            status=JobStatus.PENDING,
+            job_id="legacy",
+            status=JobStatus.RUNNING,
             created_at=datetime.now(timezone.utc),
-            started_at=None,  # Not yet started
-            request_data={},
+            request_data={"urls": ["https://example.com"]},
         )
-        mock_redis_client.get.return_value = job_info.model_dump_json()
+        legacy_json = job_info.model_dump_json().encode()
+        mock_redis_client.hgetall.side_effect = [self.WRONGTYPE, job_fields(job_info)]
+        mock_redis_client.pipeline.return_value = MockPipeline(results=[b"string"])
+        mock_redis_client.get.return_value = legacy_json
+
+        retrieved_info = await job_manager.get_job_info("legacy")
+
+        assert retrieved_info.status == JobStatus.RUNNING
+        migrate_script = mock_redis_client.register_script.return_value
+        migrate_script.assert_awaited_once()
+        _, kwargs = migrate_script.call_args
+        assert kwargs["keys"] == ["job:legacy"]
+        legacy_data, *pairs = kwargs["args"]
+        assert legacy_data == legacy_json
+        fields = dict(zip(pairs[::2], pairs[1::2], strict=True))
+        assert hash_reply(fields) == job_fields(job_info)
+        mock_redis_client.delete.assert_not_called()
 
-        await job_manager.update_job_status(job_id, JobStatus.RUNNING)
+    @pytest.mark.asyncio
+    async def test_unreadable_legacy_job_is_deleted(self, job_manager, mock_redis_client):
+        """Test a JSON string job that no longer parses is deleted and reads as missing."""
+        mock_redis_client.hgetall.side_effect = [self.WRONGTYPE, {}]
+        mock_redis_client.pipeline.return_value = MockPipeline(results=[b"string"])
+        mock_redis_client.get.return_value = b"{not json"
 
-        pipeline = mock_redis_client.pipeline.return_value
-        args, _ = pipeline.setex.call_args
-        updated_info = JobInfo.model_validate_json(args[2])
-        assert updated_info.started_at is not None
-        assert updated_info.status == JobStatus.RUNNING
+        assert await job_manager.get_job_info("broken") is None
+
+        mock_redis_client.delete.assert_awaited_once_with("job:broken")
+        mock_redis_client.register_script.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_update_job_status_nonexistent_job(self, job_manager, mock_redis_client):
-        """Test update returns early for non-existent job."""
-        mock_redis_client.get.return_value = None
+    async def test_other_response_errors_propagate(self, job_manager, mock_redis_client):
+        """Test only WRONGTYPE errors trigger a migration."""
+        mock_redis_client.hgetall.side_effect = redis.ResponseError("OOM command not allowed")
 
-        # Should not raise, just return early
-        await job_manager.update_job_status("nonexistent", JobStatus.RUNNING)
+        with pytest.raises(redis.ResponseError, match="OOM"):
+            await job_manager.get_job_info("test_job_id")
 
-        # Pipeline should still be called but setex should not be
-        pipeline = mock_redis_client.pipeline.return_value
-        pipeline.setex.assert_not_called()
+        mock_redis_client.pipeline.assert_not_called()
 
 
 # =============================================================================
@@ -582,7 +873,7 @@ class TestJobManagerBackgroundLifecycle:
             created_at=datetime.now(timezone.utc),
             request_data={},
         )
-        mock_redis_client.get.return_value = job_info.model_dump_json()
+        mock_redis_client.hgetall.return_value = job_fields(job_info)
 
         # Track status updates
         status_updates = []
@@ -614,7 +905,7 @@ class TestJobManagerBackgroundLifecycle:
             created_at=datetime.now(timezone.utc),
             request_data={},
         )
-        mock_redis_client.get.return_value = job_info.model_dump_json()
+        mock_redis_client.hgetall.return_value = job_fields(job_info)
 
         status_updates = []
         error_messages = []
@@ -645,7 +936,7 @@ class TestJobManagerBackgroundLifecycle:
             created_at=datetime.now(timezone.utc),
             request_data={},
         )
-        mock_redis_client.get.return_value = job_info.model_dump_json()
+        mock_redis_client.hgetall.return_value = job_fields(job_info)
 
         status_updates = []
 
@@ -677,7 +968,7 @@ class TestJobManagerBackgroundLifecycle:
             created_at=datetime.now(timezone.utc),
             request_data={},
         )
-        mock_redis_client.get.return_value = job_info.model_dump_json()
+        mock_redis_client.hgetall.return_value = job_fields(job_info)
 
         job_manager.update_job_status = AsyncMock()
         job_manager.store_job_results = AsyncMock()
@@ -863,6 +1154,32 @@ class TestJobManagerSingleton:
                 jm._job_manager.redis_client = None  # Prevent actual disconnect
             jm._job_manager = original
 
+    @pytest.mark.asyncio
+    async def test_get_job_manager_shares_connection_pool(self):
+        """Test repeated get_job_manager calls reuse one connection pool."""
+        import src.downloader.job_manager as jm
+
+        original = jm._job_manager
+        jm._job_manager = None
+
+        try:
+            with patch("redis.asyncio.ConnectionPool.from_url") as mock_pool_factory:
+                with patch("redis.asyncio.Redis") as mock_redis_class:
+                    mock_redis_class.return_value.ping = AsyncMock()
+
+                    first = await get_job_manager()
+                    second = await get_job_manager()
+
+                    assert first is second
+                    mock_pool_factory.assert_called_once()
+                    mock_redis_class.assert_called_once_with(
+                        connection_pool=mock_pool_factory.return_value
+                    )
+
+                    await first._stop_flusher()
+        finally:
+            jm._job_manager = original
+
     @pytest.mark.asyncio
     async def test_get_job_manager_returns_existing(self):
         """Test get_job_manager returns existing instance."""
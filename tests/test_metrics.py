@@ -1,7 +1,12 @@
 """Tests for metrics collection system."""
 
+import random
 import time
+from unittest.mock import patch
 
+import pytest
+
+from src.downloader import metrics
 from src.downloader.metrics import (
     MetricsCollector,
     MetricSnapshot,
@@ -79,7 +84,7 @@ class TestPerformanceMetrics:
     def test_p95_response_time_single(self):
         """Test p95_response_time with single value returns that value."""
         perf = PerformanceMetrics()
-        perf.response_times.append(0.5)
+        perf.record_response_time(0.5)
         assert perf.p95_response_time == 0.5
 
     def test_p95_response_time_calculation(self):
@@ -87,26 +92,87 @@ class TestPerformanceMetrics:
         perf = PerformanceMetrics()
         # Add 100 response times: 0.01, 0.02, ..., 1.00
         for i in range(1, 101):
-            perf.response_times.append(i * 0.01)
-        # P95 should be around 0.95-0.96
-        assert 0.95 <= perf.p95_response_time <= 0.96
+            perf.record_response_time(i * 0.01)
+        # P95 is 0.96; the sketch estimate is within 1% of it
+        assert perf.p95_response_time == pytest.approx(0.96, rel=0.01)
 
     def test_p95_response_time_boundary(self):
         """Test p95_response_time handles index boundary correctly."""
         perf = PerformanceMetrics()
         # Exact 20 values - p95 index = int(20 * 0.95) = 19
         for i in range(1, 21):
-            perf.response_times.append(float(i))
+            perf.record_response_time(float(i))
         # Index 19 should be value 20 (0-indexed: 19th position is the 20th value)
         assert perf.p95_response_time == 20.0
 
+    def test_p95_response_time_skewed(self):
+        """Test p95_response_time picks the tail rather than the bulk of samples."""
+        perf = PerformanceMetrics()
+        for _ in range(90):
+            perf.record_response_time(0.01)
+        for _ in range(10):
+            perf.record_response_time(2.0)
+        assert perf.p95_response_time == pytest.approx(2.0, rel=0.01)
+        assert perf.min_response_time == 0.01
+
+    def test_p95_response_time_relative_accuracy(self):
+        """Test p95_response_time stays within 1% across a wide latency range."""
+        perf = PerformanceMetrics()
+        values = [0.0001 * 1.01**i for i in range(2000)]
+        for value in values:
+            perf.record_response_time(value)
+        expected = values[int(len(values) * 0.95)]
+        assert perf.p95_response_time == pytest.approx(expected, rel=0.01)
+
+    def test_p95_response_time_zero_samples(self):
+        """Test non-positive samples are ranked below every positive sample."""
+        perf = PerformanceMetrics()
+        for _ in range(99):
+            perf.record_response_time(0.0)
+        perf.record_response_time(1.0)
+        assert perf.p95_response_time == 0.0
+
+    def test_uses_slots(self):
+        """Test metrics containers have no per-instance __dict__."""
+        assert not hasattr(PerformanceMetrics(), "__dict__")
+        assert not hasattr(MetricSnapshot(0.0, 0.0), "__dict__")
+
     def test_default_deque_maxlen(self):
-        """Test response_times deque has correct maxlen."""
+        """Test response_times keeps at most 1000 samples."""
         perf = PerformanceMetrics()
-        # Default maxlen should be 1000
         for i in range(1500):
-            perf.response_times.append(float(i))
+            perf.record_response_time(float(i))
         assert len(perf.response_times) == 1000
+        assert len(set(perf.response_times)) == 1000
+
+    def test_response_times_storage_is_compact(self):
+        """Test response_times are stored as C doubles but exposed as a list."""
+        perf = PerformanceMetrics()
+        perf.record_response_time(0.25)
+        assert perf._recent.typecode == "d"
+        assert perf.response_times == [0.25]
+
+    def test_response_times_storage_grows_to_reservoir_size(self):
+        """Test the reservoir is filled on demand and stops growing at 1000 samples."""
+        perf = PerformanceMetrics()
+        assert len(perf._recent) == 0
+
+        for i in range(1500):
+            perf.record_response_time(float(i))
+        assert len(perf._recent) == 1000
+
+    def test_response_times_reservoir_is_uniform(self):
+        """Test response_times samples all history rather than only the newest values."""
+        perf = PerformanceMetrics()
+        with patch.object(metrics, "_reservoir_random", random.Random(1234)):
+            for i in range(10000):
+                perf.record_response_time(float(i))
+
+        sample = perf.response_times
+        assert len(sample) == 1000
+        # Roughly 10% of a uniform sample falls in the oldest 1000 values
+        old = sum(1 for value in sample if value < 1000)
+        assert 50 < old < 150
 
 
 class TestMetricsCollector:
@@ -198,6 +264,28 @@ class TestMetricsCollector:
         assert collector._histograms[key][10.0] == 0
         assert collector._histograms[key][float("inf")] == 1
 
+    def test_observe_histogram_bucket_edges(self):
+        """Test values equal to a bucket bound are counted in that bucket."""
+        collector = MetricsCollector()
+        collector.observe_histogram("latency", 0.5)
+        collector.observe_histogram("latency", 0.50001)
+
+        histogram = collector._histograms["latency"]
+        assert histogram[0.25] == 0
+        assert histogram[0.5] == 1
+        assert histogram[1.0] == 2
+        assert histogram[float("inf")] == 2
+
+    def test_histogram_stores_one_count_per_observation(self):
+        """Test each observation increments a single bucket; cumulative counts are derived."""
+        collector = MetricsCollector()
+        collector.observe_histogram("latency", 0.05)
+        collector.observe_histogram("latency", 3.0)
+
+        histogram = collector._histograms["latency"]
+        assert sum(histogram.counts) == 2
+        assert histogram.cumulative() == [1, 1, 1, 1, 1, 2, 2, 2]
+
     def test_record_request_counter_updates(self):
         """Test request counters are updated."""
         collector = MetricsCollector()
@@ -222,6 +310,19 @@ class TestMetricsCollector:
         assert snapshot.labels["endpoint"] == "/test"
         assert snapshot.labels["status"] == "200"
 
+    def test_history_wraps_at_history_size(self):
+        """Test history keeps only the newest history_size samples, oldest first."""
+        collector = MetricsCollector(history_size=3)
+        for value in range(5):
+            collector.set_gauge("test_gauge", float(value))
+
+        history = collector._metrics_history["test_gauge"]
+        assert len(history) == 3
+        assert [snapshot.value for snapshot in history] == [2.0, 3.0, 4.0]
+        assert history[0].value == 2.0
+        assert history[-1].value == 4.0
+        assert history[0].labels == {}
+
     def test_set_gauge_basic(self):
         """Test setting a gauge value."""
         collector = MetricsCollector()
@@ -244,6 +345,36 @@ class TestMetricsCollector:
         snapshot = collector._metrics_history["test_gauge"][0]
         assert snapshot.value == 42.5
 
+    def test_set_gauges_batch(self):
+        """Test setting several gauges records each with one shared timestamp."""
+        collector = MetricsCollector()
+        collector.set_gauges({"a": 1.0, "b": 2.0})
+
+        assert collector._gauges["a"] == 1.0
+        assert collector._gauges["b"] == 2.0
+        assert (
+            collector._metrics_history["a"][0].timestamp
+            == collector._metrics_history["b"][0].timestamp
+        )
+
+    def test_delete_gauge(self):
+        """Test deleting a gauge removes its value and history."""
+        collector = MetricsCollector()
+        collector.set_gauge("test_gauge", 1.0)
+        collector.delete_gauge("test_gauge")
+        collector.delete_gauge("missing_gauge")
+
+        assert "test_gauge" not in collector._gauges
+        assert "test_gauge" not in collector._metrics_history
+        assert "test_gauge" not in collector.get_prometheus_metrics()
+
+    def test_set_gauges_empty_is_noop(self):
+        """Test an empty batch leaves the cached reports valid."""
+        collector = MetricsCollector()
+        collector.get_performance_summary()
+        collector.set_gauges({})
+        assert collector._dirty is False
+
     def test_increment_counter_default(self):
         """Test increment counter by default value (1)."""
         collector = MetricsCollector()
@@ -350,6 +481,70 @@ class TestMetricsCollectorSummary:
         assert abs(summary["overall_avg_response_time"] - 0.2) < 0.001
 
 
+class TestMetricsCollectorEndpointCap:
+    """Tests for bounding the number of tracked endpoints."""
+
+    def test_least_recently_used_endpoint_is_evicted(self):
+        """Test the oldest endpoint's metrics are dropped once max_endpoints is exceeded."""
+        collector = MetricsCollector(max_endpoints=2)
+        collector.record_request("/a", "GET", 500, 0.1)
+        collector.record_request("/b", "GET", 200, 0.1)
+        # Touch /a so /b becomes the least recently used
+        collector.record_request("/a", "GET", 200, 0.1)
+        collector.record_request("/c", "GET", 200, 0.1)
+
+        assert set(collector._performance_metrics) == {"GET_/a", "GET_/c"}
+        assert "response_time_GET_/b" not in collector._histograms
+        assert "response_time_GET_/b" not in collector._metrics_history
+        assert "requests_total_GET_/b" not in collector._counters
+        assert collector._counters["errors_total_GET_/a"] == 1
+        # Overall totals still include the evicted endpoint
+        assert collector.get_performance_summary()["total_requests"] == 4
+
+    def test_endpoint_metrics_restart_after_eviction(self):
+        """Test an evicted endpoint is tracked afresh when seen again."""
+        collector = MetricsCollector(max_endpoints=1)
+        collector.record_request("/a", "GET", 200, 0.1)
+        collector.record_request("/b", "GET", 200, 0.1)
+        collector.record_request("/a", "GET", 200, 0.1)
+
+        assert list(collector._performance_metrics) == ["GET_/a"]
+        assert collector._performance_metrics["GET_/a"].request_count == 1
+
+
+class TestMetricsCollectorReportCache:
+    """Tests for caching of summary, Prometheus and health score reports."""
+
+    def test_reports_reused_until_metrics_change(self):
+        """Test repeated reads return the cached report."""
+        collector = MetricsCollector()
+        collector.record_request("/test", "GET", 200, 0.1)
+
+        assert collector.get_performance_summary() is collector.get_performance_summary()
+        assert collector.get_system_health_score() is collector.get_system_health_score()
+
+    def test_write_invalidates_reports(self):
+        """Test any write rebuilds the cached reports."""
+        collector = MetricsCollector()
+        collector.record_request("/test", "GET", 200, 0.1)
+        summary = collector.get_performance_summary()
+        prometheus = collector.get_prometheus_metrics()
+
+        collector.record_request("/test", "GET", 200, 0.1)
+        assert collector.get_performance_summary()["total_requests"] == 2
+
+        collector.set_gauge("queue_depth", 3.0)
+        assert collector.get_prometheus_metrics() != prometheus
+        assert summary["total_requests"] == 1
+
+    def test_reports_expire_after_ttl(self):
+        """Test cached reports are rebuilt once the TTL has passed."""
+        collector = MetricsCollector()
+        collector._report_cache_ttl = 0.0
+
+        assert collector.get_performance_summary() is not collector.get_performance_summary()
+
+
 class TestMetricsCollectorPrometheus:
     """Tests for Prometheus metrics generation."""
 
@@ -401,6 +596,17 @@ class TestMetricsCollectorPrometheus:
 
         assert 'le="+Inf"' in output
 
+    def test_get_prometheus_metrics_integer_counters(self):
+        """Test whole-number counters are rendered without a fraction."""
+        collector = MetricsCollector()
+        collector.record_request("/test", "GET", 200, 0.1)
+        collector.record_request("/test", "GET", 200, 0.1)
+
+        output = collector.get_prometheus_metrics()
+
+        assert 'downloader_requests_total{endpoint="GET_/test"} 2\n' in output
+        assert output.endswith("\n")
+
 
 class TestMetricsCollectorRecentMetrics:
     """Tests for recent metrics retrieval."""
@@ -441,6 +647,23 @@ class TestMetricsCollectorRecentMetrics:
         assert len(result) == 1
         assert result[0].value == 2.0
 
+    def test_get_recent_metrics_after_wraparound(self):
+        """Test the time window is found correctly once the history has wrapped."""
+        collector = MetricsCollector(history_size=4)
+        now = time.time()
+        history = collector._metrics_history["test"]
+        for age in (600, 500, 400, 200, 100, 50):
+            history.add(now - age, float(age))
+
+        recent = collector.get_recent_metrics("test", seconds=300)
+        assert [snapshot.value for snapshot in recent] == [200.0, 100.0, 50.0]
+
+        recent = collector.get_recent_metrics("test", seconds=75)
+        assert [snapshot.value for snapshot in recent] == [50.0]
+
+        recent = collector.get_recent_metrics("test", seconds=1000)
+        assert [snapshot.value for snapshot in recent] == [400.0, 200.0, 100.0, 50.0]
+
 
 class TestHealthScore:
     """Tests for system health score calculation."""
@@ -550,6 +773,24 @@ class TestHealthScore:
         assert health["overall_score"] >= 0
         assert health["overall_score"] <= 100
 
+    def test_health_score_skips_endpoint_breakdown(self):
+        """Test the health score is computed from totals without building the summary."""
+        collector = MetricsCollector()
+        for _ in range(10):
+            collector.record_request("/test", "GET", 500, 2.0)
+        collector._build_performance_summary = None  # Would raise if called
+
+        health = collector.get_system_health_score()
+
+        assert health["factors"]["error_rate"]["value"] == 100.0
+        assert health["factors"]["response_time"]["value"] == 2.0
+
+    def test_health_score_no_requests(self):
+        """Test an idle collector is healthy with no penalty factors."""
+        collector = MetricsCollector()
+        health = collector.get_system_health_score()
+        assert health == {"overall_score": 100, "factors": {}, "status": "healthy"}
+
     def test_health_score_uptime_factor(self):
         """Test uptime is included in health factors after 24h."""
         collector = MetricsCollector()
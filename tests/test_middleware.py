@@ -1,64 +1,55 @@
 """Tests for middleware components."""
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from src.downloader.metrics import MetricsCollector
 from src.downloader.middleware import (
     MetricsMiddleware,
     SystemMetricsCollector,
     get_system_metrics_collector,
+    subtiming,
 )
 
 
+@pytest.fixture(scope="class")
+def middleware():
+    """One middleware per test class; _normalize_path is pure."""
+    return MetricsMiddleware(app=MagicMock())
+
+
 class TestMetricsMiddlewareNormalizePath:
     """Tests for MetricsMiddleware._normalize_path."""
 
-    def test_normalize_path_batch(self):
-        """Test /batch/* normalizes to /batch."""
-        middleware = MetricsMiddleware(app=MagicMock())
-        assert middleware._normalize_path("/batch") == "/batch"
-        assert middleware._normalize_path("/batch/123") == "/batch"
-        assert middleware._normalize_path("/batch/status") == "/batch"
-
-    def test_normalize_path_health(self):
-        """Test /health normalizes to /health."""
-        middleware = MetricsMiddleware(app=MagicMock())
-        assert middleware._normalize_path("/health") == "/health"
-
-    def test_normalize_path_metrics(self):
-        """Test /metrics normalizes to /metrics."""
-        middleware = MetricsMiddleware(app=MagicMock())
-        assert middleware._normalize_path("/metrics") == "/metrics"
-
-    def test_normalize_path_jobs(self):
-        """Test /jobs/* normalizes to /jobs/{job_id}."""
-        middleware = MetricsMiddleware(app=MagicMock())
-        assert middleware._normalize_path("/jobs/123") == "/jobs/{job_id}"
-        assert middleware._normalize_path("/jobs/abc-def-456") == "/jobs/{job_id}"
-
-    def test_normalize_path_status(self):
-        """Test /status/* normalizes to /status/{job_id}."""
-        middleware = MetricsMiddleware(app=MagicMock())
-        assert middleware._normalize_path("/status/123") == "/status/{job_id}"
-        assert middleware._normalize_path("/status/uuid-here") == "/status/{job_id}"
-
-    def test_normalize_path_results(self):
-        """Test /results/* normalizes to /results/{job_id}."""
-        middleware = MetricsMiddleware(app=MagicMock())
-        assert middleware._normalize_path("/results/123") == "/results/{job_id}"
-
-    def test_normalize_path_root(self):
-        """Test / normalizes to /."""
-        middleware = MetricsMiddleware(app=MagicMock())
-        assert middleware._normalize_path("/") == "/"
-
-    def test_normalize_path_unknown(self):
-        """Test unknown paths normalize to /download."""
-        middleware = MetricsMiddleware(app=MagicMock())
-        assert middleware._normalize_path("/foo") == "/download"
-        assert middleware._normalize_path("/custom/path") == "/download"
-        assert middleware._normalize_path("/https://example.com") == "/download"
+    @pytest.mark.parametrize(
+        ("path", "expected"),
+        [
+            ("/batch", "/batch"),
+            ("/batch/123", "/batch"),
+            ("/batch/status", "/batch"),
+            ("/health", "/health"),
+            ("/metrics", "/metrics"),
+            ("/jobs/123", "/jobs/{job_id}"),
+            ("/jobs/abc-def-456", "/jobs/{job_id}"),
+            ("/status/123", "/status/{job_id}"),
+            ("/status/uuid-here", "/status/{job_id}"),
+            ("/results/123", "/results/{job_id}"),
+            ("/", "/"),
+            # Unknown paths are URL downloads
+            ("/foo", "/download"),
+            ("/custom/path", "/download"),
+            ("/https://example.com", "/download"),
+            # Routes match on the whole first segment, not a string prefix
+            ("/batchfoo", "/download"),
+            ("/health/extra", "/download"),
+            ("/jobs", "/download"),
+        ],
+    )
+    def test_normalize_path(self, middleware, path, expected):
+        """Test each path maps to its metrics endpoint label."""
+        assert middleware._normalize_path(path) == expected
 
 
 class TestMetricsMiddlewareDispatch:
@@ -67,8 +58,6 @@ class TestMetricsMiddlewareDispatch:
     @pytest.mark.asyncio
     async def test_dispatch_successful_request(self):
         """Test dispatch records metrics for successful request."""
-        middleware = MetricsMiddleware(app=MagicMock())
-
         mock_request = MagicMock()
         mock_request.method = "GET"
         mock_request.url.path = "/health"
@@ -83,6 +72,7 @@ class TestMetricsMiddlewareDispatch:
         with patch("src.downloader.middleware.get_metrics_collector") as mock_get_collector:
             mock_collector = MagicMock()
             mock_get_collector.return_value = mock_collector
+            middleware = MetricsMiddleware(app=MagicMock())
 
             await middleware.dispatch(mock_request, mock_call_next)
 
@@ -96,8 +86,6 @@ class TestMetricsMiddlewareDispatch:
     @pytest.mark.asyncio
     async def test_dispatch_error_response(self):
         """Test dispatch records metrics for error response."""
-        middleware = MetricsMiddleware(app=MagicMock())
-
         mock_request = MagicMock()
         mock_request.method = "POST"
         mock_request.url.path = "/batch"
@@ -112,6 +100,7 @@ class TestMetricsMiddlewareDispatch:
         with patch("src.downloader.middleware.get_metrics_collector") as mock_get_collector:
             mock_collector = MagicMock()
             mock_get_collector.return_value = mock_collector
+            middleware = MetricsMiddleware(app=MagicMock())
 
             await middleware.dispatch(mock_request, mock_call_next)
 
@@ -121,8 +110,6 @@ class TestMetricsMiddlewareDispatch:
     @pytest.mark.asyncio
     async def test_dispatch_exception_path(self):
         """Test dispatch records metrics when exception occurs."""
-        middleware = MetricsMiddleware(app=MagicMock())
-
         mock_request = MagicMock()
         mock_request.method = "GET"
         mock_request.url.path = "/test"
@@ -133,6 +120,7 @@ class TestMetricsMiddlewareDispatch:
         with patch("src.downloader.middleware.get_metrics_collector") as mock_get_collector:
             mock_collector = MagicMock()
             mock_get_collector.return_value = mock_collector
+            middleware = MetricsMiddleware(app=MagicMock())
 
             with pytest.raises(ValueError):
                 await middleware.dispatch(mock_request, mock_call_next)
@@ -144,8 +132,6 @@ class TestMetricsMiddlewareDispatch:
     @pytest.mark.asyncio
     async def test_dispatch_adds_response_time_header(self):
         """Test dispatch adds X-Response-Time header."""
-        middleware = MetricsMiddleware(app=MagicMock())
-
         mock_request = MagicMock()
         mock_request.method = "GET"
         mock_request.url.path = "/health"
@@ -158,16 +144,43 @@ class TestMetricsMiddlewareDispatch:
             return mock_response
 
         with patch("src.downloader.middleware.get_metrics_collector"):
+            middleware = MetricsMiddleware(app=MagicMock())
             response = await middleware.dispatch(mock_request, mock_call_next)
 
             assert "X-Response-Time" in response.headers
             assert response.headers["X-Response-Time"].endswith("s")
 
+    @pytest.mark.asyncio
+    async def test_dispatch_measures_with_monotonic_clock(self):
+        """Test response time comes from perf_counter_ns, not the wall clock."""
+        mock_request = MagicMock()
+        mock_request.method = "GET"
+        mock_request.url.path = "/health"
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {}
+
+        async def mock_call_next(request):
+            return mock_response
+
+        with (
+            patch("src.downloader.middleware.get_metrics_collector") as mock_get_collector,
+            patch(
+                "src.downloader.middleware.perf_counter_ns",
+                side_effect=[1_000_000_000, 1_250_000_000],
+            ),
+        ):
+            middleware = MetricsMiddleware(app=MagicMock())
+            response = await middleware.dispatch(mock_request, mock_call_next)
+
+        call_kwargs = mock_get_collector.return_value.record_request.call_args[1]
+        assert call_kwargs["response_time"] == 0.25
+        assert response.headers["X-Response-Time"] == "0.250s"
+
     @pytest.mark.asyncio
     async def test_dispatch_exception_reraised(self):
         """Test dispatch re-raises exceptions after recording metrics."""
-        middleware = MetricsMiddleware(app=MagicMock())
-
         mock_request = MagicMock()
         mock_request.method = "GET"
         mock_request.url.path = "/test"
@@ -176,9 +189,138 @@ class TestMetricsMiddlewareDispatch:
             raise RuntimeError("Something went wrong")
 
         with patch("src.downloader.middleware.get_metrics_collector"):
+            middleware = MetricsMiddleware(app=MagicMock())
             with pytest.raises(RuntimeError, match="Something went wrong"):
                 await middleware.dispatch(mock_request, mock_call_next)
 
+    @pytest.mark.asyncio
+    async def test_dispatch_reuses_bound_collector(self):
+        """Test dispatch uses the collector bound at construction, not a per-request lookup."""
+        mock_collector = MagicMock()
+        with patch("src.downloader.middleware.get_metrics_collector", return_value=mock_collector):
+            middleware = MetricsMiddleware(app=MagicMock())
+
+        mock_request = MagicMock()
+        mock_request.method = "GET"
+        mock_request.url.path = "/health"
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {}
+
+        async def mock_call_next(request):
+            return mock_response
+
+        with patch("src.downloader.middleware.get_metrics_collector") as mock_get_collector:
+            await middleware.dispatch(mock_request, mock_call_next)
+            await middleware.dispatch(mock_request, mock_call_next)
+
+        mock_get_collector.assert_not_called()
+        assert mock_collector.record_request.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_dispatch_reports_subtimings_from_child_tasks(self):
+        """Test sub-timings recorded downstream, even in child tasks, reach Server-Timing."""
+        mock_request = MagicMock()
+        mock_request.method = "GET"
+        mock_request.url.path = "/health"
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {}
+
+        async def render():
+            with subtiming("render"):
+                pass
+
+        async def mock_call_next(request):
+            with subtiming("fetch"):
+                pass
+            await asyncio.create_task(render())
+            return mock_response
+
+        # Clock reads: request start, fetch start/end, render start/end, request end
+        clock_ms = [1000, 1000, 1010, 1015, 1035, 1050]
+        with (
+            patch("src.downloader.middleware.get_metrics_collector"),
+            patch(
+                "src.downloader.middleware.perf_counter_ns",
+                side_effect=[ms * 1_000_000 for ms in clock_ms],
+            ),
+        ):
+            middleware = MetricsMiddleware(app=MagicMock())
+            response = await middleware.dispatch(mock_request, mock_call_next)
+
+        assert response.headers["Server-Timing"] == (
+            "fetch;dur=10.000, render;dur=20.000, total;dur=50.000"
+        )
+        assert response.headers["X-Response-Time"] == "0.050s"
+
+    @pytest.mark.asyncio
+    async def test_dispatch_reports_own_duration_of_overlapping_subtimings(self):
+        """Test concurrent stages each report their own duration, not the gap between them."""
+        mock_request = MagicMock()
+        mock_request.method = "GET"
+        mock_request.url.path = "/health"
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {}
+
+        async def stage(name):
+            with subtiming(name):
+                await asyncio.sleep(0)
+
+        async def mock_call_next(request):
+            await asyncio.gather(stage("convert-text"), stage("pdf"))
+            return mock_response
+
+        # Clock reads: request start, text start, pdf start, text end, pdf end, request end
+        clock_ms = [0, 10, 10, 40, 50, 60]
+        with (
+            patch("src.downloader.middleware.get_metrics_collector"),
+            patch(
+                "src.downloader.middleware.perf_counter_ns",
+                side_effect=[ms * 1_000_000 for ms in clock_ms],
+            ),
+        ):
+            middleware = MetricsMiddleware(app=MagicMock())
+            response = await middleware.dispatch(mock_request, mock_call_next)
+
+        assert response.headers["Server-Timing"] == (
+            "convert-text;dur=30.000, pdf;dur=40.000, total;dur=60.000"
+        )
+
+    @pytest.mark.asyncio
+    async def test_dispatch_omits_server_timing_without_subtimings(self):
+        """Test no Server-Timing header is added when nothing recorded a sub-timing."""
+        mock_request = MagicMock()
+        mock_request.method = "GET"
+        mock_request.url.path = "/health"
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {}
+
+        async def mock_call_next(request):
+            return mock_response
+
+        with patch("src.downloader.middleware.get_metrics_collector"):
+            middleware = MetricsMiddleware(app=MagicMock())
+            response = await middleware.dispatch(mock_request, mock_call_next)
+
+        assert "Server-Timing" not in response.headers
+
+    def test_subtiming_outside_request_is_noop(self):
+        """Test subtiming only runs the block when no request is being timed."""
+        ran = False
+        with patch("src.downloader.middleware.perf_counter_ns") as mock_clock:
+            with subtiming("orphan"):
+                ran = True
+
+        assert ran
+        mock_clock.assert_not_called()
+
 
 class TestSystemMetricsCollectorInit:
     """Tests for SystemMetricsCollector initialization."""
@@ -267,6 +409,24 @@ class TestSystemMetricsCollectorStop:
 
             assert task.cancelled() or task.done()
 
+    @pytest.mark.asyncio
+    async def test_stop_with_finished_task(self):
+        """Test stop does not re-raise the error of an already finished task."""
+        collector = SystemMetricsCollector()
+
+        async def failed():
+            raise RuntimeError("collection crashed")
+
+        collector._running = True
+        collector._task = asyncio.create_task(failed())
+        await asyncio.sleep(0)
+        assert collector._task.done()
+
+        await collector.stop()
+
+        assert collector._running is False
+        assert collector._task is None
+
     @pytest.mark.asyncio
     async def test_stop_handles_no_task(self):
         """Test stop handles case when no task exists."""
@@ -303,21 +463,48 @@ class TestSystemMetricsCollectorCollect:
 
         collector.app_state = mock_app_state
 
-        with patch.object(collector, "_collect_redis_metrics", new_callable=AsyncMock):
-            with patch.object(collector, "_collect_pdf_pool_metrics", new_callable=AsyncMock):
+        with patch.object(collector, "_collect_redis_metrics", AsyncMock(return_value={})):
+            with patch.object(collector, "_collect_pdf_pool_metrics", AsyncMock(return_value={})):
                 with patch.object(
-                    collector, "_collect_http_client_metrics", new_callable=AsyncMock
+                    collector, "_collect_http_client_metrics", AsyncMock(return_value={})
                 ):
                     mock_collector = MagicMock()
                     collector.collector = mock_collector
 
                     await collector._collect_metrics_snapshot()
 
-                    # Check that gauges were set
-                    set_gauge_calls = mock_collector.set_gauge.call_args_list
-                    gauge_names = [call[0][0] for call in set_gauge_calls]
-                    assert "pdf_concurrency_utilization" in gauge_names
-                    assert "batch_concurrency_utilization" in gauge_names
+                    # Check that gauges were set in one batch
+                    mock_collector.set_gauges.assert_called_once()
+                    gauges = mock_collector.set_gauges.call_args[0][0]
+                    assert gauges["pdf_concurrency_utilization"] == pytest.approx(100 * 4 / 12)
+                    assert gauges["batch_concurrency_utilization"] == 20
+                    assert gauges["pdf_concurrency_active"] == 4
+                    assert gauges["batch_concurrency_active"] == 10
+
+    @pytest.mark.asyncio
+    async def test_collect_metrics_snapshot_publishes_all_sources_once(self):
+        """Test gauges from every source are merged and published in a single update."""
+        collector = SystemMetricsCollector()
+        collector.collector = MagicMock()
+
+        with (
+            patch.object(
+                collector, "_collect_redis_metrics", AsyncMock(return_value={"redis_status": 1})
+            ),
+            patch.object(
+                collector, "_collect_pdf_pool_metrics", AsyncMock(side_effect=RuntimeError)
+            ),
+            patch.object(
+                collector,
+                "_collect_http_client_metrics",
+                AsyncMock(return_value={"http_client_status": 0}),
+            ),
+        ):
+            await collector._collect_metrics_snapshot()
+
+        collector.collector.set_gauges.assert_called_once_with(
+            {"redis_status": 1, "http_client_status": 0}
+        )
 
     @pytest.mark.asyncio
     async def test_collect_metrics_snapshot_without_app_state(self):
@@ -325,115 +512,110 @@ class TestSystemMetricsCollectorCollect:
         collector = SystemMetricsCollector()
         collector.app_state = None
 
-        with patch.object(collector, "_collect_redis_metrics", new_callable=AsyncMock):
-            with patch.object(collector, "_collect_pdf_pool_metrics", new_callable=AsyncMock):
+        with patch.object(collector, "_collect_redis_metrics", AsyncMock(return_value={})):
+            with patch.object(collector, "_collect_pdf_pool_metrics", AsyncMock(return_value={})):
                 with patch.object(
-                    collector, "_collect_http_client_metrics", new_callable=AsyncMock
+                    collector, "_collect_http_client_metrics", AsyncMock(return_value={})
                 ):
                     # Should not raise
                     await collector._collect_metrics_snapshot()
 
     @pytest.mark.asyncio
-    async def test_collect_redis_metrics_healthy(self):
-        """Test _collect_redis_metrics sets redis_status=1 when healthy."""
+    async def test_collect_metrics_snapshot_runs_sources_concurrently(self):
+        """Test source collectors overlap and one failure does not skip the others."""
         collector = SystemMetricsCollector()
-
-        mock_job_manager = AsyncMock()
-        mock_job_manager.get_connection_stats = AsyncMock(
-            return_value={
-                "status": "healthy",
-                "created_connections": 5,
-                "available_connections": 3,
-                "in_use_connections": 2,
-            }
-        )
-
-        mock_app_state = MagicMock()
-        mock_app_state.job_manager = mock_job_manager
-        collector.app_state = mock_app_state
-
-        mock_collector = MagicMock()
-        collector.collector = mock_collector
-
-        await collector._collect_redis_metrics()
-
-        # Check redis_status was set to 1
-        set_gauge_calls = mock_collector.set_gauge.call_args_list
-        redis_status_call = [c for c in set_gauge_calls if c[0][0] == "redis_status"]
-        assert len(redis_status_call) == 1
-        assert redis_status_call[0][0][1] == 1
-
-    @pytest.mark.asyncio
-    async def test_collect_redis_metrics_unhealthy(self):
-        """Test _collect_redis_metrics sets redis_status=0 when unhealthy."""
+        collector.collector = MagicMock()
+        started = []
+        all_started = asyncio.Event()
+
+        async def slow_source(name):
+            # Blocks until both slow sources are running, so sequential awaits would hang
+            started.append(name)
+            if len(started) == 2:
+                all_started.set()
+            await all_started.wait()
+            return {}
+
+        async def failing_source():
+            raise RuntimeError("boom")
+
+        with (
+            patch.object(collector, "_collect_redis_metrics", lambda: slow_source("redis")),
+            patch.object(collector, "_collect_pdf_pool_metrics", failing_source),
+            patch.object(collector, "_collect_http_client_metrics", lambda: slow_source("http")),
+        ):
+            await asyncio.wait_for(collector._collect_metrics_snapshot(), timeout=1.0)
+
+        assert started == ["redis", "http"]
+
+    def test_concurrency_gauges_without_semaphores(self):
+        """Test _concurrency_gauges is empty when the app state lacks semaphores."""
         collector = SystemMetricsCollector()
+        assert collector._concurrency_gauges() == {}
 
-        mock_job_manager = AsyncMock()
-        mock_job_manager.get_connection_stats = AsyncMock(return_value={"status": "unhealthy"})
-
-        mock_app_state = MagicMock()
-        mock_app_state.job_manager = mock_job_manager
-        collector.app_state = mock_app_state
-
-        mock_collector = MagicMock()
-        collector.collector = mock_collector
-
-        await collector._collect_redis_metrics()
-
-        set_gauge_calls = mock_collector.set_gauge.call_args_list
-        redis_status_call = [c for c in set_gauge_calls if c[0][0] == "redis_status"]
-        assert len(redis_status_call) == 1
-        assert redis_status_call[0][0][1] == 0
+        collector.app_state = MagicMock(pdf_semaphore=None)
+        assert collector._concurrency_gauges() == {}
 
     @pytest.mark.asyncio
-    async def test_collect_redis_metrics_exception(self):
-        """Test _collect_redis_metrics sets redis_status=0 on exception."""
+    @pytest.mark.parametrize(
+        ("stats", "expected_gauges"),
+        [
+            pytest.param(
+                {
+                    "status": "healthy",
+                    "created_connections": 5,
+                    "available_connections": 3,
+                    "in_use_connections": 2,
+                },
+                {
+                    "redis_status": 1,
+                    "redis_created_connections": 5,
+                    "redis_available_connections": 3,
+                    "redis_in_use_connections": 2,
+                },
+                id="healthy",
+            ),
+            pytest.param({"status": "unhealthy"}, {"redis_status": 0}, id="unhealthy"),
+            pytest.param(Exception("Redis error"), {"redis_status": 0}, id="exception"),
+        ],
+    )
+    async def test_collect_redis_metrics(self, stats, expected_gauges):
+        """Test _collect_redis_metrics returns redis_status and pool stats, never raising."""
         collector = SystemMetricsCollector()
 
-        mock_job_manager = AsyncMock()
-        mock_job_manager.get_connection_stats = AsyncMock(side_effect=Exception("Redis error"))
+        # A plain coroutine function: only the returned value matters here
+        async def get_connection_stats():
+            if isinstance(stats, Exception):
+                raise stats
+            return stats
+
+        mock_job_manager = MagicMock()
+        mock_job_manager.get_connection_stats = get_connection_stats
 
         mock_app_state = MagicMock()
         mock_app_state.job_manager = mock_job_manager
         collector.app_state = mock_app_state
 
-        mock_collector = MagicMock()
-        collector.collector = mock_collector
-
-        # Should not raise
-        await collector._collect_redis_metrics()
-
-        set_gauge_calls = mock_collector.set_gauge.call_args_list
-        redis_status_call = [c for c in set_gauge_calls if c[0][0] == "redis_status"]
-        assert len(redis_status_call) == 1
-        assert redis_status_call[0][0][1] == 0
+        assert await collector._collect_redis_metrics() == expected_gauges
 
     @pytest.mark.asyncio
     async def test_collect_http_client_metrics_healthy(self):
-        """Test _collect_http_client_metrics sets http_client_status=1 when healthy."""
+        """Test _collect_http_client_metrics reports http_client_status=1 when healthy."""
         collector = SystemMetricsCollector()
 
         mock_http_client = MagicMock()
-        mock_http_client.get_connection_stats = MagicMock(
-            return_value={
-                "status": "healthy",
-                "circuit_breakers": {"example.com": {"state": "closed", "failure_count": 0}},
-            }
-        )
+        mock_http_client.get_connection_stats = lambda: {
+            "status": "healthy",
+            "circuit_breakers": {"example.com": {"state": "closed", "failure_count": 0}},
+        }
 
         mock_app_state = MagicMock()
         mock_app_state.http_client = mock_http_client
         collector.app_state = mock_app_state
 
-        mock_collector = MagicMock()
-        collector.collector = mock_collector
-
-        await collector._collect_http_client_metrics()
+        gauges = await collector._collect_http_client_metrics()
 
-        set_gauge_calls = mock_collector.set_gauge.call_args_list
-        http_status_call = [c for c in set_gauge_calls if c[0][0] == "http_client_status"]
-        assert len(http_status_call) == 1
-        assert http_status_call[0][0][1] == 1
+        assert gauges["http_client_status"] == 1
 
     @pytest.mark.asyncio
     async def test_collect_http_client_metrics_circuit_breaker(self):
@@ -441,53 +623,81 @@ class TestSystemMetricsCollectorCollect:
         collector = SystemMetricsCollector()
 
         mock_http_client = MagicMock()
-        mock_http_client.get_connection_stats = MagicMock(
-            return_value={
-                "status": "healthy",
-                "circuit_breakers": {"example.com": {"state": "closed", "failure_count": 3}},
-            }
-        )
+        mock_http_client.get_connection_stats = lambda: {
+            "status": "healthy",
+            "circuit_breakers": {"example.com": {"state": "closed", "failure_count": 3}},
+        }
 
         mock_app_state = MagicMock()
         mock_app_state.http_client = mock_http_client
         collector.app_state = mock_app_state
 
-        mock_collector = MagicMock()
-        collector.collector = mock_collector
+        gauges = await collector._collect_http_client_metrics()
 
-        await collector._collect_http_client_metrics()
+        # URL dots should be normalized to underscores
+        assert gauges["circuit_breaker_example_com_failures"] == 3
+        assert gauges["circuit_breaker_example_com_state"] == 1
 
-        set_gauge_calls = mock_collector.set_gauge.call_args_list
-        gauge_names = [c[0][0] for c in set_gauge_calls]
+    def test_circuit_breaker_gauge_names_cached(self):
+        """Test circuit breaker gauge names are built once per host."""
+        collector = SystemMetricsCollector()
 
-        # URL dots should be normalized to underscores
-        assert "circuit_breaker_example_com_failures" in gauge_names
-        assert "circuit_breaker_example_com_state" in gauge_names
+        names = collector._circuit_breaker_gauge_names("example.com:8080")
+
+        assert names == (
+            "circuit_breaker_example_com_8080_failures",
+            "circuit_breaker_example_com_8080_state",
+        )
+        assert collector._circuit_breaker_gauge_names("example.com:8080") is names
+
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_gauges_capped(self):
+        """Test gauges of the least recently seen circuit breaker hosts are evicted."""
+        collector = SystemMetricsCollector()
+        collector.collector = MetricsCollector()
+
+        mock_app_state = MagicMock(pdf_semaphore=None, job_manager=None)
+        collector.app_state = mock_app_state
+
+        # 100 hosts, then 150 more in a single scrape
+        for hosts in (range(100), range(100, 250)):
+            stats = {
+                "status": "healthy",
+                "circuit_breakers": {
+                    f"host{i}.example.com": {"state": "closed", "failure_count": 0} for i in hosts
+                },
+            }
+            mock_app_state.http_client.get_connection_stats = lambda stats=stats: stats
+            await collector._collect_metrics_snapshot()
+
+        gauges = collector.collector._gauges
+        breaker_gauges = [name for name in gauges if name.startswith("circuit_breaker_")]
+        assert len(breaker_gauges) == 2 * 128
+        # The oldest hosts were evicted, the most recent kept
+        assert "circuit_breaker_host0_example_com_state" not in gauges
+        assert "circuit_breaker_host0_example_com_state" not in collector.collector._metrics_history
+        assert "circuit_breaker_host121_example_com_state" not in gauges
+        assert "circuit_breaker_host122_example_com_state" in gauges
+        assert "circuit_breaker_host249_example_com_state" in gauges
 
     @pytest.mark.asyncio
     async def test_collect_http_client_metrics_exception(self):
-        """Test _collect_http_client_metrics sets http_client_status=0 on exception."""
+        """Test _collect_http_client_metrics reports http_client_status=0 on exception."""
         collector = SystemMetricsCollector()
 
         mock_http_client = MagicMock()
-        mock_http_client.get_connection_stats = MagicMock(
-            side_effect=Exception("HTTP client error")
-        )
+
+        def get_connection_stats():
+            raise Exception("HTTP client error")
+
+        mock_http_client.get_connection_stats = get_connection_stats
 
         mock_app_state = MagicMock()
         mock_app_state.http_client = mock_http_client
         collector.app_state = mock_app_state
 
-        mock_collector = MagicMock()
-        collector.collector = mock_collector
-
         # Should not raise
-        await collector._collect_http_client_metrics()
-
-        set_gauge_calls = mock_collector.set_gauge.call_args_list
-        http_status_call = [c for c in set_gauge_calls if c[0][0] == "http_client_status"]
-        assert len(http_status_call) == 1
-        assert http_status_call[0][0][1] == 0
+        assert await collector._collect_http_client_metrics() == {"http_client_status": 0}
 
 
 class TestGetSystemMetricsCollector:
@@ -496,9 +706,7 @@ class TestGetSystemMetricsCollector:
     def test_get_system_metrics_collector_singleton(self):
         """Test get_system_metrics_collector returns singleton."""
         # Reset global
-        import src.downloader.middleware as middleware_module
-
-        middleware_module._system_metrics_collector = None
+        get_system_metrics_collector.cache_clear()
 
         collector1 = get_system_metrics_collector()
         collector2 = get_system_metrics_collector()
@@ -507,9 +715,7 @@ class TestGetSystemMetricsCollector:
 
     def test_get_system_metrics_collector_creates_instance(self):
         """Test get_system_metrics_collector creates instance if none exists."""
-        import src.downloader.middleware as middleware_module
-
-        middleware_module._system_metrics_collector = None
+        get_system_metrics_collector.cache_clear()
 
         collector = get_system_metrics_collector()
 
@@ -1,39 +1,23 @@
 """Tests for PDF generator browser pool functionality."""
 
-from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
 
 import pytest
 
-from src.downloader.pdf_generator import PDFGeneratorError, PlaywrightPDFGenerator
+from src.downloader.pdf_generator import PDFGeneratorError
 
 
 class TestPDFGeneratorBrowserPool:
     """Test browser pool management in PDF generator."""
 
     @pytest.mark.asyncio
-    async def test_generate_pdf_success(self, mock_browser_pool):
+    async def test_generate_pdf_success(self, started_pdf_generator):
         """Test successful PDF generation."""
-        pool_instance, browser = mock_browser_pool
-
-        context = AsyncMock()
-        page = AsyncMock()
-        browser.new_context = AsyncMock(return_value=context)
-        context.new_page = AsyncMock(return_value=page)
-
-        response = AsyncMock()
-        response.status = 200
-        response.status_text = "OK"
-        page.goto = AsyncMock(return_value=response)
-
-        pdf_content = b"PDF content"
-        page.pdf = AsyncMock(return_value=pdf_content)
-
-        generator = PlaywrightPDFGenerator()
-        await generator.start()
+        generator, page, context, pool_instance, browser = started_pdf_generator
 
         result = await generator.generate_pdf("https://example.com")
 
-        assert result == pdf_content
+        assert result == b"PDF content"
         pool_instance.get_browser.assert_called_once()
         browser.new_context.assert_called_once()
         context.new_page.assert_called_once()
@@ -44,22 +28,11 @@ class TestPDFGeneratorBrowserPool:
         pool_instance.release_browser.assert_called_once_with(browser)
 
     @pytest.mark.asyncio
-    async def test_generate_pdf_http_error(self, mock_browser_pool):
+    async def test_generate_pdf_http_error(self, started_pdf_generator):
         """Test PDF generation with HTTP error."""
-        pool_instance, browser = mock_browser_pool
-
-        context = AsyncMock()
-        page = AsyncMock()
-        browser.new_context = AsyncMock(return_value=context)
-        context.new_page = AsyncMock(return_value=page)
-
-        response = AsyncMock()
-        response.status = 404
-        response.status_text = "Not Found"
-        page.goto = AsyncMock(return_value=response)
-
-        generator = PlaywrightPDFGenerator()
-        await generator.start()
+        generator, page, context, pool_instance, browser = started_pdf_generator
+        page.goto.return_value.status = 404
+        page.goto.return_value.status_text = "Not Found"
 
         with pytest.raises(PDFGeneratorError, match="HTTP 404"):
             await generator.generate_pdf("https://example.com/notfound")
@@ -68,18 +41,10 @@ class TestPDFGeneratorBrowserPool:
         pool_instance.release_browser.assert_called_once_with(browser)
 
     @pytest.mark.asyncio
-    async def test_generate_pdf_no_response(self, mock_browser_pool):
+    async def test_generate_pdf_no_response(self, started_pdf_generator):
         """Test PDF generation with no response."""
-        pool_instance, browser = mock_browser_pool
-
-        context = AsyncMock()
-        page = AsyncMock()
-        browser.new_context = AsyncMock(return_value=context)
-        context.new_page = AsyncMock(return_value=page)
-        page.goto = AsyncMock(return_value=None)
-
-        generator = PlaywrightPDFGenerator()
-        await generator.start()
+        generator, page, context, pool_instance, browser = started_pdf_generator
+        page.goto.return_value = None
 
         with pytest.raises(PDFGeneratorError, match="Failed to load page"):
             await generator.generate_pdf("https://example.com")
@@ -88,24 +53,9 @@ class TestPDFGeneratorBrowserPool:
         pool_instance.release_browser.assert_called_once_with(browser)
 
     @pytest.mark.asyncio
-    async def test_generate_pdf_custom_options(self, mock_browser_pool):
+    async def test_generate_pdf_custom_options(self, started_pdf_generator):
         """Test PDF generation with custom options."""
-        pool_instance, browser = mock_browser_pool
-
-        context = AsyncMock()
-        page = AsyncMock()
-        browser.new_context = AsyncMock(return_value=context)
-        context.new_page = AsyncMock(return_value=page)
-
-        response = AsyncMock()
-        response.status = 200
-        page.goto = AsyncMock(return_value=response)
-
-        pdf_content = b"PDF content"
-        page.pdf = AsyncMock(return_value=pdf_content)
-
-        generator = PlaywrightPDFGenerator()
-        await generator.start()
+        generator, page, context, pool_instance, browser = started_pdf_generator
 
         custom_options = {
             "format": "Letter",
@@ -115,7 +65,7 @@ class TestPDFGeneratorBrowserPool:
 
         result = await generator.generate_pdf("https://example.com", custom_options)
 
-        assert result == pdf_content
+        assert result == b"PDF content"
 
         page.goto.assert_called_once()
         call_args = page.goto.call_args
@@ -128,3 +78,65 @@ class TestPDFGeneratorBrowserPool:
 
         context.close.assert_called_once()
         pool_instance.release_browser.assert_called_once_with(browser)
+
+
+class TestPDFGeneratorContextReuse:
+    """Test reuse of browser contexts across PDF requests."""
+
+    @pytest.fixture
+    def reusing_generator(self, started_pdf_generator):
+        generator, page, context, pool_instance, browser = started_pdf_generator
+        generator.reuse_contexts = True
+        browser.is_connected = MagicMock(return_value=True)
+        return started_pdf_generator
+
+    @pytest.mark.asyncio
+    async def test_context_reused_between_requests(self, reusing_generator):
+        """Test a second PDF reuses the first request's context after clearing it."""
+        generator, page, context, pool_instance, browser = reusing_generator
+
+        await generator.generate_pdf("https://example.com/a")
+        await generator.generate_pdf("https://example.com/b")
+
+        browser.new_context.assert_called_once()
+        assert context.new_page.call_count == 2
+        assert context.clear_cookies.call_count == 2
+        assert context.clear_permissions.call_count == 2
+        context.close.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_context_closed_after_failed_request(self, reusing_generator):
+        """Test a context whose request failed is closed rather than reused."""
+        generator, page, context, pool_instance, browser = reusing_generator
+        page.goto.return_value = None
+
+        with pytest.raises(PDFGeneratorError):
+            await generator.generate_pdf("https://example.com")
+
+        context.close.assert_called_once()
+        assert not generator._idle_contexts.get(browser)
+
+    @pytest.mark.asyncio
+    async def test_context_not_reused_on_disconnected_browser(self, reusing_generator):
+        """Test idle contexts of a disconnected browser are dropped."""
+        generator, page, context, pool_instance, browser = reusing_generator
+
+        await generator.generate_pdf("https://example.com/a")
+        browser.is_connected.return_value = False
+        await generator.generate_pdf("https://example.com/b")
+
+        assert browser.new_context.call_count == 2
+        assert generator._idle_contexts == {}
+
+    @pytest.mark.asyncio
+    async def test_close_closes_idle_contexts(self, reusing_generator):
+        """Test closing the generator closes contexts kept for reuse."""
+        generator, page, context, pool_instance, browser = reusing_generator
+
+        await generator.generate_pdf("https://example.com")
+        context.close.assert_not_called()
+
+        await generator.close()
+
+        context.close.assert_called_once()
+        assert generator._idle_contexts == {}
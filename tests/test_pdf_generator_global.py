@@ -1,10 +1,20 @@
 """Tests for global PDF generation functions."""
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from fastapi.testclient import TestClient
 
-from src.downloader.pdf_generator import generate_pdf_from_url, get_pdf_generator
+from src.downloader.config import reload_settings
+from src.downloader.main import app
+from src.downloader.pdf_generator import (
+    PDFGeneratorError,
+    cleanup_pdf_generator,
+    generate_pdf_from_url,
+    get_pdf_generator,
+    get_shared_pdf_generator,
+    set_shared_pdf_generator,
+)
 
 
 class TestGlobalPDFFunctions:
@@ -13,14 +23,10 @@ class TestGlobalPDFFunctions:
     @pytest.mark.asyncio
     async def test_generate_pdf_from_url(self):
         """Test generate_pdf_from_url function."""
-        with patch("src.downloader.pdf_generator.get_pdf_generator") as mock_get_generator:
+        with patch("src.downloader.pdf_generator._get_started_generator") as mock_get_generator:
             mock_generator = AsyncMock()
             mock_generator.generate_pdf = AsyncMock(return_value=b"PDF content")
-
-            mock_context = AsyncMock()
-            mock_context.__aenter__ = AsyncMock(return_value=mock_generator)
-            mock_context.__aexit__ = AsyncMock(return_value=None)
-            mock_get_generator.return_value = mock_context
+            mock_get_generator.return_value = mock_generator
 
             result = await generate_pdf_from_url("https://example.com")
 
@@ -53,3 +59,78 @@ class TestGlobalPDFFunctions:
         async with get_pdf_generator() as generator:
             assert generator == existing_instance
             existing_instance.start.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_generate_pdf_from_url_reuses_started_generator(self):
+        """Test generate_pdf_from_url uses the running generator without restarting it."""
+        import src.downloader.pdf_generator
+
+        existing_instance = AsyncMock()
+        existing_instance.generate_pdf = AsyncMock(return_value=b"PDF content")
+        src.downloader.pdf_generator._pdf_generator = existing_instance
+
+        assert await generate_pdf_from_url("https://example.com") == b"PDF content"
+        assert await generate_pdf_from_url("https://example.org") == b"PDF content"
+
+        existing_instance.start.assert_not_called()
+        assert existing_instance.generate_pdf.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_start_leaves_no_shared_generator(self):
+        """Test a generator that fails to start is not kept as the shared instance."""
+        import src.downloader.pdf_generator
+
+        src.downloader.pdf_generator._pdf_generator = None
+
+        with patch("src.downloader.pdf_generator.PlaywrightPDFGenerator") as mock_class:
+            mock_class.return_value.start = AsyncMock(
+                side_effect=PDFGeneratorError("PDF generator initialization failed")
+            )
+
+            with pytest.raises(PDFGeneratorError):
+                await generate_pdf_from_url("https://example.com")
+
+        assert src.downloader.pdf_generator._pdf_generator is None
+
+    @pytest.mark.asyncio
+    async def test_generate_pdf_from_url_uses_published_generator(self, started_pdf_generator):
+        """Test a published generator, e.g. one with context reuse, serves generate_pdf_from_url."""
+        import src.downloader.pdf_generator
+
+        generator, page, context, pool_instance, browser = started_pdf_generator
+        generator.reuse_contexts = True
+        browser.is_connected = MagicMock(return_value=True)
+
+        set_shared_pdf_generator(generator)
+        try:
+            assert await generate_pdf_from_url("https://example.com/a") == b"PDF content"
+            assert await generate_pdf_from_url("https://example.com/b") == b"PDF content"
+
+            # No second pool was created, and the second request reused the first's context
+            assert get_shared_pdf_generator() is generator
+            browser.new_context.assert_called_once()
+            context.close.assert_not_called()
+
+            await cleanup_pdf_generator()
+            context.close.assert_called_once()
+            assert get_shared_pdf_generator() is None
+        finally:
+            src.downloader.pdf_generator._pdf_generator = None
+
+    def test_lifespan_publishes_and_closes_its_generator(self):
+        """Test the app lifespan shares its configured generator and closes it on shutdown."""
+        import src.downloader.pdf_generator
+
+        src.downloader.pdf_generator._pdf_generator = None
+        reload_settings()
+        with patch("src.downloader.main.PlaywrightPDFGenerator") as mock_class:
+            mock_instance = mock_class.return_value
+            mock_instance.__aenter__ = AsyncMock(return_value=mock_instance)
+            mock_instance.close = AsyncMock()
+
+            with TestClient(app):
+                assert get_shared_pdf_generator() is mock_instance
+                assert app.state.pdf_generator is mock_instance
+
+        mock_instance.close.assert_called_once()
+        assert get_shared_pdf_generator() is None
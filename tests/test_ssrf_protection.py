@@ -1,7 +1,11 @@
 """Test SSRF protection implementation."""
 
+import socket
+from unittest.mock import patch
+
 import pytest
 
+from src.downloader import validation
 from src.downloader.config import Settings, SSRFConfig
 from src.downloader.validation import (
     SSRFProtectionError,
@@ -10,134 +14,180 @@ from src.downloader.validation import (
 )
 
 
-class TestSSRFProtection:
-    """Test comprehensive SSRF protection."""
-
-    def test_block_localhost_ip(self):
-        """Block loopback IP addresses."""
-        settings = Settings(ssrf=SSRFConfig(resolve_dns=False))
-
-        with pytest.raises(SSRFProtectionError, match="loopback"):
-            validate_url("http://127.0.0.1", settings)
-
-        with pytest.raises(SSRFProtectionError, match="loopback"):
-            validate_url("http://127.0.0.2", settings)
-
-    def test_block_localhost_ipv6(self):
-        """Block IPv6 loopback."""
-        settings = Settings(ssrf=SSRFConfig(resolve_dns=False))
-
-        with pytest.raises(SSRFProtectionError, match="loopback"):
-            validate_url("http://[::1]", settings)
-
-    def test_block_private_ips_class_a(self):
-        """Block private IP addresses in 10.0.0.0/8 range."""
-        settings = Settings(ssrf=SSRFConfig(resolve_dns=False, block_private_ips=True))
-
-        with pytest.raises(SSRFProtectionError, match="private IP"):
-            validate_url("http://10.0.0.1", settings)
-
-        with pytest.raises(SSRFProtectionError, match="private IP"):
-            validate_url("http://10.255.255.255", settings)
-
-    def test_block_private_ips_class_b(self):
-        """Block private IP addresses in 172.16.0.0/12 range."""
-        settings = Settings(ssrf=SSRFConfig(resolve_dns=False, block_private_ips=True))
-
-        with pytest.raises(SSRFProtectionError, match="private IP"):
-            validate_url("http://172.16.0.1", settings)
-
-        with pytest.raises(SSRFProtectionError, match="private IP"):
-            validate_url("http://172.31.255.255", settings)
-
-    def test_block_private_ips_class_c(self):
-        """Block private IP addresses in 192.168.0.0/16 range."""
-        settings = Settings(ssrf=SSRFConfig(resolve_dns=False, block_private_ips=True))
-
-        with pytest.raises(SSRFProtectionError, match="private IP"):
-            validate_url("http://192.168.0.1", settings)
-
-        with pytest.raises(SSRFProtectionError, match="private IP"):
-            validate_url("http://192.168.255.255", settings)
+@pytest.fixture(scope="module")
+def settings_no_dns():
+    """Settings without DNS resolution; built once, since Settings validation is slow."""
+    return Settings(ssrf=SSRFConfig(resolve_dns=False))
 
-    def test_block_cloud_metadata_ip(self):
-        """Block cloud metadata endpoint IP."""
-        settings = Settings(ssrf=SSRFConfig(resolve_dns=False, block_cloud_metadata=True))
 
-        with pytest.raises(SSRFProtectionError, match="cloud metadata"):
-            validate_url("http://169.254.169.254", settings)
+@pytest.fixture(scope="module")
+def settings_block_private():
+    """Settings blocking private IPs, without DNS resolution."""
+    return Settings(ssrf=SSRFConfig(resolve_dns=False, block_private_ips=True))
 
-        with pytest.raises(SSRFProtectionError, match="cloud metadata"):
-            validate_url("http://169.254.169.254/latest/meta-data/", settings)
-
-    def test_block_link_local(self):
-        """Block link-local addresses (169.254.0.0/16)."""
-        settings = Settings(ssrf=SSRFConfig(resolve_dns=False, block_cloud_metadata=True))
-
-        # Any 169.254.x.x address should be blocked (link-local)
-        with pytest.raises(SSRFProtectionError, match="link-local"):
-            validate_url("http://169.254.1.1", settings)
-
-        with pytest.raises(SSRFProtectionError, match="link-local"):
-            validate_url("http://169.254.100.50", settings)
 
-    def test_block_multicast(self):
-        """Block multicast addresses."""
-        settings = Settings(ssrf=SSRFConfig(resolve_dns=False))
+@pytest.fixture(scope="module")
+def settings_block_metadata():
+    """Settings blocking cloud metadata endpoints, without DNS resolution."""
+    return Settings(ssrf=SSRFConfig(resolve_dns=False, block_cloud_metadata=True))
 
-        with pytest.raises(SSRFProtectionError, match="multicast"):
-            validate_url("http://224.0.0.1", settings)
 
-        with pytest.raises(SSRFProtectionError, match="multicast"):
-            validate_url("http://239.255.255.255", settings)
+@pytest.fixture(scope="module")
+def settings_allow_private():
+    """Settings allowing private IPs, without DNS resolution."""
+    return Settings(ssrf=SSRFConfig(resolve_dns=False, block_private_ips=False))
 
-    def test_block_reserved(self):
-        """Block reserved IP addresses."""
-        settings = Settings(ssrf=SSRFConfig(resolve_dns=False))
 
-        with pytest.raises(SSRFProtectionError, match="reserved"):
-            validate_url("http://240.0.0.1", settings)
-
-    def test_block_unspecified(self):
-        """Block unspecified addresses (0.0.0.0)."""
-        settings = Settings(ssrf=SSRFConfig(resolve_dns=False))
-
-        with pytest.raises(SSRFProtectionError, match="unspecified"):
-            validate_url("http://0.0.0.0", settings)
+class TestSSRFProtection:
+    """Test comprehensive SSRF protection."""
 
-    def test_allow_private_ips_when_disabled(self):
+    @pytest.mark.parametrize(
+        ("url", "settings_fixture", "match"),
+        [
+            pytest.param("http://127.0.0.1", "settings_no_dns", "loopback", id="loopback"),
+            pytest.param("http://127.0.0.2", "settings_no_dns", "loopback", id="loopback-range"),
+            pytest.param("http://[::1]", "settings_no_dns", "loopback", id="loopback-ipv6"),
+            pytest.param(
+                "http://10.0.0.1", "settings_block_private", "private IP", id="private-a-first"
+            ),
+            pytest.param(
+                "http://10.255.255.255", "settings_block_private", "private IP", id="private-a-last"
+            ),
+            pytest.param(
+                "http://172.16.0.1", "settings_block_private", "private IP", id="private-b-first"
+            ),
+            pytest.param(
+                "http://172.31.255.255", "settings_block_private", "private IP", id="private-b-last"
+            ),
+            pytest.param(
+                "http://192.168.0.1", "settings_block_private", "private IP", id="private-c-first"
+            ),
+            pytest.param(
+                "http://192.168.255.255",
+                "settings_block_private",
+                "private IP",
+                id="private-c-last",
+            ),
+            pytest.param(
+                "http://[fd00::1]", "settings_block_private", "private IP", id="private-ipv6"
+            ),
+            pytest.param(
+                "http://169.254.169.254",
+                "settings_block_metadata",
+                "cloud metadata",
+                id="cloud-metadata",
+            ),
+            pytest.param(
+                "http://169.254.169.254/latest/meta-data/",
+                "settings_block_metadata",
+                "cloud metadata",
+                id="cloud-metadata-path",
+            ),
+            # Any other 169.254.x.x address is link-local
+            pytest.param(
+                "http://169.254.1.1", "settings_block_metadata", "link-local", id="link-local"
+            ),
+            pytest.param(
+                "http://169.254.100.50",
+                "settings_block_metadata",
+                "link-local",
+                id="link-local-range",
+            ),
+            pytest.param("http://[fe80::1]", "settings_no_dns", "link-local", id="link-local-ipv6"),
+            pytest.param("http://224.0.0.1", "settings_no_dns", "multicast", id="multicast-first"),
+            pytest.param(
+                "http://239.255.255.255", "settings_no_dns", "multicast", id="multicast-last"
+            ),
+            pytest.param("http://240.0.0.1", "settings_no_dns", "reserved", id="reserved"),
+            pytest.param("http://0.0.0.0", "settings_no_dns", "unspecified", id="unspecified"),
+            # IPv4-mapped IPv6 addresses are classified by the embedded IPv4 address
+            pytest.param(
+                "http://[::ffff:127.0.0.1]",
+                "settings_no_dns",
+                "loopback",
+                id="ipv4-mapped-loopback",
+            ),
+            pytest.param(
+                "http://[::ffff:169.254.169.254]",
+                "settings_block_metadata",
+                "cloud metadata",
+                id="ipv4-mapped-cloud-metadata",
+            ),
+            # Ranges only Python 3.13+ treats as private are blocked on every interpreter
+            pytest.param(
+                "http://192.0.0.8", "settings_block_private", "private IP", id="ietf-protocol-low"
+            ),
+            pytest.param(
+                "http://192.0.0.255",
+                "settings_block_private",
+                "private IP",
+                id="ietf-protocol-last",
+            ),
+            pytest.param("http://[2002::1]", "settings_block_private", "private IP", id="6to4"),
+            # Without DNS resolution, hostnames are matched against known names
+            pytest.param(
+                "http://localhost", "settings_no_dns", "restricted address", id="localhost-name"
+            ),
+            pytest.param(
+                "http://localhost.localdomain",
+                "settings_no_dns",
+                "restricted address",
+                id="localhost-localdomain-name",
+            ),
+            pytest.param(
+                "http://LocalHost",
+                "settings_no_dns",
+                "restricted address",
+                id="localhost-mixed-case",
+            ),
+        ],
+    )
+    def test_block_restricted_address(self, request, url, settings_fixture, match):
+        """Block restricted addresses with an error naming the category."""
+        settings = request.getfixturevalue(settings_fixture)
+
+        with pytest.raises(SSRFProtectionError, match=match):
+            validate_url(url, settings)
+
+    @pytest.mark.parametrize(
+        ("url", "blocked"),
+        [
+            ("http://172.15.255.255", False),
+            ("http://172.16.0.0", True),
+            ("http://172.31.255.255", True),
+            ("http://172.32.0.0", False),
+            ("http://[2001:db7:ffff:ffff:ffff:ffff:ffff:ffff]", False),
+            ("http://[2001:db8::]", True),
+            ("http://[2001:db9::]", False),
+        ],
+    )
+    def test_private_range_boundaries(self, settings_block_private, url, blocked):
+        """Addresses just outside a private range pass, its first and last are blocked."""
+        if blocked:
+            with pytest.raises(SSRFProtectionError, match="private IP"):
+                validate_url(url, settings_block_private)
+        else:
+            assert validate_url(url, settings_block_private) == url
+
+    def test_allow_private_ips_when_disabled(self, settings_allow_private):
         """Allow private IPs when block_private_ips=False."""
-        settings = Settings(ssrf=SSRFConfig(resolve_dns=False, block_private_ips=False))
-
         # Should not raise (private IPs allowed)
-        result = validate_url("http://192.168.1.1", settings)
+        result = validate_url("http://192.168.1.1", settings_allow_private)
         assert result == "http://192.168.1.1"
 
-        result = validate_url("http://10.0.0.1", settings)
+        result = validate_url("http://10.0.0.1", settings_allow_private)
         assert result == "http://10.0.0.1"
 
-    def test_allow_public_ips(self):
+    def test_allow_public_ips(self, settings_block_private):
         """Allow legitimate public IP addresses."""
-        settings = Settings(ssrf=SSRFConfig(resolve_dns=False, block_private_ips=True))
-
         # Google Public DNS
-        result = validate_url("http://8.8.8.8", settings)
+        result = validate_url("http://8.8.8.8", settings_block_private)
         assert result == "http://8.8.8.8"
 
         # Cloudflare DNS
-        result = validate_url("http://1.1.1.1", settings)
+        result = validate_url("http://1.1.1.1", settings_block_private)
         assert result == "http://1.1.1.1"
 
-    def test_block_localhost_hostname_without_dns(self):
-        """Block localhost hostname when DNS resolution is disabled."""
-        settings = Settings(ssrf=SSRFConfig(resolve_dns=False))
-
-        with pytest.raises(SSRFProtectionError, match="restricted address"):
-            validate_url("http://localhost", settings)
-
-        with pytest.raises(SSRFProtectionError, match="restricted address"):
-            validate_url("http://localhost.localdomain", settings)
-
     def test_block_localhost_hostname_with_dns(self):
         """Block localhost hostname with DNS resolution."""
         settings = Settings(ssrf=SSRFConfig(resolve_dns=True))
@@ -146,15 +196,13 @@ class TestSSRFProtection:
         with pytest.raises(SSRFProtectionError, match="loopback"):
             validate_url("http://localhost", settings)
 
-    def test_allow_public_domains_without_dns(self):
+    def test_allow_public_domains_without_dns(self, settings_block_private):
         """Allow public domains when DNS resolution is disabled."""
-        settings = Settings(ssrf=SSRFConfig(resolve_dns=False, block_private_ips=True))
-
         # Should not raise (hostname-based check passes)
-        result = validate_url("http://example.com", settings)
+        result = validate_url("http://example.com", settings_block_private)
         assert result == "http://example.com"
 
-        result = validate_url("http://google.com", settings)
+        result = validate_url("http://google.com", settings_block_private)
         assert result == "http://google.com"
 
     def test_dns_resolution_for_public_domain(self):
@@ -165,35 +213,29 @@ class TestSSRFProtection:
         result = validate_url("http://example.com", settings)
         assert result == "http://example.com"
 
-    def test_invalid_hostname_format(self):
+    def test_invalid_hostname_format(self, settings_no_dns):
         """Test that invalid hostname formats are rejected."""
-        settings = Settings(ssrf=SSRFConfig(resolve_dns=False))
-
         # Special characters not allowed in hostnames
         with pytest.raises(URLValidationError, match="Invalid hostname format"):
-            validate_url("http://host$name.com", settings)
+            validate_url("http://host$name.com", settings_no_dns)
 
         with pytest.raises(URLValidationError, match="Invalid hostname format"):
-            validate_url("http://host name.com", settings)
+            validate_url("http://host name.com", settings_no_dns)
 
-    def test_url_scheme_validation(self):
+    def test_url_scheme_validation(self, settings_no_dns):
         """Test that only http/https schemes are allowed."""
-        settings = Settings(ssrf=SSRFConfig(resolve_dns=False))
-
         with pytest.raises(URLValidationError, match="file://"):
-            validate_url("file:///etc/passwd", settings)
+            validate_url("file:///etc/passwd", settings_no_dns)
 
         with pytest.raises(URLValidationError, match="http or https"):
-            validate_url("ftp://example.com", settings)
+            validate_url("ftp://example.com", settings_no_dns)
 
-    def test_auto_add_http_scheme(self):
+    def test_auto_add_http_scheme(self, settings_no_dns):
         """Test that http:// is auto-added if missing."""
-        settings = Settings(ssrf=SSRFConfig(resolve_dns=False))
-
-        result = validate_url("example.com", settings)
+        result = validate_url("example.com", settings_no_dns)
         assert result == "http://example.com"
 
-        result = validate_url("8.8.8.8", settings)
+        result = validate_url("8.8.8.8", settings_no_dns)
         assert result == "http://8.8.8.8"
 
     def test_dns_resolution_failure(self):
@@ -207,55 +249,66 @@ class TestSSRFProtection:
                 settings,
             )
 
-    def test_ipv6_private_addresses(self):
-        """Test blocking of IPv6 private addresses."""
-        settings = Settings(ssrf=SSRFConfig(resolve_dns=False, block_private_ips=True))
-
-        # fd00::/8 is private IPv6 range
-        with pytest.raises(SSRFProtectionError, match="private IP"):
-            validate_url("http://[fd00::1]", settings)
+    def test_ipv4_mapped_ipv6_blocked(self, settings_allow_private):
+        """Test IPv4-mapped IPv6 addresses are blocked even when private IPs are allowed."""
+        # ::ffff:0:0/96 sits inside the reserved ::/8 range
+        with pytest.raises(SSRFProtectionError, match="reserved"):
+            validate_url("http://[::ffff:8.8.8.8]", settings_allow_private)
 
-    def test_ipv6_link_local(self):
-        """Test blocking of IPv6 link-local addresses."""
-        settings = Settings(ssrf=SSRFConfig(resolve_dns=False))
+    def test_cloud_metadata_falls_back_to_link_local(self):
+        """Test the metadata IP is still blocked as link-local when metadata blocking is off."""
+        settings = Settings(ssrf=SSRFConfig(resolve_dns=False, block_cloud_metadata=False))
 
-        # fe80::/10 is link-local IPv6 range
         with pytest.raises(SSRFProtectionError, match="link-local"):
-            validate_url("http://[fe80::1]", settings)
+            validate_url("http://169.254.169.254", settings)
 
-    def test_empty_url(self):
-        """Test that empty URLs are rejected."""
-        settings = Settings(ssrf=SSRFConfig(resolve_dns=False))
+    def test_resolved_ipv6_zone_stripped(self):
+        """Test a zoned link-local IPv6 answer from DNS is classified without its zone."""
+        settings = Settings(ssrf=SSRFConfig(resolve_dns=True))
+        addr_info = [(socket.AF_INET6, socket.SOCK_STREAM, 6, "", ("fe80::1%eth0", 0, 0, 2))]
+
+        with (
+            patch.dict(validation._dns_cache, clear=True),
+            patch("socket.getaddrinfo", return_value=addr_info),
+            pytest.raises(SSRFProtectionError, match="link-local"),
+        ):
+            validate_url("http://zoned.example", settings)
+
+    def test_memoized_parse_rechecks_settings(self, settings_allow_private, settings_block_private):
+        """Test a URL parsed from cache is still checked against the current settings."""
+        url = "http://192.168.7.7/memoized"
+        assert validate_url(url, settings_allow_private) == url
+
+        with pytest.raises(SSRFProtectionError, match="private IP"):
+            validate_url(url, settings_block_private)
 
+    def test_empty_url(self, settings_no_dns):
+        """Test that empty URLs are rejected."""
         with pytest.raises(URLValidationError, match="non-empty string"):
-            validate_url("", settings)
+            validate_url("", settings_no_dns)
 
         with pytest.raises(URLValidationError, match="non-empty string"):
-            validate_url(None, settings)
+            validate_url(None, settings_no_dns)
 
-    def test_url_with_port(self):
+    def test_url_with_port(self, settings_block_private):
         """Test that URLs with ports work correctly."""
-        settings = Settings(ssrf=SSRFConfig(resolve_dns=False, block_private_ips=True))
-
         # Public IP with port should work
-        result = validate_url("http://8.8.8.8:8080", settings)
+        result = validate_url("http://8.8.8.8:8080", settings_block_private)
         assert result == "http://8.8.8.8:8080"
 
         # Private IP with port should be blocked
         with pytest.raises(SSRFProtectionError):
-            validate_url("http://192.168.1.1:8080", settings)
+            validate_url("http://192.168.1.1:8080", settings_block_private)
 
-    def test_url_with_path_and_query(self):
+    def test_url_with_path_and_query(self, settings_block_private):
         """Test that URLs with paths and query strings work correctly."""
-        settings = Settings(ssrf=SSRFConfig(resolve_dns=False, block_private_ips=True))
-
         # Public IP with path/query
-        result = validate_url("http://8.8.8.8/path?query=value", settings)
+        result = validate_url("http://8.8.8.8/path?query=value", settings_block_private)
         assert result == "http://8.8.8.8/path?query=value"
 
         # Private IP with path/query should still be blocked
         with pytest.raises(SSRFProtectionError):
-            validate_url("http://192.168.1.1/admin?token=secret", settings)
+            validate_url("http://192.168.1.1/admin?token=secret", settings_block_private)
 
     def test_default_settings(self):
         """Test that validation works with default settings."""
@@ -266,3 +319,76 @@ class TestSSRFProtection:
         # Loopback should still be blocked with defaults
         with pytest.raises(SSRFProtectionError):
             validate_url("http://127.0.0.1")
+
+
+class TestDNSCache:
+    """Test caching of DNS answers used by SSRF protection."""
+
+    @pytest.fixture(autouse=True)
+    def empty_dns_cache(self):
+        with patch.dict(validation._dns_cache, clear=True):
+            yield
+
+    def _addr_info(self, *ips):
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (ip, 0)) for ip in ips]
+
+    def test_answer_reused(self):
+        """Test a hostname is resolved once and its distinct addresses reused."""
+        settings = Settings(ssrf=SSRFConfig(resolve_dns=True))
+        addr_info = self._addr_info("93.184.216.34", "93.184.216.34")
+
+        with patch("socket.getaddrinfo", return_value=addr_info) as mock_resolve:
+            assert validate_url("http://cached.example", settings) == "http://cached.example"
+            assert validate_url("https://cached.example/x", settings) == "https://cached.example/x"
+
+        mock_resolve.assert_called_once_with("cached.example", None)
+        assert validation._dns_cache["cached.example"][1] == ("93.184.216.34",)
+
+    def test_cached_answer_still_checked(self):
+        """Test a cached private answer is blocked on every validation."""
+        settings = Settings(ssrf=SSRFConfig(resolve_dns=True))
+
+        with patch("socket.getaddrinfo", return_value=self._addr_info("10.0.0.5")) as mock_resolve:
+            for _ in range(2):
+                with pytest.raises(SSRFProtectionError, match="private IP"):
+                    validate_url("http://internal.example", settings)
+
+        mock_resolve.assert_called_once()
+
+    def test_failure_cached(self):
+        """Test resolution failures are cached and reported the same way."""
+        settings = Settings(ssrf=SSRFConfig(resolve_dns=True))
+        error = socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+
+        with patch("socket.getaddrinfo", side_effect=error) as mock_resolve:
+            for _ in range(2):
+                with pytest.raises(SSRFProtectionError, match="Cannot resolve hostname"):
+                    validate_url("http://missing.example", settings)
+
+        mock_resolve.assert_called_once()
+        _, cached_error = validation._dns_cache["missing.example"]
+        assert isinstance(cached_error, socket.gaierror)
+
+    def test_expired_answer_resolved_again(self):
+        """Test an answer past its TTL is resolved again."""
+        settings = Settings(ssrf=SSRFConfig(resolve_dns=True, dns_cache_ttl=60))
+
+        with (
+            patch("socket.getaddrinfo", return_value=self._addr_info("8.8.8.8")) as mock_resolve,
+            patch("src.downloader.validation.time.monotonic", side_effect=[1000.0, 1061.0]),
+        ):
+            validate_url("http://expiring.example", settings)
+            validate_url("http://expiring.example", settings)
+
+        assert mock_resolve.call_count == 2
+
+    def test_zero_ttl_disables_cache(self):
+        """Test dns_cache_ttl=0 resolves on every validation."""
+        settings = Settings(ssrf=SSRFConfig(resolve_dns=True, dns_cache_ttl=0))
+
+        with patch("socket.getaddrinfo", return_value=self._addr_info("8.8.8.8")) as mock_resolve:
+            validate_url("http://uncached.example", settings)
+            validate_url("http://uncached.example", settings)
+
+        assert mock_resolve.call_count == 2
+        assert validation._dns_cache == {}
@@ -1,9 +1,12 @@
 """Unit tests for HTML rendering detection logic."""
 
+from unittest.mock import patch
+
 import pytest
 from bs4 import BeautifulSoup
 
 from src.downloader.content_converter import (
+    _body_text_prefix,
     _has_js_framework_markers,
     _has_missing_metadata,
     should_use_playwright_for_html,
@@ -20,7 +23,7 @@ class TestMetadataDetection:
             <meta property="og:title" content="Test Title">
             <meta property="og:description" content="Test Description">
         </head></html>"""
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "lxml")
 
         assert not _has_missing_metadata(soup), "Should have complete metadata"
 
@@ -29,7 +32,7 @@ class TestMetadataDetection:
         html = """<html><head>
             <title>Test</title>
         </head></html>"""
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "lxml")
 
         assert _has_missing_metadata(soup), "Should detect missing metadata"
 
@@ -39,7 +42,7 @@ class TestMetadataDetection:
             <meta name="twitter:title" content="Test Title">
             <meta name="twitter:description" content="Test Description">
         </head></html>"""
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "lxml")
 
         assert not _has_missing_metadata(soup), "Twitter card tags should suffice"
 
@@ -49,7 +52,7 @@ class TestMetadataDetection:
             <meta property="og:title" content="Test Title">
             <meta name="twitter:description" content="Test Description">
         </head></html>"""
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "lxml")
 
         assert not _has_missing_metadata(soup), "Mixed sources should work"
 
@@ -58,7 +61,7 @@ class TestMetadataDetection:
         html = """<html><head>
             <meta property="og:title" content="Test Title">
         </head></html>"""
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "lxml")
 
         assert _has_missing_metadata(soup), "Should detect missing description"
 
@@ -67,7 +70,7 @@ class TestMetadataDetection:
         html = """<html><head>
             <meta property="og:description" content="Test Description">
         </head></html>"""
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "lxml")
 
         assert _has_missing_metadata(soup), "Should detect missing title"
 
@@ -81,7 +84,7 @@ class TestJSFrameworkMarkers:
         html = """<html><body>
             <div id="root"></div>
         </body></html>"""
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "lxml")
         body_text = soup.find("body").get_text(strip=True)
 
         assert _has_js_framework_markers(soup, body_text), "Should detect React marker"
@@ -91,7 +94,7 @@ class TestJSFrameworkMarkers:
         html = """<html><body>
             <div id="app"></div>
         </body></html>"""
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "lxml")
         body_text = soup.find("body").get_text(strip=True)
 
         assert _has_js_framework_markers(soup, body_text), "Should detect Vue marker"
@@ -101,7 +104,7 @@ class TestJSFrameworkMarkers:
         html = """<html><body ng-app="myApp">
             <div ng-view></div>
         </body></html>"""
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "lxml")
         body_text = soup.find("body").get_text(strip=True)
 
         assert _has_js_framework_markers(soup, body_text), "Should detect Angular marker"
@@ -117,7 +120,7 @@ class TestJSFrameworkMarkers:
             </div>
         </body></html>"""
         )
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "lxml")
         body_text = soup.find("body").get_text(strip=True)
 
         assert not _has_js_framework_markers(soup, body_text), (
@@ -131,12 +134,31 @@ class TestJSFrameworkMarkers:
                 <p>Regular content</p>
             </div>
         </body></html>"""
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "lxml")
         body_text = soup.find("body").get_text(strip=True)
 
         assert not _has_js_framework_markers(soup, body_text), "No markers should not trigger"
 
 
+@pytest.mark.unit
+class TestBodyTextPrefix:
+    """Test the bounded body text helper."""
+
+    def test_short_body_matches_get_text(self):
+        """Test that text under the limit is returned in full."""
+        html = "<html><body><p> Hello </p><div><b>big</b> world</div></body></html>"
+        body = BeautifulSoup(html, "lxml").find("body")
+
+        assert _body_text_prefix(body, 500) == body.get_text(strip=True)
+
+    def test_long_body_stops_past_limit(self):
+        """Test that collection stops once the text exceeds the limit."""
+        html = "<html><body>" + "<p>0123456789</p>" * 100 + "</body></html>"
+        body = BeautifulSoup(html, "lxml").find("body")
+
+        assert _body_text_prefix(body, 25) == "0123456789" * 3
+
+
 @pytest.mark.unit
 class TestPlaywrightDetection:
     """Test the main should_use_playwright_for_html function."""
@@ -257,6 +279,38 @@ class TestPlaywrightDetection:
 
         assert not result, "Complete static HTML should not trigger rendering"
 
+    def test_bodyless_fragment_is_static(self):
+        """Test a fragment without a <body> tag is static, though lxml implies a body."""
+        url = "https://example.com/fragment"
+        content_type = "text/html; charset=utf-8"
+        html = b"<div>" + b"x" * 300 + b"</div>"
+
+        from src.downloader import content_converter
+
+        content_converter._js_heavy_cache.clear()
+        content_converter._static_html_cache.clear()
+
+        result = should_use_playwright_for_html(url, html, content_type)
+
+        assert not result, "A body-less fragment should not trigger rendering"
+        assert url in content_converter._static_html_cache
+
+    def test_bodyless_fragment_skips_fallback(self):
+        """Test should_use_playwright_fallback treats a body-less fragment as empty."""
+        url = "https://example.com/fragment"
+        content_type = "text/html; charset=utf-8"
+        html = b"<div>" + b"x" * 300 + b"</div>"
+
+        from src.downloader import content_converter
+
+        content_converter._empty_content_cache.clear()
+        content_converter._fallback_bypass_cache.clear()
+
+        result = content_converter.should_use_playwright_fallback(url, html, content_type)
+
+        assert not result, "A body-less fragment should not use the fallback"
+        assert url in content_converter._empty_content_cache
+
     def test_large_html_with_metadata_does_not_trigger(self, large_html_with_metadata):
         """Test that large HTML (>50KB) with metadata doesn't trigger."""
         url = "https://example.com/large-article"
@@ -274,6 +328,43 @@ class TestPlaywrightDetection:
 
         assert not result, "Large HTML with metadata should not trigger"
 
+    def test_large_html_without_js_hints_skips_parsing(self, large_html_with_metadata):
+        """Test that large HTML with no JS hints is decided without building a soup."""
+        url = "https://example.com/large-article"
+        content_type = "text/html; charset=utf-8"
+
+        from src.downloader import content_converter
+
+        content_converter._js_heavy_cache.clear()
+        content_converter._static_html_cache.clear()
+
+        with patch.object(content_converter, "BeautifulSoup") as mock_soup:
+            result = should_use_playwright_for_html(url, large_html_with_metadata, content_type)
+
+        assert not result
+        mock_soup.assert_not_called()
+
+    def test_large_html_with_split_js_message_triggers(self):
+        """Test that a JS-required message broken up by inline tags is still detected."""
+        url = "https://example.com/large-app"
+        content_type = "text/html; charset=utf-8"
+        html = (
+            b"<html><body><p>Please <strong>enable</strong> JavaScript.</p><p>"
+            + b"Lorem ipsum dolor sit amet. " * 2000
+            + b"</p></body></html>"
+        )
+
+        from src.downloader import content_converter
+
+        content_converter._js_heavy_cache.clear()
+        content_converter._static_html_cache.clear()
+
+        assert len(html) > 50000
+
+        result = should_use_playwright_for_html(url, html, content_type)
+
+        assert result, "JS requirement message should trigger rendering on large pages"
+
     def test_non_html_content_does_not_trigger(self):
         """Test that non-HTML content does not trigger JS rendering."""
         url = "https://example.com/file.json"
@@ -352,6 +443,23 @@ class TestPlaywrightDetection:
         result2 = should_use_playwright_for_html(url, static_html_complete, content_type)
         assert not result2, "Should use cache result"
 
+    def test_cache_hit_is_recorded(self, substack_minimal_html):
+        """Test that answering from the detection cache increments the cache-hit metric."""
+        url = "https://test.substack.com/p/metrics"
+        content_type = "text/html; charset=utf-8"
+
+        from src.downloader import content_converter
+
+        content_converter._js_heavy_cache.clear()
+        content_converter._static_html_cache.clear()
+
+        with patch.object(content_converter, "record_html_rendering_cache_hit") as mock_hit:
+            should_use_playwright_for_html(url, substack_minimal_html, content_type)
+            mock_hit.assert_not_called()
+
+            should_use_playwright_for_html(url, substack_minimal_html, content_type)
+            mock_hit.assert_called_once()
+
     def test_malformed_html_handles_gracefully(self, malformed_html):
         """Test that malformed HTML is handled gracefully."""
         url = "https://example.com/malformed"
@@ -406,7 +514,7 @@ class TestConfigurableThresholds:
                 <p>{body_content}</p>
             </div>
         </body></html>"""
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "lxml")
         body_text = soup.find("body").get_text(strip=True)
 
         # With default threshold (200): 175 < 200 = True (would trigger)
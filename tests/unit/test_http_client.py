@@ -1,6 +1,6 @@
 """Unit tests for HTTP client."""
 
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
 
 import httpx
 import pytest
@@ -17,70 +17,107 @@ from src.downloader.http_client import (
 @pytest.mark.unit
 class TestHTTPClient:
     @pytest.fixture
-    def http_client(self):
-        return HTTPClient(timeout=5.0, max_redirects=5, user_agent="TestAgent/1.0")
+    async def http_client(self):
+        async with HTTPClient(timeout=5.0, max_redirects=5, user_agent="TestAgent/1.0") as client:
+            yield client
 
     @pytest.mark.asyncio
-    async def test_successful_download(self, http_client):
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.url = "https://example.com"
-        mock_response.headers = MagicMock()
-        mock_response.headers.get.return_value = "text/html"
-        mock_response.headers.__iter__ = lambda self: iter(
-            [("content-type", "text/html"), ("content-length", "100")]
-        )
-        mock_response.headers.items.return_value = [
-            ("content-type", "text/html"),
-            ("content-length", "100"),
-        ]
-        mock_response.content = b"<html>test</html>"
-        mock_response.reason_phrase = "OK"
-
-        with patch.object(http_client._client, "get", new_callable=AsyncMock) as mock_get:
-            mock_get.return_value = mock_response
-
-            content, metadata = await http_client.download("https://example.com")
-
-            assert content == b"<html>test</html>"
-            assert metadata["status_code"] == 200
-            assert metadata["url"] == "https://example.com"
-            assert metadata["content_type"] == "text/html"
-            assert metadata["size"] == 17
+    async def test_successful_download(self, http_client, use_transport):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(
+                200, headers={"content-type": "text/html"}, content=b"<html>test</html>"
+            )
+
+        await use_transport(http_client, handler)
+
+        content, metadata = await http_client.download("https://example.com")
+
+        assert content == b"<html>test</html>"
+        assert metadata["status_code"] == 200
+        assert metadata["url"] == "https://example.com"
+        assert metadata["content_type"] == "text/html"
+        assert metadata["size"] == 17
+        assert requests[0].headers["user-agent"] == "TestAgent/1.0"
 
     @pytest.mark.asyncio
-    async def test_timeout_error(self, http_client):
-        with patch.object(http_client._client, "get", new_callable=AsyncMock) as mock_get:
-            mock_get.side_effect = httpx.TimeoutException("Timeout")
+    async def test_timeout_error(self, http_client, use_transport):
+        def handler(request):
+            raise httpx.ReadTimeout("Timeout", request=request)
 
-            with pytest.raises(HTTPTimeoutError) as exc_info:
-                await http_client.download("https://example.com")
+        await use_transport(http_client, handler)
 
-            assert "timed out" in str(exc_info.value)
+        with pytest.raises(HTTPTimeoutError, match="timed out"):
+            await http_client.download("https://example.com")
 
     @pytest.mark.asyncio
-    async def test_http_error_response(self, http_client):
-        mock_response = MagicMock()
-        mock_response.status_code = 404
-        mock_response.reason_phrase = "Not Found"
+    async def test_http_error_response(self, http_client, use_transport):
+        await use_transport(http_client, lambda request: httpx.Response(404))
 
-        with patch.object(http_client._client, "get", new_callable=AsyncMock) as mock_get:
-            mock_get.return_value = mock_response
+        with pytest.raises(HTTPClientError, match="HTTP 404") as exc_info:
+            await http_client.download("https://example.com")
+
+        assert exc_info.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_request_error(self, http_client, use_transport):
+        def handler(request):
+            raise httpx.ConnectError("Connection failed", request=request)
 
-            with pytest.raises(HTTPClientError) as exc_info:
-                await http_client.download("https://example.com")
+        await use_transport(http_client, handler)
 
-            assert "HTTP 404" in str(exc_info.value)
+        with pytest.raises(HTTPClientError, match="Request failed"):
+            await http_client.download("https://example.com")
 
     @pytest.mark.asyncio
-    async def test_request_error(self, http_client):
-        with patch.object(http_client._client, "get", new_callable=AsyncMock) as mock_get:
-            mock_get.side_effect = httpx.RequestError("Connection failed")
+    @pytest.mark.parametrize("size", [1024, 1025])
+    async def test_max_download_size(self, size, use_transport):
+        async def body():
+            for _ in range(size // 256):
+                yield b"x" * 256
+            yield b"x" * (size % 256)
+
+        async with HTTPClient(max_download_size=1024) as client:
+            await use_transport(client, lambda request: httpx.Response(200, content=body()))
+
+            if size <= 1024:
+                content, metadata = await client.download("https://example.com")
+                assert len(content) == size
+                assert metadata["size"] == size
+            else:
+                with pytest.raises(HTTPClientError, match="maximum download size"):
+                    await client.download("https://example.com")
 
-            with pytest.raises(HTTPClientError) as exc_info:
-                await http_client.download("https://example.com")
+    @pytest.mark.asyncio
+    async def test_max_download_size_rejects_declared_length(self, use_transport):
+        def handler(request):
+            return httpx.Response(200, headers={"Content-Length": "4096"}, content=b"x" * 4096)
+
+        async with HTTPClient(max_download_size=1024) as client:
+            await use_transport(client, handler)
+
+            with pytest.raises(HTTPClientError, match="maximum download size"):
+                await client.download("https://example.com")
 
-            assert "Request failed" in str(exc_info.value)
+    @pytest.mark.asyncio
+    async def test_connection_stats_reflect_pool_settings(self):
+        async with HTTPClient(
+            max_keepalive_connections=20,
+            max_connections=40,
+            keepalive_expiry=15.0,
+            http2=False,
+        ) as client:
+            stats = client.get_connection_stats()
+
+        assert stats["status"] == "healthy"
+        assert stats["http2_enabled"] is False
+        assert stats["connection_limits"] == {
+            "max_connections": 40,
+            "max_keepalive": 20,
+            "keepalive_expiry": 15.0,
+        }
 
     @pytest.mark.asyncio
     async def test_context_manager(self):
@@ -97,3 +134,10 @@ class TestHTTPClient:
 
         client3 = await get_client()
         assert client3 is not client1  # Should be new instance
+
+    def test_global_client_per_event_loop(self):
+        async def shared_client():
+            return await get_client()
+
+        # A client pooled on one loop must not be handed to another
+        assert asyncio.run(shared_client()) is not asyncio.run(shared_client())